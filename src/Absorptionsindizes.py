@@ -0,0 +1,187 @@
+# Skript: CDOM Absorptionsindizes (SUVA254, E2/E3, spektrale Steigungen, SR) für alle UV/Vis Spektren auf einmal
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from Fluoreszenzindizes import range_slice
+from Innenfilter import interpolation_weights, apply_weights
+from Probenregister import name_pattern, parse_names
+
+# definitionen der indizes (wellenlängen in nm)
+# SUVA254 nach Weishaar et al. (2003): A254 pro m / DOC in L mg^-1 m^-1
+# E2/E3 nach De Haan & De Boer (1987): A250 / A365
+# spektrale steigungen und SR nach Helms et al. (2008): log-lineare fits von a(λ)
+slope_ranges = {
+    "S275_295": (275, 295),
+    "S350_400": (350, 400),
+}
+
+
+@lru_cache(maxsize=8)
+def _slope_design(wl_key):
+    wl = np.frombuffer(wl_key, dtype=np.float64)
+    design = {}
+    for name, (low, high) in slope_ranges.items():
+        sl = range_slice(wl, low, high)
+        x = wl[sl]
+        if len(x) < 2:
+            raise ValueError(f"{name}: zu wenige Wellenlängen im Bereich {low}-{high} nm")
+        # zeile der pseudoinversen für die steigung von ln(a) = c + b * λ
+        projection = np.linalg.pinv(np.column_stack([np.ones_like(x), x]))[1]
+        projection.setflags(write=False)
+        design[name] = (sl, x, projection)
+    return design
+
+
+def slope_design(wavelengths):
+    """
+    Sinn: Bereiche und vorberechnete Designmatrix (Pseudoinverse) für die spektralen Steigungen;
+    wird pro Wellenlängenraster nur einmal berechnet
+
+    Parameter:
+    ---------------------------------------
+
+    wavelengths: np.ndarray
+        aufsteigende Wellenlängen der Messung
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit (slice, wellenlängen, projektion) pro Steigung
+    """
+    return _slope_design(np.asarray(wavelengths, dtype=np.float64).tobytes())
+
+
+def spectral_slopes(a, wavelengths):
+    """
+    Sinn: Spektrale Steigungen aller Proben auf einmal als log-linearer Fit
+    (eine Matrixmultiplikation statt curve_fit pro Probe)
+
+    Parameter:
+    ---------------------------------------
+
+    a: np.ndarray
+        Absorptionskoeffizienten (Proben × Wellenlängen) in 1/m
+
+    wavelengths: np.ndarray
+        Wellenlängen von a
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit den Steigungen in 1/nm pro Bereich; Proben mit a <= 0 im Bereich werden
+    nur über die gültigen Punkte gefittet (NaN bei weniger als 2 Punkten)
+    """
+    slopes = {}
+    for name, (sl, x, projection) in slope_design(wavelengths).items():
+        with np.errstate(invalid="ignore", divide="ignore"):
+            y = np.log(np.where(a[:, sl] > 0, a[:, sl], np.nan))
+        valid = np.isfinite(y)
+        complete = valid.all(axis=1)
+
+        s = np.full(len(a), np.nan)
+        s[complete] = -(y[complete] @ projection)
+
+        # proben mit lücken: gleicher fit, nur über die gültigen punkte summiert
+        if not complete.all():
+            v, yv = valid[~complete], np.where(valid[~complete], y[~complete], 0.0)
+            xv = np.where(v, x, 0.0)
+            n = v.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                b = ((n * (xv * yv).sum(axis=1) - xv.sum(axis=1) * yv.sum(axis=1))
+                     / (n * (xv ** 2).sum(axis=1) - xv.sum(axis=1) ** 2))
+            s[~complete] = np.where(n >= 2, -b, np.nan)
+        slopes[name] = s
+    return slopes
+
+
+def read_npoc(file_path):
+    """
+    Sinn: NPOC Werte aus der TOC Tabelle (NPOC.csv aus TOC.py, ältere TOC_250923.csv gehen auch)
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur .csv Datei
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Probe, Datum und NPOC in mg/L
+    """
+    toc = pd.read_csv(file_path)
+    # nur probennamen nach dem schema des probenregisters (keine standards/blanks)
+    toc = toc[toc["Probenname"].astype(str).str.match(name_pattern)].reset_index(drop=True)
+    name = parse_names(toc["Probenname"])
+    npoc = pd.DataFrame({
+        "Probe": name["Probe"],
+        "Datum": name["Date"],
+        "NPOC": toc["NPOC"] if "NPOC" in toc else
+                toc["Ergebnis"].astype(str).str.replace("mg/L", "", regex=False).astype(float),
+    })
+    # falls eine probe mehrfach gemessen wurde
+    return npoc.dropna(subset=["Datum"]).groupby(["Probe", "Datum"], as_index=False)["NPOC"].mean()
+
+
+def cdom_indices(absorbance, wavelengths, samples, npoc=None, path_length=1.0):
+    """
+    Sinn: Berechnet a254, a350, SUVA254, E2/E3, S275-295, S350-400 und SR für alle Proben
+    in einem Durchgang
+
+    Parameter:
+    ---------------------------------------
+
+    absorbance: np.ndarray
+        dekadische Absorption (Proben × Wellenlängen), z.B. aus UVVIS_Einlesen.load_uvvis_files
+
+    wavelengths: np.ndarray
+        Wellenlängen der Absorption
+
+    samples: pd.DataFrame
+        Sample und Date für jede Zeile von absorbance
+
+    npoc: pd.DataFrame oder np.ndarray, optional
+        Ergebnis von read_npoc oder schon auf die Zeilen von absorbance übertragene NPOC Werte
+        (z.B. über SampleRegistry.align); ohne NPOC bleibt SUVA254 NaN
+
+    path_length: float, optional
+        Schichtdicke der Küvette in cm
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit einer Zeile pro Probe, Schlüssel wie in Nitrat_Phosphat.csv (Probe, Datum)
+    """
+    absorbance = np.asarray(absorbance, dtype=np.float64)
+    wavelengths = np.asarray(wavelengths, dtype=np.float64)
+    path_m = path_length / 100
+
+    # alle einzelwellenlängen mit einer interpolation
+    points = np.array([250.0, 254.0, 350.0, 365.0])
+    a250, a254, a350, a365 = apply_weights(absorbance, interpolation_weights(wavelengths, points)).T
+
+    # napierscher absorptionskoeffizient a = 2.303 * A / l in 1/m
+    a = 2.303 * absorbance / path_m
+    slopes = spectral_slopes(a, wavelengths)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = pd.DataFrame({
+            "Probe": samples["Sample"].astype(str).to_numpy(),
+            "Datum": pd.to_datetime(samples["Date"]).to_numpy(),
+            "a254": 2.303 * a254 / path_m,
+            "a350": 2.303 * a350 / path_m,
+            "E2_E3": a250 / a365,
+            **slopes,
+            "SR": slopes["S275_295"] / slopes["S350_400"],
+        })
+
+    # SUVA254 über probe und datum mit den NPOC werten verbinden
+    if npoc is None:
+        result["NPOC"] = np.nan
+    elif not isinstance(npoc, pd.DataFrame):
+        result["NPOC"] = np.asarray(npoc, dtype=np.float64)
+    else:
+        keys = pd.MultiIndex.from_frame(npoc[["Probe", "Datum"]])
+        rows = keys.get_indexer(pd.MultiIndex.from_frame(result[["Probe", "Datum"]]))
+        result["NPOC"] = np.where(rows >= 0, npoc["NPOC"].to_numpy()[rows], np.nan)
+    result.insert(4, "SUVA254", a254 / path_m / result["NPOC"].to_numpy())
+    return result
@@ -0,0 +1,139 @@
+# Skript: Benchmark für die gruppierten Korrelationen mit Bootstrap Konfidenzintervallen und die Korrelationsmatrix
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import time
+import numpy as np
+import pandas as pd
+from Korrelation import grouped_correlation, correlation_matrix
+
+# anzahl gruppen (z.B. datum × wellenlängenbereich), punkte pro gruppe, bootstrap replikate
+group_counts = [10, 100, 500]
+points = 200
+n_boot = 200
+
+# korrelationsmatrix: anzahl zeilen und variablen, anteil NaN
+matrix_rows = 200
+matrix_vars = 300
+nan_share = 0.1
+
+
+def grouped_correlation_alt(df, by, x_col, y_col, n_boot, seed=0):
+    """
+    Sinn: Alte Variante (groupby().apply mit Bootstrap Schleife pro Gruppe), nur als Referenz
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Daten in langer Form
+
+    by: str
+        Spalte für die Gruppen
+
+    x_col, y_col: str
+        Spalten der Korrelation
+
+    n_boot: int
+        Anzahl Bootstrap Replikate
+
+    seed: int, optional
+        Seed für den Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit r und dem 95% Intervall pro Gruppe
+    """
+    rng = np.random.default_rng(seed)
+
+    def corr_ci(g):
+        boot = []
+        for _ in range(n_boot):
+            s = g.iloc[rng.integers(0, len(g), len(g))]
+            boot.append(s[x_col].corr(s[y_col]))
+        return pd.Series({"r": g[x_col].corr(g[y_col]),
+                          "low": np.nanquantile(boot, 0.025), "high": np.nanquantile(boot, 0.975)})
+
+    return df.groupby(by).apply(corr_ci)
+
+
+def make_data(n_groups, seed=0):
+    """
+    Sinn: Zufällige AP/SP ähnliche Daten mit n_groups Gruppen
+
+    Parameter:
+    ---------------------------------------
+
+    n_groups: int
+        Anzahl Gruppen
+
+    seed: int, optional
+        Seed für den Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Group, x und y
+    """
+    rng = np.random.default_rng(seed)
+    x = rng.random(n_groups * points)
+    return pd.DataFrame({"Group": np.repeat(np.arange(n_groups), points),
+                         "x": x, "y": 0.8 * x + 0.2 * rng.random(len(x))})
+
+
+def make_matrix(layout, seed=0):
+    """
+    Sinn: Zufällige, teils korrelierte Variablen mit Lücken für die Korrelationsmatrix
+
+    Parameter:
+    ---------------------------------------
+
+    layout: str
+        "gemeinsam" (Lücken ganzer Messkampagnen, wenige NaN-Muster) oder "verstreut" (jede Spalte
+        hat eigene Lücken, ein Muster pro Spalte)
+
+    seed: int, optional
+        Seed für den Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit matrix_vars Spalten
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(matrix_rows, 5))
+    values = base @ rng.normal(size=(5, matrix_vars)) + rng.normal(size=(matrix_rows, matrix_vars))
+    if layout == "gemeinsam":
+        # 5 kampagnen, jede lässt bei ihren spalten die gleichen zeilen weg
+        campaign = rng.integers(0, 5, matrix_vars)
+        gaps = rng.random((5, matrix_rows)) < nan_share
+        values[gaps[campaign].T] = np.nan
+    else:
+        values[rng.random(values.shape) < nan_share] = np.nan
+    return pd.DataFrame(values, columns=[f"v{i}" for i in range(matrix_vars)])
+
+
+if __name__ == "__main__":
+    print(f"{'Gruppen':>8} {'alt [s]':>9} {'neu [s]':>9} {'Speedup':>8}")
+    for n_groups in group_counts:
+        df = make_data(n_groups)
+        t0 = time.perf_counter()
+        grouped_correlation_alt(df, "Group", "x", "y", n_boot)
+        t_alt = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        grouped_correlation(df, "Group", {"xy": ("x", "y")}, n_boot=n_boot)
+        t_neu = time.perf_counter() - t0
+        print(f"{n_groups:>8} {t_alt:>9.2f} {t_neu:>9.3f} {t_alt / t_neu:>7.0f}x")
+
+    print(f"\nKorrelationsmatrix, {matrix_rows} Zeilen × {matrix_vars} Variablen, {nan_share:.0%} NaN")
+    print(f"{'NaN':>10} {'Methode':>9} {'DataFrame.corr [s]':>19} {'neu [s]':>9}")
+    for layout in ("gemeinsam", "verstreut"):
+        data = make_matrix(layout)
+        for method in ("pearson", "spearman"):
+            t0 = time.perf_counter()
+            ref = data.corr(method=method)
+            t_alt = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            corr, _, _ = correlation_matrix(data, method=method)
+            t_neu = time.perf_counter() - t0
+            # gleiche koeffizienten wie pandas (paarweise vollständig)
+            np.testing.assert_allclose(corr.to_numpy(), ref.to_numpy(), rtol=1e-9, atol=1e-9)
+            print(f"{layout:>10} {method:>9} {t_alt:>19.2f} {t_neu:>9.3f}")
@@ -0,0 +1,42 @@
+# Skript: Benchmark für PARAFAC (Laufzeit gegen Probenanzahl und Komponenten)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import time
+from glob import glob
+import numpy as np
+from EEM import EEMCube
+from Streulicht import remove_scatter
+from PARAFAC import fit_parafac
+
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# archivgrößen (vielfache der echten proben) und anzahl komponenten
+factors = [1, 4, 10]
+ranks = [2, 3, 4, 5]
+n_starts = 4
+
+
+if __name__ == "__main__":
+    cube = remove_scatter(EEMCube.from_files(glob(f"{path}/RF/*.txt")))
+    rng = np.random.default_rng(0)
+
+    print(f"{'Proben':>7} {'Komp.':>6} {'kalt [s]':>9} {'warm [s]':>9} {'Fit [%]':>8}")
+    for factor in factors:
+        # echte proben vervielfachen, mit etwas rauschen damit es keine exakten kopien sind
+        X = np.repeat(cube.data, factor, axis=0).astype(np.float64)
+        X += rng.normal(0, 0.02 * np.nanstd(X), X.shape)
+        for rank in ranks:
+            t0 = time.perf_counter()
+            model = fit_parafac(X, rank, n_starts=n_starts)
+            t_cold = time.perf_counter() - t0
+
+            # warmstart: gleiches modell, 10 % neue proben dazu
+            n_new = max(len(X) // 10, 1)
+            X_new = np.concatenate([X, X[:n_new] * rng.uniform(0.9, 1.1, (n_new, 1, 1))])
+            t0 = time.perf_counter()
+            fit_parafac(X_new, rank, init=model)
+            t_warm = time.perf_counter() - t0
+
+            print(f"{len(X):>7} {rank:>6} {t_cold:>9.2f} {t_warm:>9.2f} {model.fit:>8.2f}")
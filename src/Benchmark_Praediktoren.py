@@ -0,0 +1,62 @@
+# Skript: Benchmark für den Vorregen-Fensterscan (pandas rolling Referenz pro Fenster vs. Präfixsummen)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import time
+import numpy as np
+import pandas as pd
+from Praediktoren import TrailingWindows
+
+# anzahl fensterlängen im scan
+n_windows = [24, 168, 720]
+
+
+def window_sums_pandas(station, times, hours):
+    """
+    Sinn: Referenzimplementierung mit pandas (pro Fensterlänge ein rolling über die ganze Reihe, dann
+    merge_asof); für diesen Benchmark geschrieben, nicht der frühere Code aus Nitrat_Phosphor.py
+
+    Parameter:
+    ---------------------------------------
+
+    station: pd.DataFrame
+        stündliche Daten mit datetime und PCP
+
+    times: pd.Series
+        Zeitpunkte der Proben
+
+    hours: list
+        Fensterlängen in Stunden
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Proben × Fenster)
+    """
+    pcp = station.set_index("datetime")["PCP"].asfreq("h")
+    samples = pd.DataFrame({"Zeitpunkt": times}).sort_values("Zeitpunkt")
+    out = np.empty((len(times), len(hours)))
+    for j, h in enumerate(hours):
+        rolled = pcp.rolling(h, min_periods=int(np.ceil(0.9 * h))).sum().rename("sum").reset_index()
+        merged = pd.merge_asof(samples, rolled, left_on="Zeitpunkt", right_on="datetime")
+        out[samples.index, j] = merged["sum"].to_numpy()
+    return out
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    t = pd.date_range("2016-01-01", "2025-12-31 23:00", freq="h")
+    station = pd.DataFrame({"datetime": t, "PCP": rng.exponential(0.2, len(t)),
+                            "Ta_2m": rng.normal(10, 6, len(t))})
+    times = pd.Series(t[0] + pd.to_timedelta(rng.integers(800, len(t), 500), unit="h"))
+
+    print(f"{'Fenster':>8} {'pandas [ms]':>13} {'Präfix [ms]':>12} {'max. Abw.':>10}")
+    for n in n_windows:
+        hours = list(range(1, n + 1))
+        t0 = time.perf_counter()
+        ref = window_sums_pandas(station, times, hours)
+        t1 = time.perf_counter()
+        new = TrailingWindows(station).window_sum("PCP", times, hours)
+        t2 = time.perf_counter()
+        # gleiche summen und gleiche NaN (zu wenige stunden im fenster) wie die pandas referenz
+        np.testing.assert_allclose(new, ref, rtol=1e-9, atol=1e-9)
+        print(f"{n:>8} {(t1 - t0) * 1000:>13.1f} {(t2 - t1) * 1000:>12.1f} {np.nanmax(np.abs(ref - new)):>10.2e}")
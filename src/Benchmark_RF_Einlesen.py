@@ -0,0 +1,97 @@
+# Skript: Benchmark für das Einlesen der Shimadzu RF-6000 Daten
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import time
+from glob import glob
+import pandas as pd
+from Funktionen import read_shimadzu_file
+
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# wie oft jede datei gelesen wird
+n_repeat = 5
+
+
+def read_shimadzu_file_alt(file_path):
+    """
+    Sinn: Alte Version von read_shimadzu_file (zeilen- und zellenweise in Python), nur als Referenz
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    DataFrame der .txt-Datei
+    """
+    with open(file_path, "r") as f:
+        lines = f.readlines()
+
+    for i, line in enumerate(lines):
+        if line.startswith('"EX Wavelength/EM Wavelength"'):
+            header_line_index = i
+            break
+    else:
+        raise ValueError(f"Keine Spaltennamendaten gefunden in: {file_path}")
+
+    header = [h.replace('"', '') for h in lines[header_line_index].strip().split(",")]
+    n_cols = len(header)
+
+    data_lines = lines[header_line_index + 1:]
+    data = []
+    for line in data_lines:
+        if line.strip():
+            values = [x for x in line.strip().split(",") if x != '']
+            if len(values) < n_cols:
+                values += [float('nan')] * (n_cols - len(values))
+            elif len(values) > n_cols:
+                values = values[:n_cols]
+            data.append([float(x) for x in values])
+
+    return pd.DataFrame(data, columns=header)
+
+
+def time_reader(reader, files):
+    """
+    Sinn: Misst die beste Laufzeit von n_repeat Durchläufen über alle Dateien
+
+    Parameter:
+    ---------------------------------------
+
+    reader: function
+        Einlesefunktion
+
+    files: list
+        Liste der .txt Dateien
+
+    Ergebnis:
+    ---------------------------------------
+    Laufzeit in Sekunden
+    """
+    best = float("inf")
+    for _ in range(n_repeat):
+        t0 = time.perf_counter()
+        for f in files:
+            reader(f)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    files = sorted(glob(f"{path}/RF/*.txt"))
+
+    # erstmal checken ob beide das gleiche ergebnis liefern
+    for f in files:
+        pd.testing.assert_frame_equal(read_shimadzu_file(f), read_shimadzu_file_alt(f))
+
+    t_alt = time_reader(read_shimadzu_file_alt, files)
+    t_neu = time_reader(read_shimadzu_file, files)
+
+    print(f"{len(files)} Dateien, bester von {n_repeat} Durchläufen")
+    print(f"alt: {t_alt * 1000:.1f} ms ({t_alt / len(files) * 1000:.2f} ms/Datei)")
+    print(f"neu: {t_neu * 1000:.1f} ms ({t_neu / len(files) * 1000:.2f} ms/Datei)")
+    print(f"Speedup: {t_alt / t_neu:.1f}x")
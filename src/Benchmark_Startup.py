@@ -0,0 +1,92 @@
+# Skript: Benchmark der Importzeiten (python -X importtime) als Schutz gegen langsame Starts
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import sys
+import subprocess
+
+src = os.path.dirname(os.path.abspath(__file__))
+
+# wie oft jeder import gemessen wird (jeweils in einem frischen interpreter)
+n_repeat = 5
+
+# einlese- und rechenjobs bzw. was die prozesspool-worker beim start importieren;
+# hier darf der plotting stack nicht auftauchen
+guarded = ["Funktionen", "Funktionen.Einlesen", "EEM", "RF_Konvertierung", "UVVIS_Einlesen",
+           "TOC_Einlesen", "Stationsdaten", "Heatmaps", "PARAFAC", "Signifikanz", "Szenarien",
+           "Pipeline", "RF", "Nitrat_Phosphor", "Sensitivitaet"]
+
+# nur zum vergleich: was das laden der plotfunktionen kostet
+reference = ["Funktionen.Plots"]
+
+# module, die nicht geladen werden dürfen
+forbidden = ("matplotlib", "seaborn")
+
+
+def import_times(module):
+    """
+    Sinn: Importiert ein Modul in einem frischen Interpreter mit -X importtime und liest die Tabelle aus
+
+    Parameter:
+    ---------------------------------------
+
+    module: str
+        Modulname (z.B. "RF_Konvertierung")
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit der kumulierten Importzeit in Mikrosekunden pro geladenem Modul
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=src, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": src, "MPLBACKEND": "Agg"})
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} fehlgeschlagen:\n{result.stderr[-2000:]}")
+
+    # zeilen wie "import time:       412 |       1523 |   numpy.core"
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(module):
+    """
+    Sinn: Beste Startzeit aus n_repeat Messungen und die geladenen Module
+
+    Parameter:
+    ---------------------------------------
+
+    module: str
+        Modulname
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (zeit in ms, set der geladenen module)
+    """
+    best, loaded = float("inf"), set()
+    for _ in range(n_repeat):
+        times = import_times(module)
+        best = min(best, times[module] / 1000)
+        loaded = set(times)
+    return best, loaded
+
+
+if __name__ == "__main__":
+    errors = []
+    print(f"Importzeit, bester von {n_repeat} Durchläufen")
+    for module in guarded + reference:
+        ms, loaded = measure(module)
+        heavy = sorted({name.split(".")[0] for name in loaded} & set(forbidden))
+        print(f"{module:<22}{ms:8.1f} ms   {', '.join(heavy) if heavy else '-'}")
+        if heavy and module in guarded:
+            errors.append(f"{module} lädt {', '.join(heavy)}")
+
+    if errors:
+        print("\nFEHLER:\n" + "\n".join(errors))
+        sys.exit(1)
+    print("\nOK: kein Einlese- oder Rechenjob lädt matplotlib/seaborn")
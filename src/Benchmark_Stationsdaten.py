@@ -0,0 +1,73 @@
+# Skript: Benchmark für das Einlesen der stündlichen Stationsdaten (.csv vs. Sidecar)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from Stationsdaten import read_station, station_columns
+
+# jahre stündlicher daten im künstlichen archiv
+years = [1, 5, 20]
+
+
+def make_archive(file_path, n_years, seed=0):
+    """
+    Sinn: Künstliches Stationsarchiv im Format von Hourly_Wiese_Klimastation.csv
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad der .csv Datei
+
+    n_years: int
+        Anzahl Jahre bis Ende 2025
+
+    seed: int, optional
+        Seed für den Zufallsgenerator
+    """
+    rng = np.random.default_rng(seed)
+    t = pd.date_range(f"{2026 - n_years}-01-01", "2025-12-31 23:00", freq="h")
+    df = pd.DataFrame({"datetime": t.strftime("%Y-%m-%d %H:%M:%S")})
+    for col in station_columns + ["WS_10m", "WD_10m", "Tsoil_5cm"]:
+        df[col] = rng.normal(size=len(t)).round(2)
+    df.to_csv(file_path, index=False)
+
+
+def read_station_alt(file_path):
+    """
+    Sinn: Alte Variante (ganze .csv lesen, alle datetimes parsen, dann filtern), nur als Referenz
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad der .csv Datei
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame für 2025-05-10 bis 2025-07-20
+    """
+    station = pd.read_csv(file_path)
+    station["datetime"] = pd.to_datetime(station["datetime"])
+    return station.loc[(station["datetime"] >= "2025-05-10") & (station["datetime"] <= "2025-07-20")]
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    print(f"{'Jahre':>6} {'alt [ms]':>10} {'Blöcke [ms]':>12} {'Sidecar bauen [ms]':>19} {'Sidecar [ms]':>13}")
+    for n_years in years:
+        file_path = os.path.join(folder, f"Hourly_{n_years}.csv")
+        make_archive(file_path, n_years)
+        times = []
+        for reader in (lambda: read_station_alt(file_path),
+                       lambda: read_station(file_path, start="2025-05-10", end="2025-07-20", sidecar=False),
+                       lambda: read_station(file_path, start="2025-05-10", end="2025-07-20"),
+                       lambda: read_station(file_path, start="2025-05-10", end="2025-07-20")):
+            t0 = time.perf_counter()
+            reader()
+            times.append((time.perf_counter() - t0) * 1000)
+        print(f"{n_years:>6} {times[0]:>10.1f} {times[1]:>12.1f} {times[2]:>19.1f} {times[3]:>13.1f}")
@@ -0,0 +1,60 @@
+# Skript: Benchmark für die Streulichtkorrektur bei wachsendem Archiv
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import time
+from glob import glob
+import numpy as np
+from EEM import EEMCube
+from Streulicht import remove_scatter, _scatter_plan
+
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# archivgrößen (vielfache der echten proben)
+factors = [1, 10, 50, 200]
+
+
+def tile_cube(cube, factor):
+    """
+    Sinn: Vervielfacht die echten Proben um ein größeres Archiv zu simulieren
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEMCube
+        echter Würfel
+
+    factor: int
+        Vervielfachung
+
+    Ergebnis:
+    ---------------------------------------
+    EEMCube mit factor * len(cube) Proben
+    """
+    samples = cube.samples.loc[cube.samples.index.repeat(factor)]
+    return EEMCube(np.repeat(cube.data, factor, axis=0), cube.ex, cube.em, samples)
+
+
+if __name__ == "__main__":
+    cube = EEMCube.from_files(glob(f"{path}/RF/*.txt"))
+
+    # masken bauen (kalt) vs. aus dem cache
+    _scatter_plan.cache_clear()
+    t0 = time.perf_counter()
+    remove_scatter(cube)
+    t_cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    remove_scatter(cube)
+    t_warm = time.perf_counter() - t0
+    print(f"{len(cube)} Proben: erster Aufruf {t_cold * 1000:.1f} ms, mit Cache {t_warm * 1000:.1f} ms")
+
+    print(f"{'Proben':>8} {'Zeit [ms]':>10} {'Proben/s':>12}")
+    for factor in factors:
+        big = tile_cube(cube, factor)
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            remove_scatter(big)
+            best = min(best, time.perf_counter() - t0)
+        print(f"{len(big):>8} {best * 1000:>10.1f} {len(big) / best:>12.0f}")
@@ -0,0 +1,72 @@
+# Skript: Benchmark für das Einlesen der GENESYS 10S UV/Vis Spektren
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import time
+from glob import glob
+import pandas as pd
+from UVVIS_Einlesen import load_uvvis_files, uvvis_long_table
+
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# archivgrößen (vielfache der echten spektren)
+factors = [1, 10, 100]
+
+
+def load_uvvis_files_alt(files):
+    """
+    Sinn: Alte Version aus UVVIS.py (read_csv + concat + sort pro Datei), nur als Referenz
+
+    Parameter:
+    ---------------------------------------
+
+    files: list
+        Pfade zu den .csv Dateien
+
+    Ergebnis:
+    ---------------------------------------
+    lange Tabelle wie AP_Messungen.csv
+    """
+    all_data = []
+    for f in files:
+        fname = os.path.basename(f).replace(".csv", "")
+        sample_id, date_str = fname.split("_")
+        date_formatted = pd.to_datetime(date_str, format="%d%m%y").date()
+        df = pd.read_csv(f, sep=";", skiprows=2, names=["Wavelength_nm", "Absorbance"], decimal=",")
+        df["Date"] = date_formatted
+        df["Sample"] = sample_id
+        all_data.append(df)
+    combined = pd.concat(all_data, ignore_index=True)
+    return combined.sort_values(by=["Date", "Wavelength_nm"], ascending=[True, True]).reset_index(drop=True)
+
+
+def load_uvvis_files_neu(files):
+    """
+    Sinn: Neue Version (paralleles Einlesen in eine Matrix, eine Sortierung)
+
+    Parameter:
+    ---------------------------------------
+
+    files: list
+        Pfade zu den .csv Dateien
+
+    Ergebnis:
+    ---------------------------------------
+    lange Tabelle wie AP_Messungen.csv
+    """
+    return uvvis_long_table(*load_uvvis_files(files))
+
+
+if __name__ == "__main__":
+    files = sorted(glob(f"{path}/UVVIS/AP[0-9]*.csv") + glob(f"{path}/UVVIS/SP[0-9]*.csv"))
+
+    print(f"{'Dateien':>8} {'alt [ms]':>10} {'neu [ms]':>10} {'Speedup':>8}")
+    for factor in factors:
+        batch = files * factor
+        times = []
+        for reader in (load_uvvis_files_alt, load_uvvis_files_neu):
+            t0 = time.perf_counter()
+            reader(batch)
+            times.append(time.perf_counter() - t0)
+        print(f"{len(batch):>8} {times[0] * 1000:>10.1f} {times[1] * 1000:>10.1f} {times[0] / times[1]:>7.1f}x")
@@ -2,29 +2,29 @@
 # Autor: Marc Kevin Schneider
 # Datum: September 2025
 
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from Plotcache import PlotCache
+from Zensierung import read_measurements, substitute
+from Unsicherheit import retention_uncertainty
+from Probenregister import build_registry
 
-path = "/data/"
-path_plots = "/plots/"
+# pfade lassen sich über DATA_PATH / PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
 
-messungen = pd.read_csv(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv")
+# plots nur neu rendern wenn sich daten oder der zeichencode des skripts geändert haben
+plot_cache = PlotCache(path_plots, "Bufferwirkung", __file__)
 
-# kopie
-df = messungen.copy()
+# messwerte mit flag für "<0.5" / ">5.0" (grenze als wert, flag in {spalte}_flag)
+messungen = read_measurements(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv")
 
-# codatum zu datetime
-df["Datum"] = pd.to_datetime(df["Datum"], format="%d.%m.%Y")
-
-# größer und kleiner zeichen weg und zu float
-for col in ["Nitrat", "Phosphor"]:
-    df[col] = (
-        df[col].astype(str)
-        .replace({r"<0\.5": "0.5", r">5\.0": "5.0"}, regex=True)
-        .astype(float)
-    )
+# zensierte werte wie bisher auf die grenze setzen; andere regeln (DL/2, 0, ROS)
+# vergleicht Sensitivitaet.py
+df = substitute(messungen, "DL")
 
 # wieder average
 df_avg = (
@@ -50,11 +50,22 @@ df_wide['Nitrat_pct'] = (df_wide['Nitrat_AP'] - df_wide['Nitrat_SP']) / df_wide[
 df_wide['Phosphor_pct'] = (df_wide['Phosphor_AP'] - df_wide['Phosphor_SP']) / df_wide['Phosphor_AP'] * 100
 df_wide['NPOC_pct'] = (df_wide['NPOC_AP'] - df_wide['NPOC_SP']) / df_wide['NPOC_AP'] * 100
 
-# differenz in prozent über zeit
+# unsicherheit der prozentwerte: monte carlo über replikate, nachweisgrenzen (<0.5, >5.0 als
+# intervall statt fester wert) und messpräzision (photometer, SD der TOC injektionen)
+# SD der TOC injektionen über das probenregister an die messungen hängen (die TOC proben
+# heißen z.B. AP01_020625, beprobt wurde aber am 03.06.)
+registry = build_registry(path)
+npoc = pd.read_csv(f"{path}/TOC/NPOC.csv")
+npoc_sd = registry.align(npoc["SD"], "TOC", "Naehrstoffe")
+buffer_bands = retention_uncertainty(messungen, npoc_sd=npoc_sd, n_draws=20_000)
+buffer_bands.to_csv(f"{path}/Bufferwirkung_Unsicherheit.csv", index=False)
+
+# differenz in prozent über zeit, mit 95 % band
 plt.figure(figsize=(10,5))
-plt.plot(df_wide['Datum'], df_wide['Nitrat_pct'], label='Nitrat', marker='o')
-plt.plot(df_wide['Datum'], df_wide['Phosphor_pct'], label='Phosphor', marker='o')
-plt.plot(df_wide['Datum'], df_wide['NPOC_pct'], label='NPOC', marker='o')
+for col, label in [("Nitrat", "Nitrat"), ("Phosphor", "Phosphor"), ("NPOC", "NPOC")]:
+    line, = plt.plot(df_wide['Datum'], df_wide[f'{col}_pct'], label=label, marker='o')
+    band = buffer_bands[buffer_bands["Nutrient"] == col]
+    plt.fill_between(band["Datum"], band["P2.5"], band["P97.5"], color=line.get_color(), alpha=0.2)
 plt.axhline(0, color='k', linestyle='--')
 plt.ylabel("Percent Reduction (%)")
 plt.xlabel("Date")
@@ -80,13 +91,19 @@ df_long['Nutrient'] = df_long['Nutrient'].replace({
 })
 
 # boxplot der differenzen
-plt.figure(figsize=(12,8))
-sns.boxplot(data=df_long, x="Nutrient", y="Percent_Reduction", palette="Set2")
-sns.stripplot(data=df_long, x="Nutrient", y="Percent_Reduction", color="black", alpha=0.5, jitter=True)
-plt.axhline(0, color='k', linestyle='--')
-plt.ylabel("Percent Reduction (%)")
-plt.grid(True, linestyle="--", alpha=0.6)
-#plt.title("Pond Buffer Effect on Nutrients")
-plt.savefig(f"{path_plots}/Bufferwirkung_Boxplot.png", 
-            dpi=300)
-plt.show()
\ No newline at end of file
+key = plot_cache.key(df_long)
+if not plot_cache.hit(f"{path_plots}/Bufferwirkung_Boxplot.png", key):
+    plt.figure(figsize=(12,8))
+    sns.boxplot(data=df_long, x="Nutrient", y="Percent_Reduction", palette="Set2")
+    sns.stripplot(data=df_long, x="Nutrient", y="Percent_Reduction", color="black", alpha=0.5, jitter=True)
+    plt.axhline(0, color='k', linestyle='--')
+    plt.ylabel("Percent Reduction (%)")
+    plt.grid(True, linestyle="--", alpha=0.6)
+    #plt.title("Pond Buffer Effect on Nutrients")
+    plot_cache.savefig(f"{path_plots}/Bufferwirkung_Boxplot.png", key,
+                       dpi=300)
+    plt.show()
+
+# veraltete plots aufräumen und treffer ins log
+plot_cache.evict()
+plot_cache.log()
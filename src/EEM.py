@@ -0,0 +1,372 @@
+# Skript: EEM Würfel (Probe × EX × EM) für die Shimadzu RF-6000 Daten
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from Funktionen import read_shimadzu_file, read_shimadzu_metadata
+from Probenregister import name_pattern
+
+# name der ersten spalte in den exporten
+ex_col = "EX Wavelength/EM Wavelength"
+
+
+def parse_sample_name(file_path):
+    """
+    Sinn: Holt Probenname und Datum aus einem Dateinamen wie "AP01_010725.txt"
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (series, sample_date) mit sample_date als pd.Timestamp
+    """
+    fname = os.path.splitext(os.path.basename(file_path.replace("\\", "/")))[0]
+    # gleiches namensschema wie im probenregister
+    match = re.match(name_pattern, fname)
+    if match is None or match["Date"] is None:
+        raise ValueError(f"Unbekannter Probenname: {file_path}")
+    return match["Site"] + match["Replicate"], pd.to_datetime(match["Date"], format="%d%m%y")
+
+
+def check_axes(meta, ex, em, file_path=""):
+    """
+    Sinn: Vergleicht die EX/EM Achsen mit den Angaben im Kopf der .txt Datei
+
+    Parameter:
+    ---------------------------------------
+
+    meta: dict
+        Ergebnis von read_shimadzu_metadata
+
+    ex, em: np.ndarray
+        EX und EM Wellenlängen aus dem Datenblock
+
+    file_path: str, optional
+        nur für die Fehlermeldung
+
+    Ergebnis:
+    ---------------------------------------
+    ValueError wenn die Achsen nicht zu den Metadaten passen
+    """
+    for name, values in (("EX", ex), ("EM", em)):
+        try:
+            start = float(meta[f"{name} Wavelength Start"].split()[0])
+            end = float(meta[f"{name} Wavelength End"].split()[0])
+            step = float(meta[f"{name} Data Interval"].split()[0])
+        except KeyError:
+            # ältere exporte ohne messparameter können wir nicht prüfen
+            continue
+        expected = np.arange(start, end + step / 2, step)
+        if len(expected) != len(values) or not np.allclose(expected, values):
+            raise ValueError(f"{name} Achse passt nicht zu den Metadaten ({start}-{end} nm, "
+                             f"{step} nm) in: {file_path}")
+
+
+class EEMCube:
+    """
+    Sinn: Hält alle Fluoreszenz-EEMs als einen zusammenhängenden float32 Würfel (Probe × EX × EM)
+    mit gemeinsamen EX/EM Achsen und einer kompakten Probentabelle (Series, Location, Sample_Date)
+
+    Parameter:
+    ---------------------------------------
+
+    data: np.ndarray
+        Intensitäten mit Form (Proben, EX, EM)
+
+    ex: np.ndarray
+        EX Wellenlängen
+
+    em: np.ndarray
+        EM Wellenlängen
+
+    samples: pd.DataFrame
+        eine Zeile pro Probe mit den Spalten "Series", "Location" und "Sample_Date"
+    """
+
+    def __init__(self, data, ex, em, samples):
+        self.data = np.ascontiguousarray(data, dtype=np.float32)
+        self.ex = np.asarray(ex, dtype=np.float32)
+        self.em = np.asarray(em, dtype=np.float32)
+        if self.data.shape[1:] != (len(self.ex), len(self.em)):
+            raise ValueError(f"Würfel {self.data.shape} passt nicht zu den Achsen "
+                             f"({len(self.ex)} EX, {len(self.em)} EM)")
+
+        # kompakte probentabelle (kategorien statt strings)
+        samples = samples.reset_index(drop=True).copy()
+        if "Location" not in samples.columns:
+            samples["Location"] = samples["Series"].str[:2]
+        samples["Sample_Date"] = pd.to_datetime(samples["Sample_Date"])
+        for col in ["Series", "Location"]:
+            samples[col] = samples[col].astype("category")
+        self.samples = samples[["Series", "Location", "Sample_Date"]]
+
+        # nachschlagetabelle (series, datum) -> position im würfel
+        self._lookup = {(s, d): i for i, (s, d) in
+                        enumerate(zip(self.samples["Series"], self.samples["Sample_Date"]))}
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __repr__(self):
+        return f"EEMCube({len(self)} Proben, {len(self.ex)} EX × {len(self.em)} EM)"
+
+    @classmethod
+    def from_files(cls, files, check=True):
+        """
+        Sinn: Baut den Würfel direkt aus den .txt Exporten (oder den daraus erzeugten .csv Dateien)
+
+        Parameter:
+        ---------------------------------------
+
+        files: list
+            Pfade zu den Dateien im Format SERIES_DDMMYY
+
+        check: bool, optional
+            prüft die Achsen gegen die Metadaten der .txt Dateien
+
+        Ergebnis:
+        ---------------------------------------
+        EEMCube mit den Proben sortiert nach Series und Datum
+        """
+        files = sorted(files, key=parse_sample_name)
+        if not files:
+            raise ValueError("Keine Dateien übergeben")
+
+        data, rows = None, []
+        ex = em = None
+        for i, f in enumerate(files):
+            if f.endswith(".txt"):
+                df = read_shimadzu_file(f)
+            else:
+                df = pd.read_csv(f)
+            # leere spalte am zeilenende (trailing komma im export) weg
+            df = df.loc[:, [c for c in df.columns if c and not str(c).startswith("Unnamed")]]
+
+            # achsen nur einmal pro datei parsen
+            file_ex = df[ex_col].to_numpy()
+            file_em = np.array([float(c) for c in df.columns[1:]])
+            if check and f.endswith(".txt"):
+                check_axes(read_shimadzu_metadata(f), file_ex, file_em, f)
+
+            if data is None:
+                ex, em = file_ex, file_em
+                data = np.empty((len(files), len(ex), len(em)), dtype=np.float32)
+            elif not (np.array_equal(ex, file_ex) and np.array_equal(em, file_em)):
+                raise ValueError(f"EX/EM Raster weicht von den anderen Dateien ab: {f}")
+
+            data[i] = df.iloc[:, 1:].to_numpy()
+            series, sample_date = parse_sample_name(f)
+            rows.append({"Series": series, "Sample_Date": sample_date})
+
+        return cls(data, ex, em, pd.DataFrame(rows))
+
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Sinn: Baut den Würfel aus dem breiten DataFrame (z.B. RF6000_AlleProben.csv)
+
+        Parameter:
+        ---------------------------------------
+
+        df: pd.DataFrame
+            eine Zeile pro (Probe, EX), die EM Wellenlängen als Spalten;
+            Proben über "Series" oder "Location" und "Sample_Date"
+
+        Ergebnis:
+        ---------------------------------------
+        EEMCube
+        """
+        key = "Series" if "Series" in df.columns else "Location"
+        em_cols = [c for c in df.columns
+                   if c not in [ex_col, "Series", "Location", "Sample_Date"]
+                   and not str(c).startswith("Unnamed")]
+        df = df.assign(Sample_Date=pd.to_datetime(df["Sample_Date"]))
+        df = df.sort_values([key, "Sample_Date", ex_col], kind="stable")
+
+        ex = np.sort(df[ex_col].unique())
+        em = np.array([float(c) for c in em_cols])
+        samples = df[[key, "Sample_Date"]].drop_duplicates().rename(columns={key: "Series"})
+        if len(df) != len(samples) * len(ex):
+            raise ValueError("Nicht alle Proben haben das gleiche EX Raster")
+
+        data = df[em_cols].to_numpy(dtype=np.float32).reshape(len(samples), len(ex), len(em))
+        return cls(data, ex, em, samples)
+
+    def index(self, series, sample_date):
+        """
+        Sinn: Position einer Probe im Würfel
+
+        Parameter:
+        ---------------------------------------
+
+        series: str
+            Probenname (z.B.: "AP01", "SP01")
+
+        sample_date: str oder datetime
+            Beprobungsdatum
+
+        Ergebnis:
+        ---------------------------------------
+        int, KeyError wenn es die Probe nicht gibt
+        """
+        key = (series, pd.Timestamp(sample_date))
+        if key not in self._lookup:
+            raise KeyError(f"Keine Daten für Probe {series} am {key[1].date()}")
+        return self._lookup[key]
+
+    def sample(self, series, sample_date):
+        """
+        Sinn: EEM einer Probe als View (keine Kopie) auf den Würfel
+
+        Parameter:
+        ---------------------------------------
+
+        series: str
+            Probenname (z.B.: "AP01", "SP01")
+
+        sample_date: str oder datetime
+            Beprobungsdatum
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray mit Form (EX, EM)
+        """
+        return self.data[self.index(series, sample_date)]
+
+    def select(self, **conditions):
+        """
+        Sinn: Teilwürfel für bestimmte Proben, z.B. cube.select(Location="AP")
+
+        Parameter:
+        ---------------------------------------
+
+        **conditions:
+            Spalte der Probentabelle = Wert (oder Liste von Werten)
+
+        Ergebnis:
+        ---------------------------------------
+        EEMCube mit den passenden Proben
+        """
+        keep = np.ones(len(self), dtype=bool)
+        for col, value in conditions.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if col == "Sample_Date":
+                values = pd.to_datetime(list(values))
+            keep &= self.samples[col].isin(values).to_numpy()
+        idx = np.flatnonzero(keep)
+        # zusammenhängende auswahl bleibt ein view
+        if len(idx) and np.array_equal(idx, np.arange(idx[0], idx[-1] + 1)):
+            data = self.data[idx[0]:idx[-1] + 1]
+        else:
+            data = self.data[idx]
+        return EEMCube(data, self.ex, self.em, self.samples.iloc[idx])
+
+    def to_frame(self, key="Series"):
+        """
+        Sinn: Zurück ins breite Format von RF6000_AlleProben.csv
+
+        Parameter:
+        ---------------------------------------
+
+        key: str, optional
+            "Series" (einzelne Proben) oder "Location" (z.B. für Durchschnitt_RF6000_AlleProben.csv)
+
+        Ergebnis:
+        ---------------------------------------
+        pd.DataFrame mit einer Zeile pro (Probe, EX)
+        """
+        n, n_ex, n_em = self.data.shape
+        df = pd.DataFrame(self.data.reshape(n * n_ex, n_em),
+                          columns=[f"{v:g}" for v in self.em])
+        df.insert(0, ex_col, np.tile(self.ex, n))
+        df[key] = np.repeat(self.samples[key].astype(str).to_numpy(), n_ex)
+        df["Sample_Date"] = np.repeat(self.samples["Sample_Date"].to_numpy(), n_ex)
+        return df
+
+    def save(self, file_path):
+        """
+        Sinn: Speichert den Würfel als binäre .npz Datei (viel schneller als die .csv)
+
+        Parameter:
+        ---------------------------------------
+
+        file_path: str
+            Pfad zur .npz Datei
+        """
+        np.savez(file_path, data=self.data, ex=self.ex, em=self.em,
+                 series=np.asarray(self.samples["Series"], dtype=str),
+                 sample_date=self.samples["Sample_Date"].to_numpy().astype("datetime64[ns]"))
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Sinn: Liest einen mit save gespeicherten Würfel
+
+        Parameter:
+        ---------------------------------------
+
+        file_path: str
+            Pfad zur .npz Datei
+
+        Ergebnis:
+        ---------------------------------------
+        EEMCube
+        """
+        with np.load(file_path) as f:
+            samples = pd.DataFrame({"Series": f["series"], "Sample_Date": f["sample_date"]})
+            return cls(f["data"], f["ex"], f["em"], samples)
+
+
+def average_replicates(cube, by=("Location", "Sample_Date")):
+    """
+    Sinn: Mittelt die Replikate (z.B. AP01 und AP02 am gleichen Tag -> AP) mit einer
+    segmentierten Reduktion über den ganzen Würfel statt groupby über alle EM Spalten
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEMCube
+        Würfel mit den einzelnen Proben
+
+    by: tuple, optional
+        Spalten der Probentabelle nach denen gruppiert wird
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (mean_cube, std, count):
+        mean_cube: EEMCube mit einer "Probe" pro Gruppe (Series = Location), direkt nutzbar
+                   für plot_location_over_time
+        std: np.ndarray (Gruppen × EX × EM) Standardabweichung der Replikate (ddof=1, NaN bei n < 2)
+        count: np.ndarray (Gruppen × EX × EM) Anzahl gültiger (nicht NaN) Replikate
+    """
+    by = list(by)
+    # gruppen codes, sortiert nach den gruppenspalten
+    groups = cube.samples[by].drop_duplicates().sort_values(by).reset_index(drop=True)
+    codes = cube.samples[by].merge(groups.reset_index(), on=by, how="left")["index"].to_numpy()
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+
+    # sortierte daten in float64, NaN zählen nicht mit (wie bei pandas mean)
+    x = cube.data[order].astype(np.float64)
+    valid = ~np.isnan(x)
+    x_filled = np.where(valid, x, 0.0)
+
+    count = np.add.reduceat(valid, starts, axis=0).astype(np.int32)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.add.reduceat(x_filled, starts, axis=0) / count
+        # zweiter durchlauf für die streuung (stabiler als summe der quadrate)
+        dev = np.where(valid, x - np.repeat(mean, np.diff(np.r_[starts, len(x)]), axis=0), 0.0)
+        std = np.sqrt(np.add.reduceat(dev ** 2, starts, axis=0) / (count - 1))
+    std[count < 2] = np.nan
+
+    if "Series" not in by:
+        groups["Series"] = groups[by[0]]
+    mean_cube = EEMCube(mean, cube.ex, cube.em, groups)
+    return mean_cube, std.astype(np.float32), count
@@ -0,0 +1,144 @@
+# Skript: Fluoreszenzindizes (FI, HIX, BIX, Coble Peaks) für alle EEMs auf einmal
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# definitionen der indizes (EX in nm, EM in nm)
+# FI nach Cory & McKnight (2005): EX 370, EM 470 / EM 520
+# HIX nach Ohno (2002): EX 254, Fläche EM 435-480 / (EM 300-345 + EM 435-480)
+# BIX nach Huguet et al. (2009): EX 310, EM 380 / EM 430
+# Coble (1996) Peaks: Maximum im jeweiligen EM Bereich
+coble_peaks = {
+    "B": (275, (310, 310)),
+    "T": (275, (340, 340)),
+    "A": (260, (380, 460)),
+    "M": (312, (380, 420)),
+    "C": (350, (420, 480)),
+}
+
+
+def nearest_index(axis, value, name):
+    """
+    Sinn: Index der nächstgelegenen Wellenlänge auf einer Achse
+
+    Parameter:
+    ---------------------------------------
+
+    axis: np.ndarray
+        EX oder EM Achse
+
+    value: float
+        gesuchte Wellenlänge
+
+    name: str
+        nur für die Fehlermeldung
+
+    Ergebnis:
+    ---------------------------------------
+    int, ValueError wenn die Wellenlänge außerhalb der Achse liegt
+    """
+    step = np.median(np.diff(axis)) if len(axis) > 1 else 0
+    if value < axis[0] - step / 2 or value > axis[-1] + step / 2:
+        raise ValueError(f"{name} {value} nm liegt außerhalb der Achse ({axis[0]}-{axis[-1]} nm)")
+    return int(np.abs(axis - value).argmin())
+
+
+def range_slice(axis, low, high):
+    """
+    Sinn: Slice aller Wellenlängen im Bereich [low, high] (mindestens die nächstgelegene)
+
+    Parameter:
+    ---------------------------------------
+
+    axis: np.ndarray
+        EX oder EM Achse
+
+    low, high: float
+        Bereichsgrenzen in nm
+
+    Ergebnis:
+    ---------------------------------------
+    slice
+    """
+    start = int(np.searchsorted(axis, low, side="left"))
+    stop = int(np.searchsorted(axis, high, side="right"))
+    if stop <= start:
+        i = nearest_index(axis, (low + high) / 2, "EM")
+        return slice(i, i + 1)
+    return slice(start, stop)
+
+
+@lru_cache(maxsize=8)
+def _index_lookup(ex_key, em_key):
+    ex = np.frombuffer(ex_key, dtype=np.float64)
+    em = np.frombuffer(em_key, dtype=np.float64)
+    lookup = {
+        "FI": (nearest_index(ex, 370, "EX"), nearest_index(em, 470, "EM"), nearest_index(em, 520, "EM")),
+        "HIX": (nearest_index(ex, 254, "EX"), range_slice(em, 435, 480), range_slice(em, 300, 345)),
+        "BIX": (nearest_index(ex, 310, "EX"), nearest_index(em, 380, "EM"), nearest_index(em, 430, "EM")),
+    }
+    for peak, (ex_nm, (em_low, em_high)) in coble_peaks.items():
+        lookup[peak] = (nearest_index(ex, ex_nm, "EX"), range_slice(em, em_low, em_high))
+    return lookup
+
+
+def index_lookup(ex, em):
+    """
+    Sinn: Positionen aller Indizes auf dem EX/EM Raster; wird pro Raster nur einmal berechnet
+
+    Parameter:
+    ---------------------------------------
+
+    ex, em: np.ndarray
+        EX und EM Achsen (z.B. EEMCube.ex / EEMCube.em)
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit den Indizes pro Kennzahl
+    """
+    return _index_lookup(np.asarray(ex, dtype=np.float64).tobytes(),
+                         np.asarray(em, dtype=np.float64).tobytes())
+
+
+def fluorescence_indices(cube):
+    """
+    Sinn: Berechnet FI, HIX, BIX und die Coble Peaks B/T/A/M/C für alle Proben in einem Durchgang
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube
+        Würfel mit allen Proben
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit einer Zeile pro Probe, Schlüssel wie in Nitrat_Phosphat.csv (Probe, Datum)
+    """
+    lookup = index_lookup(cube.ex, cube.em)
+    x = cube.data
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        i_ex, i_470, i_520 = lookup["FI"]
+        fi = x[:, i_ex, i_470].astype(np.float64) / x[:, i_ex, i_520]
+
+        i_ex, high, low = lookup["HIX"]
+        # float64 für die summen (nur die paar spalten, nicht den ganzen würfel)
+        h = np.nansum(x[:, i_ex, high].astype(np.float64), axis=1)
+        l = np.nansum(x[:, i_ex, low].astype(np.float64), axis=1)
+        hix = h / (h + l)
+
+        i_ex, i_380, i_430 = lookup["BIX"]
+        bix = x[:, i_ex, i_380].astype(np.float64) / x[:, i_ex, i_430]
+
+        peaks = {peak: np.nanmax(x[:, lookup[peak][0], lookup[peak][1]], axis=1).astype(np.float64)
+                 for peak in coble_peaks}
+
+    return pd.DataFrame({
+        "Probe": cube.samples["Series"].astype(str).to_numpy(),
+        "Datum": cube.samples["Sample_Date"].to_numpy(),
+        "FI": fi, "HIX": hix, "BIX": bix,
+        **{f"Peak_{peak}": values for peak, values in peaks.items()},
+    })
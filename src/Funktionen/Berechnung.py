@@ -0,0 +1,66 @@
+# Skript: Kleine Berechnungen für die Plotfunktionen (ohne matplotlib/seaborn)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+
+def percent_absorbed(absorbance):
+    """
+    Sinn: Absorbanz in absorbierte Strahlung in % umrechnen
+
+    Parameter:
+    ---------------------------------------
+
+    absorbance: pd.Series oder np.ndarray
+        Absorbanz (dekadisch)
+
+    Ergebnis:
+    ---------------------------------------
+    absorbierte Strahlung in % (gleicher Typ wie absorbance)
+    """
+    return (1 - 10 ** (-absorbance)) * 100
+
+
+def tick_positions(values, n_labels=10):
+    """
+    Sinn: Position und Beschriftung jeder n-ten Wellenlänge einer Heatmap Achse
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Wellenlängen der Achse
+
+    n_labels: int, optional
+        ungefähre Anzahl Beschriftungen
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (positionen, beschriftungen)
+    """
+    step = max(len(values) // n_labels, 1)
+    positions = list(range(0, len(values), step))
+    return positions, [f"{values[j]:.0f}" for j in positions]
+
+
+def tick_labels(values, n_labels=10):
+    """
+    Sinn: Beschriftung jeder n-ten Wellenlänge einer Heatmap Achse, dazwischen leer
+    (gleiche Auswahl wie tick_positions)
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Wellenlängen der Achse
+
+    n_labels: int, optional
+        ungefähre Anzahl Beschriftungen
+
+    Ergebnis:
+    ---------------------------------------
+    list mit einer Beschriftung pro Wellenlänge
+    """
+    labels = [""] * len(values)
+    for j, label in zip(*tick_positions(values, n_labels)):
+        labels[j] = label
+    return labels
@@ -0,0 +1,142 @@
+# Skript: Einlesen der Rohdaten der Messgeräte (Shimadzu RF-6000, GENESYS 10S), nur numpy und pandas
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import io
+import re
+import pandas as pd
+import numpy as np
+
+# felder der ersten kopfzeile in den GENESYS 10S exporten
+genesys_fields = ["Instrument_File", "Description", "Operator", "Measured", "Instrument",
+                  "Serial_Number", "Firmware"]
+
+
+def read_shimadzu_file(file_path):
+    """
+    Sinn: Liest die Daten des Shimadzu RF6000 Fluorospectrometer und macht daraus eine .csv Datei
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    .csv Datei der vorherigen .txt-Datei
+
+    """
+    # ließt die ganze datei auf einmal
+    with open(file_path, "r") as f:
+        text = f.read()
+
+    # finde die header zeile (einmal suchen statt zeile für zeile)
+    marker = '"EX Wavelength/EM Wavelength"'
+    if text.startswith(marker):
+        header_start = 0
+    else:
+        header_start = text.find("\n" + marker)
+        if header_start == -1:
+            raise ValueError(f"Keine Spaltennamendaten gefunden in: {file_path}")
+        header_start += 1
+    header_end = text.find("\n", header_start)
+    if header_end == -1:
+        header_end = len(text)
+
+    # extrahiere header
+    header = [h.replace('"', '') for h in text[header_start:header_end].strip().split(",")]
+    n_cols = len(header)
+
+    # numerischer block hinter dem header
+    # leere felder werden (wie früher) rausgeworfen, aber für den ganzen block auf einmal
+    block = re.sub(r",{2,}", ",", text[header_end + 1:])
+    data_lines = [line.strip().strip(",") for line in block.splitlines()]
+    data_lines = [line for line in data_lines if line]
+    if not data_lines:
+        return pd.DataFrame(columns=header, dtype=float)
+
+    # NaN wenn eine Zeile weniger Werte als die längste Zeile hat
+    n_values = [line.count(",") + 1 for line in data_lines]
+    n_max = max(n_values)
+    if min(n_values) < n_max:
+        data_lines = [line + ",nan" * (n_max - n) for line, n in zip(data_lines, n_values)]
+
+    # konvertiere alles auf einmal mit dem C-Parser von numpy
+    values = np.loadtxt(data_lines, delimiter=",", dtype=np.float64, ndmin=2)
+
+    # NaN wenn eine Zeile weniger Werte als Header hat, beschneide wenn sie mehr hat
+    if n_max < n_cols:
+        values = np.pad(values, ((0, 0), (0, n_cols - n_max)), constant_values=np.nan)
+    else:
+        values = values[:, :n_cols]
+
+    df = pd.DataFrame(values, columns=header)
+    return df
+
+def read_shimadzu_metadata(file_path):
+    """
+    Sinn: Liest die Messparameter aus dem Kopf einer Shimadzu RF6000 .txt Datei
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit den Kopfzeilen (Schlüssel ohne Doppelpunkt); "Data Interval" gibt es zweimal
+    und wird deshalb als "EX Data Interval" bzw. "EM Data Interval" gespeichert
+
+    """
+    meta = {}
+    axis = None
+    with open(file_path, "r") as f:
+        for line in f:
+            # header der daten erreicht, ab hier kommen nur noch zahlen
+            if line.startswith('"EX Wavelength/EM Wavelength"'):
+                break
+            parts = [p.strip().strip('"') for p in line.strip().split('","')]
+            if len(parts) != 2 or not parts[0].endswith(":"):
+                continue
+            key, value = parts[0][:-1], parts[1]
+            # merken ob wir gerade bei EX oder EM sind
+            if key.startswith(("EX Wavelength", "EM Wavelength")):
+                axis = key[:2]
+            if key == "Data Interval" and axis is not None:
+                key = f"{axis} Data Interval"
+            meta[key] = value
+    return meta
+
+def read_genesys_file(file_path):
+    """
+    Sinn: Liest ein Spektrum des GENESYS 10S UV/Vis Spectrometers samt der ersten Kopfzeile
+    (Dateiname am Gerät, Bediener, Messzeit, Gerät, Seriennummer, Firmware)
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (wavelengths, absorbance, meta) mit den Spalten als np.ndarray und meta als dict
+
+    """
+    with open(file_path, "rb") as f:
+        text = f.read()
+
+    # zeile 1 = messinfos, zeile 2 = spaltennamen (nm;A), danach die daten
+    parts = text.split(b"\n", 2)
+    if len(parts) < 3:
+        raise ValueError(f"Keine Absorptionsdaten gefunden in: {file_path}")
+    fields = parts[0].decode("utf-8", errors="replace").strip().split(";")
+    fields += [""] * (len(genesys_fields) - len(fields))
+    meta = dict(zip(genesys_fields, (x.strip() for x in fields)))
+
+    # dezimalkomma auf einmal ersetzen und dann mit dem C-Parser von numpy
+    values = np.loadtxt(io.BytesIO(parts[2].replace(b",", b".")), delimiter=";",
+                        dtype=np.float64, ndmin=2)
+    return values[:, 0], values[:, 1], meta
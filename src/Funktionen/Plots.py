@@ -0,0 +1,304 @@
+# Skript: Plotfunktionen für die anderen Skripte (UV/Vis Spektren, Fluoreszenz Heatmaps)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import numpy as np
+from .Berechnung import percent_absorbed, tick_labels
+
+# lässt sich über PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
+
+
+def plot_absorbed_radiation(df):
+    """
+    Sinn: Plottet die absorbierte Strahlung der Proben über Zeit
+
+    Parameter:
+    ----------------------------------
+
+    df : pd.DataFrame
+        Dataframe der Daten
+
+        
+    Ergebnis:
+    ----------------------------------
+    Plot der absorbierten Strahlung
+    """
+    # konvertiert absorption zu absorbierter Strahlung in %
+    df["PercentAbsorbed"] = percent_absorbed(df["Absorbance"])
+
+    # checkt nochmal die Sortierung
+    df = df.sort_values(by=["Date", "Wavelength_nm"])
+
+    # erstellt figure
+    plt.figure(figsize=(10, 6))
+
+    # gruppieren + plotten aller samples
+    for (date, sample), group in df.groupby(["Date", "Sample"]):
+        plt.plot(
+            group["Wavelength_nm"],
+            group["PercentAbsorbed"],
+            label=f"{sample} ({date})"
+        )
+
+    plt.xlabel("Wavelength (nm)")
+    plt.ylabel("Absorbed Radiation (%)")
+    plt.title("Percentage of Radiation Absorbed in Samples")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
+
+def plot_absorbed_radiation_ax(df, ax, title):
+    """
+    Sinn: Plottet die absorbierte Strahlung der Proben über Zeit
+
+    Parameter:
+    ----------------------------------
+
+    df : pd.DataFrame
+        Dataframe der Daten
+
+        
+    Ergebnis:
+    ----------------------------------
+    Plot der absorbierten Strahlung
+    """
+    # konvertiert absorption zu absorbierter Strahlung in %
+    df["PercentAbsorbed"] = percent_absorbed(df["Absorbance"])
+
+    # checkt nochmal die Sortierung
+    df = df.sort_values(by=["Date", "Wavelength_nm"])
+
+
+    # gruppieren + plotten aller samples
+    for (date, sample), group in df.groupby(["Date", "Location"]):
+        ax.plot(
+            group["Wavelength_nm"],
+            group["PercentAbsorbed"],
+            label=f"{sample} ({date})"
+        )
+
+    ax.set_xlabel("Wavelength (nm)")
+    ax.set_ylabel("Absorbed Radiation (%)")
+    ax.set_title(f"{title}")
+    ax.legend()
+    ax.grid(True)
+
+
+
+def draw_eem_heatmap(intensity_matrix, ex_values, em_values, ax, vmax=None, vmin=None):
+    """
+    Sinn: Zeichnet eine EEM Matrix als Heatmap in eine vorhandene Achse
+
+    Parameter:
+    -------------------------------------
+        intensity_matrix : np.ndarray
+            Intensitäten mit Form (EX, EM)
+
+        ex_values, em_values : np.ndarray
+            EX und EM Wellenlängen
+
+        ax : matplotlib.axes.Axes
+            Achse in die geplottet wird
+
+        vmax, vmin : float, optional
+            Max./Min. Wert der Colorscale
+
+
+    Ergebnis:
+    -------------------------------------
+    Heatmap in ax
+    """
+    # für die x- und y-Achsenbeschriftungen
+    # macht alle 10 Schritte eine Beschriftung
+    xtick_labels = tick_labels(em_values)
+    ytick_labels = tick_labels(ex_values)
+
+    sns.heatmap(intensity_matrix,
+                xticklabels=xtick_labels,
+                yticklabels=ytick_labels,
+                cmap="viridis",
+                vmax=vmax,
+                vmin=vmin,
+                ax=ax)
+    ax.set_xlabel("EM Wavelength [nm]")
+
+
+def plot_fluorescence_heatmap(df, series, sample_date, vmax=None, vmin=None, figsize=(12,6), cache=None):
+    """
+    Sinn: Plotted eine 2D Fluoresenz heatmap für eine Probe und Datum
+    
+    Parameter:
+    -------------------------------------
+        df : pandas.DataFrame oder EEM.EEMCube
+            DataFrame mit allen Proben oder EEM Würfel
+
+        series : str
+            Probenname (z.B.: "AP01", "SP01")
+
+        sample_date : str oder datetime
+            Beprobungsdatum
+
+        vmax : float, optional
+            Maximalwert für die colorscale
+
+        vmin : float, optional
+            Minimalwert für die colorscale
+
+        figsize : tuple, optional
+            Größe des Plots
+
+        cache : Plotcache.PlotCache, optional
+            wenn gesetzt wird nur neu gerendert wenn sich Daten oder Parameter geändert haben
+
+            
+    Ergebnis:
+    -------------------------------------
+    Heatmap, die ähnlich dem Display des Shimidzu RF-6000 ist
+    """
+    # konvertiere zu Datetime falls notwendig
+    sample_date = pd.to_datetime(sample_date)
+
+    if isinstance(df, pd.DataFrame):
+        # probe auswählen
+        sample_df = df[(df["Series"] == series) & (df["Sample_Date"] == sample_date)]
+        if sample_df.empty:
+            raise ValueError(f"Keine Daten für Probe {series} am {sample_date.date()}")
+
+        # numerische spalten identifizieren
+        em_cols = [c for c in sample_df.columns
+                   if c not in ["EX Wavelength/EM Wavelength", "Series", "Sample_Date"]
+                   and not str(c).startswith("Unnamed")]
+
+        # spaltennamen zu float
+        em_values = np.array([float(c) for c in em_cols])
+        # intensitätsmatrix extrahieren
+        intensity_matrix = sample_df[em_cols].values
+        # EX Wellenlängen
+        ex_values = sample_df["EX Wavelength/EM Wavelength"].values
+    else:
+        # EEM Würfel: achsen sind schon da, die matrix ist nur ein view
+        try:
+            intensity_matrix = df.sample(series, sample_date)
+        except KeyError:
+            raise ValueError(f"Keine Daten für Probe {series} am {sample_date.date()}")
+        ex_values, em_values = df.ex, df.em
+
+    # schon gerendert?
+    file_path = f"{path_plots}/RF_{series}_{sample_date:%Y-%m-%d}.png"
+    if cache is not None:
+        key = cache.key(np.asarray(intensity_matrix), np.asarray(ex_values), np.asarray(em_values),
+                        plot="heatmap", series=series, vmax=vmax, vmin=vmin, figsize=figsize)
+        if cache.hit(file_path, key):
+            return
+
+    # heatmap
+    plt.figure(figsize=figsize)
+    draw_eem_heatmap(intensity_matrix, ex_values, em_values, plt.gca(), vmax=vmax, vmin=vmin)
+    
+    plt.ylabel("EX Wavelength [nm]")
+    plt.title(f"Fluorescence 2D spectrum ({series} {sample_date.date()})")
+    plt.savefig(file_path, dpi=300)
+    if cache is not None:
+        cache.store(file_path, key)
+    plt.show()
+
+
+
+def plot_location_over_time(df, location, vmax=None, vmin=None, figsize=(16,8), cache=None):
+    """
+    Sinn: Plotted 2D Fluoreszenz Heatmaps über die gesamte Zeitserie
+    
+    Parameter:
+    -------------------------------------
+        df : pandas.DataFrame oder EEM.EEMCube
+            DataFrame mit allen Proben oder EEM Würfel
+
+        location: str
+            Name des Probenortes; möglich sind "AP" und "SP"
+
+        vmax: float
+            Max. Wert der Colorscale; optional; standardmäßig auf "None" gesetzt
+
+        vmin: float
+            Min. Wert der Colorscale; optional; standardmäßig auf "None" gesetzt
+
+        figsize : tuple, optional
+            Größe des Plots
+
+        cache : Plotcache.PlotCache, optional
+            wenn gesetzt wird nur neu gerendert wenn sich Daten oder Parameter geändert haben
+
+            
+    Ergebnis:
+    -------------------------------------
+    Heatmaps, die ähnlich dem Display des Shimidzu RF-6000 sind, aber über die Zeitreihe
+    """
+    if isinstance(df, pd.DataFrame):
+        # sortieren nach Aufnahmedatum
+        dates = sorted(df.loc[df["Location"] == location, "Sample_Date"].unique())
+        # extrahiere Spalten (nur einmal, nicht für jedes Datum)
+        em_cols = [c for c in df.columns if c not in ["EX Wavelength/EM Wavelength", "Sample_Date", "Location"]]
+        # erst zu float dann zu array
+        em_values = np.array([float(c) for c in em_cols])
+    else:
+        # EEM Würfel: positionen der proben am ort, sortiert nach datum
+        idx = np.flatnonzero((df.samples["Location"] == location).to_numpy())
+        idx = idx[np.argsort(df.samples["Sample_Date"].to_numpy()[idx], kind="stable")]
+        dates = list(df.samples["Sample_Date"].iloc[idx])
+        em_values = df.em
+
+    # schon gerendert?
+    file_path = f"{path_plots}/RF_{location}_Timeseries.png"
+    if cache is not None:
+        if isinstance(df, pd.DataFrame):
+            data_slice = df[df["Location"] == location]
+        else:
+            data_slice = df.data[idx]
+        key = cache.key(data_slice, np.asarray(dates, dtype="datetime64[ns]"), plot="timeseries",
+                        location=location, vmax=vmax, vmin=vmin, figsize=figsize)
+        if cache.hit(file_path, key):
+            return
+    n = len(dates)
+    # Anzahl der Subplots in Abhängigkeit von der Anzahl an Messpunkten
+    fig, axes = plt.subplots(1, n, figsize=figsize, sharey=True)
+    
+    # falls es nur ein Messdatum gibt
+    if n == 1:  
+        axes = [axes]
+    
+    # sonst loop
+    for i, date in enumerate(dates):
+        if isinstance(df, pd.DataFrame):
+            # extrahiere Daten
+            sample_df = df[(df["Location"] == location) & (df["Sample_Date"] == date)]
+            ex_values = sample_df["EX Wavelength/EM Wavelength"].values
+            # als Matrix extrahieren
+            intensity_matrix = sample_df[em_cols].values
+        else:
+            ex_values = df.ex
+            intensity_matrix = df.data[idx[i]]
+        
+        # plotte heatmap
+        draw_eem_heatmap(intensity_matrix, ex_values, em_values, axes[i], vmax=vmax, vmin=vmin)
+        
+        # setzt das Datum als subplot titel
+        axes[i].set_title(str(pd.Timestamp(date).date()))
+        if i == 0:
+            axes[i].set_ylabel("EX Wavelength [nm]")
+        else:
+            axes[i].set_ylabel("")
+    
+    # weiteres formatting
+    plt.suptitle(f"Fluorescence spectra over time – {location}", fontsize=16)
+    plt.tight_layout()
+    # speichern
+    plt.savefig(file_path, dpi=300)
+    if cache is not None:
+        cache.store(file_path, key)
+    plt.show()
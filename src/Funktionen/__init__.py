@@ -0,0 +1,40 @@
+# Skript: Funktionen für die anderen Skripte
+# Autor: Marc Kevin Schneider
+# Datum: September 2025
+
+# aufgeteilt in Einlesen (numpy/pandas), Berechnung (ohne abhängigkeiten) und Plots (matplotlib/seaborn);
+# die untermodule werden erst beim ersten zugriff geladen, damit einlese- und rechenjobs
+# (z.B. RF_Konvertierung) den plotting stack gar nicht erst importieren
+import importlib
+
+# name -> untermodul
+_exports = {
+    "genesys_fields": "Einlesen",
+    "read_shimadzu_file": "Einlesen",
+    "read_shimadzu_metadata": "Einlesen",
+    "read_genesys_file": "Einlesen",
+    "percent_absorbed": "Berechnung",
+    "tick_labels": "Berechnung",
+    "tick_positions": "Berechnung",
+    "path_plots": "Plots",
+    "plot_absorbed_radiation": "Plots",
+    "plot_absorbed_radiation_ax": "Plots",
+    "draw_eem_heatmap": "Plots",
+    "plot_fluorescence_heatmap": "Plots",
+    "plot_location_over_time": "Plots",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+    # beim nächsten zugriff ein normales attribut
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
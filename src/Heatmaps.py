@@ -0,0 +1,140 @@
+# Skript: Headless Batch-Rendering der Fluoreszenz Heatmaps für alle Proben
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from Funktionen import tick_positions
+
+# lässt sich über PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
+
+
+def render_chunk(data, ex, em, labels, out_dir, vmin=None, vmax=None, figsize=(12, 6), dpi=300):
+    """
+    Sinn: Rendert mehrere EEMs mit einer einzigen Figure; pro Probe werden nur die
+    Bilddaten, die Farbskala und der Titel ausgetauscht
+
+    Parameter:
+    ---------------------------------------
+
+    data: np.ndarray
+        EEMs (Proben × EX × EM)
+
+    ex, em: np.ndarray
+        EX und EM Achsen
+
+    labels: list
+        (series, datum als "YYYY-MM-DD") pro Probe
+
+    out_dir: str
+        Ordner für die .png Dateien
+
+    vmin, vmax: float, optional
+        feste Farbskala; sonst pro Probe Min./Max.
+
+    figsize, dpi: optional
+        wie bei plot_fluorescence_heatmap
+
+    Ergebnis:
+    ---------------------------------------
+    Liste der geschriebenen Dateien
+    """
+    # matplotlib erst hier, so laden nur die render-worker den plotting stack
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import Normalize
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    norm = Normalize(vmin=vmin, vmax=vmax)
+    image = ax.imshow(data[0], cmap="viridis", norm=norm, aspect="auto", interpolation="nearest")
+    fig.colorbar(image, ax=ax)
+
+    xpos, xlab = tick_positions(em)
+    ypos, ylab = tick_positions(ex)
+    ax.set_xticks(xpos, xlab, rotation=90)
+    ax.set_yticks(ypos, ylab)
+    ax.set_xlabel("EM Wavelength [nm]")
+    ax.set_ylabel("EX Wavelength [nm]")
+    title = ax.set_title("")
+
+    files = []
+    for matrix, (series, date) in zip(data, labels):
+        image.set_data(matrix)
+        # ohne feste grenzen wie bei seaborn pro probe skalieren
+        norm.vmin = np.nanmin(matrix) if vmin is None else vmin
+        norm.vmax = np.nanmax(matrix) if vmax is None else vmax
+        image.changed()
+        title.set_text(f"Fluorescence 2D spectrum ({series} {date})")
+        file_path = os.path.join(out_dir, f"RF_{series}_{date}.png")
+        fig.savefig(file_path, dpi=dpi)
+        files.append(file_path)
+    return files
+
+
+def render_fluorescence_heatmaps(cube, out_dir=path_plots, vmin=None, vmax=None, workers=None,
+                                 figsize=(12, 6), dpi=300, cache=None):
+    """
+    Sinn: Rendert die Heatmaps aller Proben des Würfels ohne GUI (Agg) auf mehreren Prozessen;
+    ersetzt die Schleife über Series × Datum mit plot_fluorescence_heatmap
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube
+        Würfel mit allen Proben (jede Probe wird genau einmal gerendert)
+
+    out_dir: str, optional
+        Ordner für die .png Dateien
+
+    vmin, vmax: float, optional
+        feste Farbskala
+
+    workers: int, optional
+        Anzahl Prozesse; 1 = ohne Pool
+
+    figsize, dpi: optional
+        wie bei plot_fluorescence_heatmap
+
+    cache: Plotcache.PlotCache, optional
+        Proben, deren Heatmap mit gleichen Daten und Parametern schon existiert, werden übersprungen
+
+    Ergebnis:
+    ---------------------------------------
+    Liste der geschriebenen Dateien
+    """
+    labels = [(str(s), f"{d:%Y-%m-%d}") for s, d in zip(cube.samples["Series"], cube.samples["Sample_Date"])]
+    data = cube.data
+
+    # nur proben rendern, die sich geändert haben
+    if cache is not None:
+        keys = [cache.key(matrix, cube.ex, cube.em, vmin=vmin, vmax=vmax, figsize=figsize, dpi=dpi)
+                for matrix in data]
+        todo = [i for i, (series, date) in enumerate(labels)
+                if not cache.hit(os.path.join(out_dir, f"RF_{series}_{date}.png"), keys[i])]
+        if len(todo) < len(labels):
+            data = data[todo]
+            labels = [labels[i] for i in todo]
+            keys = [keys[i] for i in todo]
+        if not todo:
+            return []
+
+    n_workers = min(workers or os.cpu_count() or 1, len(labels))
+    if n_workers <= 1:
+        files = render_chunk(data, cube.ex, cube.em, labels, out_dir, vmin, vmax, figsize, dpi)
+    else:
+        # zusammenhängende blöcke, damit jeder prozess nur eine figure baut
+        chunks = np.array_split(np.arange(len(labels)), n_workers)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(render_chunk, data[idx[0]:idx[-1] + 1], cube.ex, cube.em,
+                                   labels[idx[0]:idx[-1] + 1], out_dir, vmin, vmax, figsize, dpi)
+                       for idx in chunks if len(idx)]
+            files = [f for future in futures for f in future.result()]
+
+    if cache is not None:
+        for file_path, key in zip(files, keys):
+            cache.store(file_path, key)
+    return files
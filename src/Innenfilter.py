@@ -0,0 +1,127 @@
+# Skript: Innerer-Filter-Effekt (IFE) Korrektur der RF-6000 EEMs mit den UV/Vis Absorptionsdaten
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import numpy as np
+import pandas as pd
+from EEM import EEMCube
+
+
+def interpolation_weights(source, target):
+    """
+    Sinn: Gewichte für die lineare Interpolation von einem Wellenlängenraster auf ein anderes;
+    wird einmal pro Raster berechnet und dann für alle Proben benutzt
+
+    Parameter:
+    ---------------------------------------
+
+    source: np.ndarray
+        aufsteigende Wellenlängen der Messung (z.B. 190-1100 nm in 1 nm Schritten)
+
+    target: np.ndarray
+        Wellenlängen auf die interpoliert wird (z.B. EEMCube.ex)
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (left, w): Wert = a[..., left] * (1 - w) + a[..., left + 1] * w
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    if target.min() < source[0] or target.max() > source[-1]:
+        raise ValueError(f"Zielraster ({target.min()}-{target.max()} nm) liegt außerhalb der Messung "
+                         f"({source[0]}-{source[-1]} nm)")
+    left = np.clip(np.searchsorted(source, target, side="right") - 1, 0, len(source) - 2)
+    w = (target - source[left]) / (source[left + 1] - source[left])
+    return left, w
+
+
+def apply_weights(values, weights):
+    """
+    Sinn: Interpoliert alle Proben auf einmal mit vorberechneten Gewichten
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Absorption (Proben × Wellenlängen)
+
+    weights: tuple
+        Ergebnis von interpolation_weights
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Proben × Zielwellenlängen)
+    """
+    left, w = weights
+    return values[:, left] * (1 - w) + values[:, left + 1] * w
+
+
+def absorbance_matrix(df):
+    """
+    Sinn: Macht aus der langen UV/Vis Tabelle (wie AP_Messungen.csv) eine Proben × Wellenlängen Matrix
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Spalten "Sample", "Date", "Wavelength_nm", "Absorbance"
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (absorbance, wavelengths, samples) mit samples als DataFrame (Series, Sample_Date)
+    """
+    wide = df.pivot_table(index=["Sample", "Date"], columns="Wavelength_nm", values="Absorbance")
+    wide = wide.sort_index(axis=1)
+    samples = wide.index.to_frame(index=False).rename(columns={"Sample": "Series", "Date": "Sample_Date"})
+    samples["Sample_Date"] = pd.to_datetime(samples["Sample_Date"])
+    return wide.to_numpy(dtype=np.float64), wide.columns.to_numpy(dtype=np.float64), samples
+
+
+def correct_inner_filter(cube, absorbance, wavelengths, samples, path_length=1.0):
+    """
+    Sinn: Korrigiert den inneren Filtereffekt für alle Proben in einem Schritt nach
+    F_korr = F * 10^((A_ex + A_em) / 2) (Lakowicz 2006, Kothawala et al. 2013);
+    Zuordnung über Probenname und Datum (gleiche Dateinamen SERIES_DDMMYY)
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube
+        Würfel mit allen Proben
+
+    absorbance: np.ndarray
+        Absorption (Proben × Wellenlängen), gemessen mit path_length
+
+    wavelengths: np.ndarray
+        Wellenlängen der Absorption
+
+    samples: pd.DataFrame
+        Series und Sample_Date für jede Zeile von absorbance
+
+    path_length: float, optional
+        Schichtdicke der UV/Vis Küvette in cm (auf 1 cm umgerechnet)
+
+    Ergebnis:
+    ---------------------------------------
+    neuer EEMCube; Proben ohne UV/Vis Messung bleiben unkorrigiert (wird ausgegeben).
+    Die Korrektur ist nur bis etwa A254 = 1.5 verlässlich.
+    """
+    # gewichte nur einmal für EX und EM
+    a_ex = apply_weights(absorbance, interpolation_weights(wavelengths, cube.ex)) / path_length
+    a_em = apply_weights(absorbance, interpolation_weights(wavelengths, cube.em)) / path_length
+
+    # zuordnung der EEM proben zu den UV/Vis zeilen
+    keys = pd.MultiIndex.from_frame(samples[["Series", "Sample_Date"]].astype({"Series": str}))
+    rows = keys.get_indexer(pd.MultiIndex.from_arrays([cube.samples["Series"].astype(str),
+                                                       cube.samples["Sample_Date"]]))
+    matched = rows >= 0
+    if not matched.all():
+        missing = cube.samples.loc[~matched, ["Series", "Sample_Date"]]
+        print(f"Keine UV/Vis Daten für {len(missing)} Proben (bleiben unkorrigiert):")
+        print(missing.to_string(index=False))
+
+    # korrekturmatrix für alle proben auf einmal (proben × EX × EM)
+    a_ex = np.where(matched[:, None], a_ex[rows], 0.0)
+    a_em = np.where(matched[:, None], a_em[rows], 0.0)
+    factor = 10 ** (0.5 * (a_ex[:, :, None] + a_em[:, None, :]))
+    return EEMCube(cube.data * factor.astype(np.float32), cube.ex, cube.em, cube.samples)
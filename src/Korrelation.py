@@ -0,0 +1,352 @@
+# Skript: Gruppierte Pearson/Spearman Korrelationen mit Bootstrap Konfidenzintervallen in einem Durchgang
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import warnings
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def segment_ranks(values, starts):
+    """
+    Sinn: Ränge innerhalb zusammenhängender Gruppen (Bindungen bekommen den mittleren Rang
+    wie bei scipy.stats.rankdata), für alle Zeilen einer Matrix auf einmal
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Werte mit Form (Replikate, N); die Gruppen liegen in jeder Zeile an denselben Stellen
+
+    starts: np.ndarray
+        Startindex jeder Gruppe (aufsteigend)
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit den Rängen (1 = kleinster Wert der Gruppe)
+    """
+    values = np.atleast_2d(values)
+    n_rep, n = values.shape
+    counts = np.diff(np.r_[starts, n])
+    seg = np.repeat(np.arange(len(starts)), counts)
+
+    # nach gruppe und dann nach wert sortieren, zeile für zeile
+    order = np.lexsort((values, np.broadcast_to(seg, values.shape)), axis=-1)
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    position = (np.arange(n) - np.repeat(starts, counts) + 1).astype(np.float64)
+
+    # gleiche werte (innerhalb einer gruppe) bilden einen block mit dem mittleren rang
+    new_block = np.ones(values.shape, dtype=bool)
+    new_block[:, 1:] = (sorted_values[:, 1:] != sorted_values[:, :-1]) | (seg[1:] != seg[:-1])
+    block = np.cumsum(new_block.ravel()) - 1
+    mean_rank = (np.bincount(block, weights=np.broadcast_to(position, values.shape).ravel())
+                 / np.bincount(block))
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, mean_rank[block].reshape(values.shape), axis=1)
+    return ranks
+
+
+def segment_pearson(x, y, starts):
+    """
+    Sinn: Pearson Korrelation innerhalb zusammenhängender Gruppen über Segmentsummen
+
+    Parameter:
+    ---------------------------------------
+
+    x, y: np.ndarray
+        Werte mit Form (Replikate, N), ohne NaN
+
+    starts: np.ndarray
+        Startindex jeder Gruppe (aufsteigend)
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit Form (Replikate, Gruppen); NaN bei weniger als 2 Punkten oder ohne Streuung
+    """
+    x, y = np.atleast_2d(x), np.atleast_2d(y)
+    counts = np.diff(np.r_[starts, x.shape[1]])
+
+    # zweiter durchlauf um die mittelwerte (stabiler als summe der quadrate)
+    dx = x - np.repeat(np.add.reduceat(x, starts, axis=1) / counts, counts, axis=1)
+    dy = y - np.repeat(np.add.reduceat(y, starts, axis=1) / counts, counts, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (np.add.reduceat(dx * dy, starts, axis=1)
+             / np.sqrt(np.add.reduceat(dx ** 2, starts, axis=1) * np.add.reduceat(dy ** 2, starts, axis=1)))
+    r[:, counts < 2] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def segment_correlation(x, y, starts, method="pearson"):
+    """
+    Sinn: Pearson oder Spearman Korrelation innerhalb zusammenhängender Gruppen
+
+    Parameter:
+    ---------------------------------------
+
+    x, y: np.ndarray
+        Werte mit Form (Replikate, N), ohne NaN
+
+    starts: np.ndarray
+        Startindex jeder Gruppe (aufsteigend)
+
+    method: str, optional
+        "pearson" oder "spearman"
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit Form (Replikate, Gruppen)
+    """
+    if method == "spearman":
+        x, y = segment_ranks(x, starts), segment_ranks(y, starts)
+    elif method != "pearson":
+        raise ValueError(f"Unbekannte method: {method}")
+    return segment_pearson(x, y, starts)
+
+
+def grouped_correlation(df, by, pairs, method="pearson", n_boot=0, ci=0.95, seed=0, chunk_size=2_000_000):
+    """
+    Sinn: Korrelation für alle Gruppen und alle Variablenpaare ohne groupby().apply;
+    optional mit Bootstrap Konfidenzintervallen (Resampling Indizes als Matrix)
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Daten in langer Form
+
+    by: str oder list
+        Spalte(n) für die Gruppen (z.B. "Date" oder ["Date", "Band"])
+
+    pairs: dict
+        Name -> (Spalte x, Spalte y)
+
+    method: str, optional
+        "pearson" oder "spearman"
+
+    n_boot: int, optional
+        Anzahl Bootstrap Replikate, 0 = ohne Konfidenzintervalle
+
+    ci: float, optional
+        Niveau der Konfidenzintervalle (Perzentilmethode)
+
+    seed: int, optional
+        Seed für den Zufallsgenerator (reproduzierbare Intervalle)
+
+    chunk_size: int, optional
+        maximale Anzahl Werte pro Bootstrap Block (begrenzt den Speicher)
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit einer Zeile pro Gruppe und pro Paar den Spalten name, name_n
+    und (mit n_boot) name_low, name_high; NaN-Paare werden paarweise rausgeworfen
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    grouped = df.groupby(by, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    result = pd.DataFrame(index=grouped.size().index)
+    n_groups = len(result)
+    rng = np.random.default_rng(seed)
+    alpha = (1 - ci) / 2
+
+    for name, (x_col, y_col) in pairs.items():
+        x = df[x_col].to_numpy(dtype=np.float64)
+        y = df[y_col].to_numpy(dtype=np.float64)
+
+        # paarweise vollständige zeilen, nach gruppe sortiert
+        valid = np.isfinite(x) & np.isfinite(y) & (codes >= 0)
+        order = np.argsort(codes[valid], kind="stable")
+        c, x, y = codes[valid][order], x[valid][order], y[valid][order]
+        present, starts = np.unique(c, return_index=True)
+        counts = np.diff(np.r_[starts, len(c)])
+
+        r = np.full(n_groups, np.nan)
+        n = np.zeros(n_groups, dtype=np.int64)
+        low, high = np.full(n_groups, np.nan), np.full(n_groups, np.nan)
+        if len(c):
+            r[present] = segment_correlation(x, y, starts, method)[0]
+            n[present] = counts
+
+            if n_boot:
+                # jede zeile zieht einen zufälligen index aus ihrer eigenen gruppe
+                offset, size = np.repeat(starts, counts), np.repeat(counts, counts)
+                per_block = max(chunk_size // len(c), 1)
+                boot = []
+                for b0 in range(0, n_boot, per_block):
+                    b = min(per_block, n_boot - b0)
+                    idx = offset + (rng.random((b, len(c))) * size).astype(np.intp)
+                    boot.append(segment_correlation(x[idx], y[idx], starts, method))
+                with warnings.catch_warnings():
+                    # gruppen mit < 2 punkten haben nur NaN replikate
+                    warnings.simplefilter("ignore", RuntimeWarning)
+                    low[present], high[present] = np.nanquantile(np.vstack(boot), [alpha, 1 - alpha], axis=0)
+
+        result[name] = r
+        result[f"{name}_n"] = n
+        if n_boot:
+            result[f"{name}_low"] = low
+            result[f"{name}_high"] = high
+    return result
+
+
+def choose_method(data, alpha=0.05):
+    """
+    Sinn: Shapiro-Wilk Test für jede Spalte; nur wenn alle normalverteilt sind wird Pearson genommen,
+    sonst Spearman
+
+    Parameter:
+    ---------------------------------------
+
+    data: pd.DataFrame
+        Variablen als Spalten, NaN werden pro Spalte rausgeworfen
+
+    alpha: float, optional
+        Signifikanzniveau
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (method, pd.Series mit den Shapiro-Wilk p-Werten)
+    """
+    normality = pd.Series({col: stats.shapiro(data[col].dropna())[1] for col in data.columns})
+    method = "pearson" if (normality > alpha).all() else "spearman"
+    return method, normality
+
+
+def pairwise_pearson(values, valid):
+    """
+    Sinn: Pearson Korrelation aller Spaltenpaare mit paarweise vollständigen Zeilen, nur über
+    Matrixprodukte mit der Maske (Summen, Quadratsummen und Kreuzprodukte der gemeinsamen Zeilen),
+    egal wie die NaN verteilt sind
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Daten (Zeilen, Variablen)
+
+    valid: np.ndarray
+        bool Maske der gültigen Werte
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Variablen, Variablen), NaN wenn eine Spalte in den gemeinsamen Zeilen konstant ist
+    """
+    m = valid.astype(np.float64)
+    # vorher zentrieren, sonst frisst die auslöschung bei großen mittelwerten die genauigkeit
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+    n = m.T @ m
+    sx = x.T @ m
+    sxx = (x ** 2).T @ m
+    sxy = x.T @ x
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_x = sxx - sx ** 2 / n
+        # konstante spalten: varianz ist nur noch rundungsrest
+        var_x[var_x <= 1e-12 * sxx] = np.nan
+        r = cov / np.sqrt(var_x * var_x.T)
+    return np.clip(r, -1.0, 1.0)
+
+
+def pattern_spearman(values, patterns, inverse):
+    """
+    Sinn: Spearman Korrelation aller Spaltenpaare über die NaN-Muster: die Spalten eines Musterpaars
+    werden auf den gemeinsamen Zeilen einmal gerankt und als ein Matrixprodukt korreliert
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Daten (Zeilen, Variablen)
+
+    patterns: np.ndarray
+        bool Muster der gültigen Zeilen (Muster, Zeilen), z.B. aus np.unique(valid.T, axis=0)
+
+    inverse: np.ndarray
+        Muster jeder Spalte
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Variablen, Variablen)
+    """
+    n_vars = values.shape[1]
+    corr = np.full((n_vars, n_vars), np.nan)
+    members = [np.flatnonzero(inverse == k) for k in range(len(patterns))]
+    for a in range(len(patterns)):
+        for b in range(a, len(patterns)):
+            rows = patterns[a] & patterns[b]
+            if rows.sum() < 2:
+                continue
+            idx = members[a] if a == b else np.r_[members[a], members[b]]
+
+            x = stats.rankdata(values[rows][:, idx], axis=0)
+            x = x - x.mean(axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                x = x / np.sqrt((x ** 2).sum(axis=0))
+            r = np.clip(x.T @ x, -1.0, 1.0)
+
+            k = len(members[a])
+            block = r[:k, :k] if a == b else r[:k, k:]
+            corr[np.ix_(members[a], members[b])] = block
+            corr[np.ix_(members[b], members[a])] = block.T
+    return corr
+
+
+def correlation_matrix(data, method="pearson", max_patterns=10):
+    """
+    Sinn: Korrelationskoeffizienten, n und p-Werte für alle Variablenpaare (paarweise vollständig
+    wie DataFrame.corr). Pearson über pairwise_pearson; für Spearman werden Spalten mit gleichem
+    NaN-Muster zusammen gerankt und als Matrixprodukt gerechnet. Hat fast jede Spalte ihr eigenes
+    Muster (verstreute Lücken), wäre das wieder eine Schleife über die Paare, dann rechnet pandas
+
+    Parameter:
+    ---------------------------------------
+
+    data: pd.DataFrame
+        Variablen als Spalten
+
+    method: str, optional
+        "pearson" oder "spearman"
+
+    max_patterns: int, optional
+        höchstens so viele NaN-Muster für den Spearman Weg über die Muster, sonst DataFrame.corr
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (corr, pval, n) als pd.DataFrames; p-Wert wie scipy pearsonr/spearmanr (t-Verteilung
+    mit n - 2 Freiheitsgraden), Diagonale p = NaN
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError(f"Unbekannte method: {method}")
+    cols = data.columns
+    values = data.to_numpy(dtype=np.float64)
+    valid = np.isfinite(values)
+
+    # anzahl gemeinsamer zeilen für alle paare auf einmal
+    m = valid.astype(np.float64)
+    n = np.rint(m.T @ m).astype(np.int64)
+
+    if method == "pearson":
+        corr = pairwise_pearson(values, valid)
+    else:
+        # spalten nach nan muster gruppieren, meistens sind das nur wenige (messkampagnen)
+        patterns, inverse = np.unique(valid.T, axis=0, return_inverse=True)
+        if len(patterns) <= max_patterns:
+            corr = pattern_spearman(values, patterns, inverse.ravel())
+        else:
+            corr = data.corr(method="spearman").to_numpy(dtype=np.float64, copy=True)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dof = n - 2
+        t = corr * np.sqrt(dof / ((1.0 - corr) * (1.0 + corr)))
+        pval = 2 * stats.t.sf(np.abs(t), dof)
+    corr[n < 2] = np.nan
+    pval[n < 3] = np.nan
+    np.fill_diagonal(pval, np.nan)
+    np.fill_diagonal(corr, np.where(np.diag(n) >= 2, 1.0, np.nan))
+
+    return (pd.DataFrame(corr, index=cols, columns=cols),
+            pd.DataFrame(pval, index=cols, columns=cols),
+            pd.DataFrame(n, index=cols, columns=cols))
@@ -0,0 +1,190 @@
+# Skript: Zeitversetzte Spearman Korrelationen (Lag × Teichvariable × Wettervariable) in einem Durchgang
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import numpy as np
+import pandas as pd
+# scipy.special statt scipy.stats (lädt ein drittel so lange, wichtig für die permutations-worker)
+from scipy import special
+
+
+def masked_ranks(values, valid):
+    """
+    Sinn: Ränge entlang der letzten Achse, nur unter den gültigen Einträgen (Bindungen bekommen
+    den mittleren Rang); sortiert wird nur einmal pro Wertereihe, die Masken kommen per Broadcast
+
+    Parameter:
+    ---------------------------------------
+
+    values: np.ndarray
+        Werte (..., N); darf kleiner sein als valid und wird dann gebroadcastet
+
+    valid: np.ndarray
+        bool Maske (..., N) welche Einträge mitzählen
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit der Form von valid; NaN an ungültigen Stellen
+    """
+    values = np.asarray(values, dtype=np.float64)
+    shape = np.broadcast_shapes(values.shape, valid.shape)
+
+    # einmal sortieren (NaN landen hinten) und die reihenfolge auf alle masken übertragen
+    order = np.argsort(values, axis=-1, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=-1)
+    order = np.broadcast_to(order, shape)
+    sorted_valid = np.take_along_axis(np.broadcast_to(valid, shape), order, axis=-1)
+
+    # blöcke gleicher werte (bindungen)
+    new_block = np.ones(sorted_values.shape, dtype=bool)
+    new_block[..., 1:] = sorted_values[..., 1:] != sorted_values[..., :-1]
+    new_block = np.broadcast_to(new_block, shape)
+
+    # gültige einträge vor jedem block und im block -> mittlerer rang im block
+    block = np.cumsum(new_block.ravel()) - 1
+    before = np.cumsum(sorted_valid, axis=-1) - sorted_valid
+    n_valid = np.bincount(block, weights=sorted_valid.ravel())
+    n_before = np.bincount(block, weights=np.where(new_block, before, 0).ravel())
+    sorted_ranks = (n_before + (n_valid + 1) / 2)[block].reshape(shape)
+
+    ranks = np.empty(shape)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=-1)
+    ranks[~np.broadcast_to(valid, shape)] = np.nan
+    return ranks
+
+
+def daily_array(df, date_col, columns):
+    """
+    Sinn: Tageswerte auf einem lückenlosen Tagesraster, damit ein Lag nur ein Indexversatz ist
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Tageswerte (z.B. station_daily)
+
+    date_col: str
+        Datumsspalte
+
+    columns: list
+        Variablen
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (start, values) mit dem ersten Tag und den Werten (Tage × Variablen), fehlende Tage NaN
+    """
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    start = dates.min()
+    day = (dates - start).dt.days.to_numpy()
+    values = np.full((day.max() + 1, len(columns)), np.nan)
+    values[day] = df[columns].to_numpy(dtype=np.float64)
+    return start, values
+
+
+def correlation_tensor(x, y):
+    """
+    Sinn: Spearman rho, p-Werte und n entlang der letzten Achse für beliebig gebroadcastete
+    Tensoren; fehlende Werte werden paarweise rausgeworfen
+
+    Parameter:
+    ---------------------------------------
+
+    x, y: np.ndarray
+        Werte (..., N), gegeneinander broadcastbar
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (rho, pval, n) mit der gebroadcasteten Form ohne die letzte Achse
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+
+    # spearman = pearson der ränge innerhalb der paarweise gültigen proben
+    rx = masked_ranks(x, valid)
+    ry = masked_ranks(y, valid)
+    n = valid.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(valid, rx - np.nansum(rx, axis=-1, keepdims=True) / n[..., None], 0.0)
+        dy = np.where(valid, ry - np.nansum(ry, axis=-1, keepdims=True) / n[..., None], 0.0)
+        rho = (dx * dy).sum(axis=-1) / np.sqrt((dx ** 2).sum(axis=-1) * (dy ** 2).sum(axis=-1))
+        rho = np.clip(rho, -1.0, 1.0)
+
+        # p-wert wie scipy.stats.spearmanr (t-verteilung mit n - 2 freiheitsgraden)
+        dof = n - 2
+        t = rho * np.sqrt(dof / ((1.0 - rho) * (1.0 + rho)))
+        pval = 2 * special.stdtr(dof, -np.abs(t))
+    rho[n < 2] = np.nan
+    pval[n < 3] = np.nan
+    return rho, pval, n
+
+
+def lagged_weather(dates, weather, weather_vars, lags, weather_date="datetime"):
+    """
+    Sinn: Wetterwerte für jeden Lag und jedes Probendatum über einen ganzzahligen Versatz
+    auf dem Tagesraster (Lag L am Tag d = Wetter am Tag d - L)
+
+    Parameter:
+    ---------------------------------------
+
+    dates: pd.Series
+        Probendaten
+
+    weather: pd.DataFrame
+        tägliche Wetterdaten (z.B. station_daily)
+
+    weather_vars: list
+        Wettervariablen
+
+    lags: list
+        Lags in Tagen
+
+    weather_date: str, optional
+        Datumsspalte der Wetterdaten
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit Form (Lags, Proben, Wettervariablen), NaN außerhalb der Wetterdaten
+    """
+    lags = np.asarray(lags, dtype=np.int64)
+    start, w_daily = daily_array(weather, weather_date, weather_vars)
+    day = (pd.to_datetime(dates).dt.normalize() - start).dt.days.to_numpy()
+    idx = day[None, :] - lags[:, None]
+    inside = (idx >= 0) & (idx < len(w_daily))
+    return np.where(inside[:, :, None], w_daily[np.clip(idx, 0, len(w_daily) - 1)], np.nan)
+
+
+def lag_correlation(pond, weather, pond_vars, weather_vars, lags, pond_date="Datum", weather_date="datetime"):
+    """
+    Sinn: Spearman rho und p-Werte für alle Lags, Teich- und Wettervariablen auf einmal;
+    bei Lag L wird der Teichwert am Tag d mit dem Wetterwert am Tag d - L verglichen
+    (wie der frühere merge auf datetime + L), fehlende Werte werden paarweise rausgeworfen
+
+    Parameter:
+    ---------------------------------------
+
+    pond: pd.DataFrame
+        Teichdaten (z.B. df_avg_full)
+
+    weather: pd.DataFrame
+        tägliche Wetterdaten (z.B. station_daily)
+
+    pond_vars, weather_vars: list
+        Variablen der beiden Tabellen
+
+    lags: list
+        Lags in Tagen
+
+    pond_date, weather_date: str, optional
+        Datumsspalten
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (rho, pval, n) mit Form (Lags, Teichvariablen, Wettervariablen)
+    """
+    w = lagged_weather(pond[pond_date], weather, weather_vars, lags, weather_date)
+
+    # tensoren mit form (lags, teich, wetter, proben)
+    p = pond[pond_vars].to_numpy(dtype=np.float64).T[None, :, None, :]
+    w = w.transpose(0, 2, 1)[:, None, :, :]
+    return correlation_tensor(p, w)
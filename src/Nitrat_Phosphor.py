@@ -2,289 +2,298 @@
 # Autor: Marc Kevin Schneider
 # Datum: September 2025
 
+import os
+from functools import partial
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
-from scipy import stats
-from scipy.stats import spearmanr, pearsonr, shapiro
-
-path = "/data/"
-path_plots = "/plots/"
-
-messungen = pd.read_csv(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv")
-
-# kopie
-df = messungen.copy()
-
-# datum zu datetime
-df["Datum"] = pd.to_datetime(df["Datum"], format="%d.%m.%Y")
-
-# größer und kleiner zeichen weg und zu float
-for col in ["Nitrat", "Phosphor"]:
-    df[col] = (
-        df[col].astype(str)
-        .replace({r"<0\.5": "0.5", r">5\.0": "5.0"}, regex=True)
-        .astype(float)
+from Plotcache import PlotCache
+from Zensierung import read_measurements, substitute
+from Korrelation import correlation_matrix, choose_method
+from Lagkorrelation import lag_correlation, lagged_weather
+from Stationsdaten import station_aggregate, interval_aggregate, read_station, numeric_columns
+from Praediktoren import TrailingWindows, trailing_predictors, sample_timestamps, window_scan
+from Signifikanz import permutation_test, lag_statistic, matrix_statistic, benjamini_hochberg, min_p_value
+
+# pfade lassen sich über DATA_PATH / PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
+
+# main guard, da die permutationstests einen prozesspool starten (unter windows werden
+# die worker sonst das ganze skript nochmal ausführen)
+if __name__ == "__main__":
+
+    # matplotlib/seaborn erst hier, die worker der permutationstests brauchen sie nicht
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # plots nur neu rendern wenn sich daten oder der zeichencode des skripts geändert haben
+    plot_cache = PlotCache(path_plots, "Nitrat_Phosphor", __file__)
+
+    # messwerte mit flag für "<0.5" / ">5.0" (grenze als wert, flag in {spalte}_flag)
+    messungen = read_measurements(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv")
+
+    # zensierte werte wie bisher auf die grenze setzen; andere regeln (DL/2, 0, ROS)
+    # vergleicht Sensitivitaet.py
+    df = substitute(messungen, "DL")
+
+
+    # plot mit drei subplots
+    key = plot_cache.key(df[["Datum", "Probe", "Nitrat", "Phosphor", "NPOC"]])
+    if not plot_cache.hit(f"{path_plots}/Nitrat_Phosphat_NPOC_Zeitserie.png", key):
+        fig, axes = plt.subplots(3, 1, figsize=(12,8), sharex=True)
+
+        # nitrat als erster subplot
+        sns.lineplot(
+            data=df, x="Datum", y="Nitrat", hue="Probe", marker="o", ax=axes[0]
+        )
+        axes[0].set_title("A) Nitrate Concentration")
+        axes[0].set_ylabel("Nitrate [mg/L]")
+        axes[0].set_xlabel("") # keine x-achsen beschriftung hier da wir sharex=True gesetzt haben, axes[2] macht damit die labels
+        axes[0].legend(title="Probe")
+
+        # phosphor als zweiter plot
+        sns.lineplot(
+            data=df, x="Datum", y="Phosphor", hue="Probe", marker="o", ax=axes[1]
+        )
+        axes[1].set_title("B) Orthophosphate Concentration")
+        axes[1].set_ylabel("Orthophosphate [mg/L]")
+        axes[1].set_xlabel("")
+        axes[1].legend(title="Probe")
+
+        sns.lineplot(
+            data=df, x="Datum", y="NPOC", hue="Probe", marker="o", ax=axes[2]
+        )
+        axes[2].set_title("B) NPOC Concentration")
+        axes[2].set_ylabel("NPOC [mg/L]")
+        axes[2].set_xlabel("Date")
+        axes[2].legend(title="Probe")
+
+        plt.tight_layout()
+        plot_cache.savefig(f"{path_plots}/Nitrat_Phosphat_NPOC_Zeitserie.png", key,
+                           dpi=300)
+        plt.show()
+
+
+    ###############################################################
+
+    # durchschnitt über proben
+    df_avg = (
+        df
+        .groupby(["Datum", df["Probe"].str[:2]]) 
+        .agg({"Nitrat": "mean", "Phosphor": "mean", "NPOC": "mean"})
+        .reset_index()
+        .rename(columns={"Probe": "Ort"})
     )
 
 
-# plot mit drei subplots
-fig, axes = plt.subplots(3, 1, figsize=(12,8), sharex=True)
-
-# nitrat als erster subplot
-sns.lineplot(
-    data=df, x="Datum", y="Nitrat", hue="Probe", marker="o", ax=axes[0]
-)
-axes[0].set_title("A) Nitrate Concentration")
-axes[0].set_ylabel("Nitrate [mg/L]")
-axes[0].set_xlabel("") # keine x-achsen beschriftung hier da wir sharex=True gesetzt haben, axes[2] macht damit die labels
-axes[0].legend(title="Probe")
-
-# phosphor als zweiter plot
-sns.lineplot(
-    data=df, x="Datum", y="Phosphor", hue="Probe", marker="o", ax=axes[1]
-)
-axes[1].set_title("B) Orthophosphate Concentration")
-axes[1].set_ylabel("Orthophosphate [mg/L]")
-axes[1].set_xlabel("")
-axes[1].legend(title="Probe")
-
-sns.lineplot(
-    data=df, x="Datum", y="NPOC", hue="Probe", marker="o", ax=axes[2]
-)
-axes[2].set_title("B) NPOC Concentration")
-axes[2].set_ylabel("NPOC [mg/L]")
-axes[2].set_xlabel("Date")
-axes[2].legend(title="Probe")
-
-plt.tight_layout()
-plt.savefig(f"{path_plots}/Nitrat_Phosphat_NPOC_Zeitserie.png", 
-            dpi=300)
-plt.show()
-
-
-###############################################################
-
-# durchschnitt über proben
-df_avg = (
-    df
-    .groupby(["Datum", df["Probe"].str[:2]]) 
-    .agg({"Nitrat": "mean", "Phosphor": "mean", "NPOC": "mean"})
-    .reset_index()
-    .rename(columns={"Probe": "Ort"})
-)
-
-
-# gleicher plot wie oben, nur mit den averaged daten
-fig, axes = plt.subplots(2, 1, figsize=(12,8), sharex=True)
-
-# Nitrat (top)
-sns.lineplot(
-    data=df_avg, x="Datum", y="Nitrat", hue="Ort", marker="o", ax=axes[0]
-)
-axes[0].set_title("A) Nitrate Concentration")
-axes[0].set_ylabel("Nitrate [mg/L]")
-axes[0].set_xlabel("")
-axes[0].legend(title="Ort")
-
-# Phosphor (unten)
-sns.lineplot(
-    data=df_avg, x="Datum", y="Phosphor", hue="Ort", marker="o", ax=axes[1]
-)
-axes[1].set_title("B) Orthophosphate Concentration ")
-axes[1].set_ylabel("Orthophosphate [mg/L]")
-axes[1].set_xlabel("Date")
-axes[1].legend(title="Ort")
-
-plt.tight_layout()
-plt.savefig(f"{path_plots}/Durchschnitt_Nitrat_Phosphat_Zeitserie.png", 
-            dpi=300)
-plt.show()
-
-
-#########################################################
-
-# korrelation zwischen den umweltparametern und der nitrat-/phosphatkonzentration
-# korrelationsmatrix
-
-# durchschnitt jetzt auch für die umweltparameter
-env_cols = ["Datum", "Probe", "Temp", "LF", "PPM", "pH"]
-env_avg = (
-    messungen[env_cols]
-    .copy()
-    .groupby(["Datum", messungen["Probe"].str[:2]])  
-    .mean(numeric_only=True)
-    .reset_index()
-    .rename(columns={"Probe": "Ort"})
-)
-
-# beide dfs zu datetime
-df_avg["Datum"] = pd.to_datetime(df_avg["Datum"])
-env_avg["Datum"] = pd.to_datetime(env_avg["Datum"], format="%d.%m.%Y")
-
-# dann mergen
-df_avg_full = pd.merge(df_avg, env_avg, on=["Datum", "Ort"], how="left")
-
-# filter für die spalten die uns interessieren
-cols = ["Nitrat", "Phosphor", "NPOC", "Temp", "LF", "PPM", "pH"]
-data = df_avg_full[cols]
-
-# shapiro wilk test um auf normalverteilung zu testen
-normality_results = {}
-for col in cols:
-    # alle NaN raus
-    stat, p = shapiro(data[col].dropna())
-    normality_results[col] = p
-    print(f"{col}: Shapiro-Wilk p = {p:.4f}")
-
-# nv wennn p > 0.05
-if all(pval > 0.05 for pval in normality_results.values()):
-    method = "pearson"
-    print("NV ==> Pearson correlation.")
-else:
-    method = "spearman"
-    print("Nicht NV ==> Spearman correlation.")
-
-# wählt die vom Shapiro-Wilk Test ausgewählte methode für die korrelationsanalyse
-corr = data.corr(method=method)
-
-# p-werte händisch
-pvals = pd.DataFrame(np.ones((len(cols), len(cols))), index=cols, columns=cols)
-# müssen wir pairwise die NAs droppen damit die p-werte am ende nicht alle NaN sind
-for i in range(len(cols)):
-    for j in range(len(cols)):
-        if i != j:
-            # schmeiß reihen wo irgendeiner der werte NA ist raus
-            x = data.iloc[:, i]
-            y = data.iloc[:, j]
-            valid = x.notna() & y.notna()
-            if valid.sum() > 1:  # mindestens 2 punkte
-                # wählt dann den vorher gewählten korrelationskoeffizienten aus
-                if method == "pearson":
-                    pvals.iloc[i, j] = pearsonr(x[valid], y[valid])[1]
-                else:
-                    pvals.iloc[i, j] = spearmanr(x[valid], y[valid])[1]
-
-# das ist nur dazu da um die obere rechte ecke bei der heatmap auszumaskieren
-mask = np.triu(np.ones_like(corr, dtype=bool))
-
-# heatmap plot
-plt.figure(figsize=(8, 6))
-ax = sns.heatmap(
-    corr,
-    mask=mask,
-    annot=True,
-    cmap="coolwarm",
-    center=0,
-    linewidths=0.5,
-    cbar_kws={"shrink": 0.8},
-    vmin = -1, 
-    vmax= 1
-)
-
-# statistisch signifikante ergebnisse mit dickem rand
-for i in range(len(cols)):
-    for j in range(len(cols)):
-        if not mask[i, j] and pvals.iloc[i, j] < 0.05:
-            ax.add_patch(plt.Rectangle((j, i), 1, 1, fill=False, edgecolor="black", lw=2))
-
-#plt.title("Nitrate and Orthophosphate Correlation Matrix")
-plt.savefig(f"{path_plots}/Korrelationsmatrix_Nitrat_Phosphat_NPOC.png", 
-            dpi=300)
-plt.show()
-
-
-
-###################################################################################
-
-# korrelation der nitrat und phosphat werte mit den wetterstationsdaten uniwald caldern
-# mit lags (positiv und negativ) um auch zeitversetzte effekte zu identifizieren
-
-# stationsdaten lesen (Wetterstation Uniwiese Caldern)
-station = pd.read_csv(f"{path}/Hourly_Wiese_Klimastation.csv")
-# datetime
-station["datetime"] = pd.to_datetime(station["datetime"])
-
-# daten sind momentan stündlich, hier resamplen wir zu täglich damit das mit den messwerten des rückhaltebeckens übereinstimmt
-station_daily = (
-    station.resample("1d", on="datetime")
-        .agg({
-            # summe für niederschlag
-            "PCP": "sum", 
-            # mean für alles andere
-            **{col: "mean" for col in station.columns if col not in ["datetime", "PCP"]}
-        }).round(3))
-
-# index resetten damit datetime wieder als spalte zurückkommt
-station_daily = station_daily.reset_index(drop=False)
-
-# erstmal saven
-station_daily.to_csv(f"{path}/Daily_Wiese_Klimastation.csv", 
-                     index=False)
-
-# daten nur für den untersuchungszeitraum
-station_daily = station_daily.loc[(station_daily["datetime"] >= "2025-05-10") & (station_daily["datetime"] <= "2025-07-31")]
-
-
-# variablen die mit einander korreliert werden sollen
-pond_vars = ["Nitrat", "Phosphor", "NPOC", "Temp", "LF", "PPM", "pH"]
-weather_vars = ["Ta_2m", "PCP"]
-
-# lags in tagen (von 0 bis 14, sowohl positiv als auch negativ)
-lags = [-14, -7, -3, -2, -1, 0, 1, 2, 3, 7, 14]
-
-# leeres dataframes für die ergebnisse
-# eins für die korrelationen
-corrs = {wvar: pd.DataFrame(index=pond_vars, columns=lags, dtype=float) for wvar in weather_vars}
-# eins für die p-werte
-pvals = {wvar: pd.DataFrame(index=pond_vars, columns=lags, dtype=float) for wvar in weather_vars}
-
-# loop für alle lags
-for lag in lags:
-    station_shifted = station_daily.copy()
-    # packt den lag auf die daten drauf
-    station_shifted["datetime_shifted"] = station_shifted["datetime"] + pd.Timedelta(days=lag)
-    
-    # merged die dataframes dann 
-    merged = pd.merge(
-        df_avg_full,
-        station_shifted[["datetime_shifted"] + weather_vars],
-        left_on="Datum",
-        right_on="datetime_shifted",
-        how="left"
+    # gleicher plot wie oben, nur mit den averaged daten
+    key = plot_cache.key(df_avg)
+    if not plot_cache.hit(f"{path_plots}/Durchschnitt_Nitrat_Phosphat_Zeitserie.png", key):
+        fig, axes = plt.subplots(2, 1, figsize=(12,8), sharex=True)
+
+        # Nitrat (top)
+        sns.lineplot(
+            data=df_avg, x="Datum", y="Nitrat", hue="Ort", marker="o", ax=axes[0]
+        )
+        axes[0].set_title("A) Nitrate Concentration")
+        axes[0].set_ylabel("Nitrate [mg/L]")
+        axes[0].set_xlabel("")
+        axes[0].legend(title="Ort")
+
+        # Phosphor (unten)
+        sns.lineplot(
+            data=df_avg, x="Datum", y="Phosphor", hue="Ort", marker="o", ax=axes[1]
+        )
+        axes[1].set_title("B) Orthophosphate Concentration ")
+        axes[1].set_ylabel("Orthophosphate [mg/L]")
+        axes[1].set_xlabel("Date")
+        axes[1].legend(title="Ort")
+
+        plt.tight_layout()
+        plot_cache.savefig(f"{path_plots}/Durchschnitt_Nitrat_Phosphat_Zeitserie.png", key,
+                           dpi=300)
+        plt.show()
+
+
+    #########################################################
+
+    # korrelation zwischen den umweltparametern und der nitrat-/phosphatkonzentration
+    # korrelationsmatrix
+
+    # durchschnitt jetzt auch für die umweltparameter
+    env_cols = ["Datum", "Probe", "Temp", "LF", "PPM", "pH"]
+    env_avg = (
+        messungen[env_cols]
+        .copy()
+        .groupby(["Datum", messungen["Probe"].str[:2]])  
+        .mean(numeric_only=True)
+        .reset_index()
+        .rename(columns={"Probe": "Ort"})
     )
+
+    # beide dfs zu datetime
+    df_avg["Datum"] = pd.to_datetime(df_avg["Datum"])
+    env_avg["Datum"] = pd.to_datetime(env_avg["Datum"], format="%d.%m.%Y")
+
+    # dann mergen
+    df_avg_full = pd.merge(df_avg, env_avg, on=["Datum", "Ort"], how="left")
+
+    # filter für die spalten die uns interessieren
+    cols = ["Nitrat", "Phosphor", "NPOC", "Temp", "LF", "PPM", "pH"]
+    data = df_avg_full[cols]
+
+    # shapiro wilk test um auf normalverteilung zu testen (alle NaN pro spalte raus)
+    method, normality_results = choose_method(data)
+    for col, p in normality_results.items():
+        print(f"{col}: Shapiro-Wilk p = {p:.4f}")
+
+    # nv wennn alle p > 0.05
+    if method == "pearson":
+        print("NV ==> Pearson correlation.")
+    else:
+        print("Nicht NV ==> Spearman correlation.")
+
+    # koeffizienten für alle paare auf einmal mit der vom Shapiro-Wilk Test ausgewählten methode;
+    # NAs werden paarweise gedroppt wie bei data.corr(), die p-werte kommen aus dem permutationstest
+    corr, _, _ = correlation_matrix(data, method=method)
+
+    # das ist nur dazu da um die obere rechte ecke bei der heatmap auszumaskieren
+    mask = np.triu(np.ones_like(corr, dtype=bool))
+
+    # block-permutationstest (erhält die autokorrelation der zeitserie) statt der rohen p-werte,
+    # danach benjamini-hochberg über alle zellen im unteren dreieck
+    # AP und SP eines probentags werden zusammen vertauscht, die blöcke sind probentage
+    # bei wenigen probentagen gibt es nur wenige blockreihenfolgen (dann werden alle ausgewertet);
+    # liegt der kleinste erreichbare p-wert nahe an alpha, bleiben die heatmaps ohne umrandung
+    n_days = df_avg_full["Datum"].nunique()
+    print(f"Permutationstest: {n_days} Probentage, kleinster erreichbarer p-Wert = {min_p_value(n_days):.4f}")
+    pvals_perm = permutation_test(partial(matrix_statistic, method=method),
+                                  data.to_numpy(), data.to_numpy(), corr.to_numpy(),
+                                  groups=df_avg_full["Datum"].to_numpy(), members=df_avg_full["Ort"].to_numpy())
+    pvals_fdr = pd.DataFrame(benjamini_hochberg(pvals_perm, mask=~mask), index=cols, columns=cols)
+
+    # heatmap plot
+    key = plot_cache.key(corr, pvals_fdr)
+    if not plot_cache.hit(f"{path_plots}/Korrelationsmatrix_Nitrat_Phosphat_NPOC.png", key):
+        plt.figure(figsize=(8, 6))
+        ax = sns.heatmap(
+            corr,
+            mask=mask,
+            annot=True,
+            cmap="coolwarm",
+            center=0,
+            linewidths=0.5,
+            cbar_kws={"shrink": 0.8},
+            vmin = -1, 
+            vmax= 1
+        )
+
+        # statistisch signifikante ergebnisse (nach FDR korrektur) mit dickem rand
+        for i in range(len(cols)):
+            for j in range(len(cols)):
+                if not mask[i, j] and pvals_fdr.iloc[i, j] < 0.05:
+                    ax.add_patch(plt.Rectangle((j, i), 1, 1, fill=False, edgecolor="black", lw=2))
+
+        #plt.title("Nitrate and Orthophosphate Correlation Matrix")
+        plot_cache.savefig(f"{path_plots}/Korrelationsmatrix_Nitrat_Phosphat_NPOC.png", key,
+                           dpi=300)
+        plt.show()
+
+
+
+    ###################################################################################
+
+    # korrelation der nitrat und phosphat werte mit den wetterstationsdaten uniwald caldern
+    # mit lags (positiv und negativ) um auch zeitversetzte effekte zu identifizieren
+
+    # stationsdaten (Wetterstation Uniwiese Caldern) als tageswerte, damit das mit den messwerten
+    # des rückhaltebeckens übereinstimmt (niederschlag summe, sonst mittelwert); kommen aus dem
+    # aggregat speicher, nach neuen stunden werden nur die betroffenen tage neu berechnet;
+    # wie früher alle numerischen spalten der station (nicht nur die für die analyse)
+    station_cols = numeric_columns(f"{path}/Hourly_Wiese_Klimastation.csv")
+    station_daily = station_aggregate(f"{path}/Hourly_Wiese_Klimastation.csv", freq="D", columns=station_cols)
+    station_daily[station_cols] = station_daily[station_cols].round(3)
+
+    # erstmal saven
+    station_daily.to_csv(f"{path}/Daily_Wiese_Klimastation.csv", 
+                         index=False)
+
+    # wetter zwischen zwei probenahmen (niederschlagssumme und mittelwerte seit der letzten probe)
+    station_intervals = interval_aggregate(df_avg_full["Datum"], f"{path}/Hourly_Wiese_Klimastation.csv")
+    interval_cols = station_intervals.columns.drop(["Datum", "Beginn"])
+    station_intervals[interval_cols] = station_intervals[interval_cols].round(3)
+    station_intervals.to_csv(f"{path}/Intervall_Wiese_Klimastation.csv", index=False)
+
+    # vorregen und temperatur in festen fenstern vor jeder einzelnen probe (stundengenau über
+    # Datum + Uhrzeit, ohne uhrzeit wird 12:00 angenommen); die präfixsummen werden einmal gebaut
+    station_windows = TrailingWindows(read_station(f"{path}/Hourly_Wiese_Klimastation.csv",
+                                                   columns=["PCP", "Ta_2m"]))
+    sample_times = sample_timestamps(df["Datum"], messungen["Uhrzeit"])
+    predictors = trailing_predictors(station_windows, sample_times, windows=(24, 72, 168)).round(3)
+    predictors = pd.concat([df[["Datum", "Probe"]], sample_times.rename("Zeitpunkt"), predictors], axis=1)
+    predictors.to_csv(f"{path}/Vorwetter_Praediktoren.csv", index=False)
+
+    # welche vorregen fensterlänge passt am besten? alle längen von 1 h bis 30 tage auf einmal
+    scan = window_scan(station_windows, sample_times, df[["Nitrat", "Phosphor", "NPOC"]], list(range(1, 721)))
+    scan.to_csv(f"{path}/Vorregen_Fensterscan.csv", index=False)
+    valid_scan = scan.dropna(subset=["rho"])
+    best = valid_scan.loc[valid_scan["rho"].abs().groupby(valid_scan["Variable"]).idxmax()]
+    print("Vorregen Fenster mit dem größten |rho|:")
+    print(best.to_string(index=False))
+
+
+    # variablen die mit einander korreliert werden sollen
+    pond_vars = ["Nitrat", "Phosphor", "NPOC", "Temp", "LF", "PPM", "pH"]
+    weather_vars = ["Ta_2m", "PCP"]
+
+    # lags in tagen (von -60 bis +60)
+    lags = list(range(-60, 61))
+
+    # spearmans rho für alle lags und variablen auf einmal (lag × teich × wetter); die p-werte
+    # kommen aus dem permutationstest unten
+    rho, _, _ = lag_correlation(df_avg_full, station_daily, pond_vars, weather_vars, lags)
+
+    # ein dataframe pro wettervariable (zeilen = teichvariablen, spalten = lags)
+    corrs = {wvar: pd.DataFrame(rho[:, :, k].T, index=pond_vars, columns=lags) for k, wvar in enumerate(weather_vars)}
+
+    # block-permutationstest für alle lag zellen auf einmal, dann benjamini-hochberg über alle lag tests
+    w_lagged = lagged_weather(df_avg_full["Datum"], station_daily, weather_vars, lags)
+    lag_pval = benjamini_hochberg(permutation_test(lag_statistic, df_avg_full[pond_vars].to_numpy(), w_lagged, rho,
+                                                   groups=df_avg_full["Datum"].to_numpy(),
+                                                   members=df_avg_full["Ort"].to_numpy()))
+    lag_pvals_fdr = {wvar: pd.DataFrame(lag_pval[:, :, k].T, index=pond_vars, columns=lags)
+                     for k, wvar in enumerate(weather_vars)}
+
+    # ein plot mit zwei subplots
+    key = plot_cache.key(*[corrs[w] for w in weather_vars], *[lag_pvals_fdr[w] for w in weather_vars])
+    if not plot_cache.hit(f"{path_plots}/Lag_Analyse_Ta2m_PCP_TeichVariablen.png", key):
+        fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+
+        # heatmap für lufttemperatur (Ta_2m) und niederschlag (PCP)
+        for ax, wvar in zip(axes, weather_vars):
+            # bei 121 lags wären die zahlen nicht mehr lesbar, deshalb nur die farben
+            sns.heatmap(corrs[wvar], annot=len(lags) <= 15, cmap="coolwarm", center=0, 
+                        cbar_kws={"label": f"Spearman rho"}, ax=ax, vmin=-1, vmax=1,
+                        xticklabels=10)
     
-    # berechnet für jede variable dann die spearmans rho korrelation und die p-werte
-    for var in pond_vars:
-        for wvar in weather_vars:
-            valid = merged[[var, wvar]].dropna()
-            if len(valid) > 1:
-                rho, pval = spearmanr(valid[var], valid[wvar])
-                corrs[wvar].loc[var, lag] = rho
-                pvals[wvar].loc[var, lag] = pval
-
-# ein plot mit zwei subplots
-fig, axes = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
-
-# heatmap für lufttemperatur (Ta_2m) und niederschlag (PCP)
-for ax, wvar in zip(axes, weather_vars):
-    sns.heatmap(corrs[wvar], annot=True, cmap="coolwarm", center=0, 
-                cbar_kws={"label": f"Spearman rho"}, ax=ax, vmin=-1, vmax=1)
-    
-    # dicke umrandung falls statistisch signifikant
-    for i in range(corrs[wvar].shape[0]):
-        for j in range(corrs[wvar].shape[1]):
-            if pvals[wvar].iloc[i, j] is not np.nan and pvals[wvar].iloc[i, j] < 0.05:
-                ax.add_patch(plt.Rectangle((j, i), 1, 1, fill=False, edgecolor='black', lw=3))
+            # dicke umrandung falls statistisch signifikant (nach FDR korrektur)
+            for i in range(corrs[wvar].shape[0]):
+                for j in range(corrs[wvar].shape[1]):
+                    if lag_pvals_fdr[wvar].iloc[i, j] < 0.05:
+                        ax.add_patch(plt.Rectangle((j, i), 1, 1, fill=False, edgecolor='black', lw=3))
     
-# labels
-axes[0].set_ylabel("Pond variable")
-axes[1].set_ylabel("Pond variable")
-axes[1].set_xlabel("Lags (in days)")
-axes[0].set_title(f"A) Air Temperature")
-axes[1].set_title(f"B) Precipitation")
-plt.tight_layout(rect=[0, 0, 1, 0.95])
-plt.savefig(f"{path_plots}/Lag_Analyse_Ta2m_PCP_TeichVariablen.png", 
-            dpi=300)
-plt.show()
\ No newline at end of file
+        # labels
+        axes[0].set_ylabel("Pond variable")
+        axes[1].set_ylabel("Pond variable")
+        axes[1].set_xlabel("Lags (in days)")
+        axes[0].set_title(f"A) Air Temperature")
+        axes[1].set_title(f"B) Precipitation")
+        plt.tight_layout(rect=[0, 0, 1, 0.95])
+        plot_cache.savefig(f"{path_plots}/Lag_Analyse_Ta2m_PCP_TeichVariablen.png", key,
+                           dpi=300)
+        plt.show()
+
+
+    # veraltete plots aufräumen und treffer ins log
+    plot_cache.evict()
+    plot_cache.log()
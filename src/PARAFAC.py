@@ -0,0 +1,320 @@
+# Skript: PARAFAC (CP-ALS mit Nicht-Negativität) für den EEM Würfel
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from itertools import permutations
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# daten für die worker prozesse (wird einmal pro prozess gesetzt, nicht pro start)
+_worker_data = None
+
+
+class PARAFACModel:
+    """
+    Sinn: Ergebnis einer PARAFAC Zerlegung X[i, j, k] ≈ sum_r A[i, r] * B[j, r] * C[k, r]
+
+    Parameter:
+    ---------------------------------------
+
+    A: np.ndarray
+        Scores der Proben (Proben × Komponenten)
+
+    B: np.ndarray
+        EX Loadings (EX × Komponenten), Spalten auf Länge 1 normiert
+
+    C: np.ndarray
+        EM Loadings (EM × Komponenten), Spalten auf Länge 1 normiert
+
+    fit: float
+        erklärte Varianz in %
+
+    n_iter: int
+        Anzahl der Iterationen
+
+    seed: int
+        Seed des Starts (None bei Warmstart)
+    """
+
+    def __init__(self, A, B, C, fit, n_iter, seed=None):
+        self.A, self.B, self.C = A, B, C
+        self.fit = fit
+        self.n_iter = n_iter
+        self.seed = seed
+
+    @property
+    def rank(self):
+        return self.A.shape[1]
+
+    def __repr__(self):
+        return f"PARAFACModel({self.rank} Komponenten, Fit {self.fit:.2f} %, {self.n_iter} Iterationen)"
+
+    def reconstruct(self):
+        """
+        Sinn: Modellierter Würfel
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray (Proben × EX × EM)
+        """
+        return np.einsum("ir,jr,kr->ijk", self.A, self.B, self.C)
+
+    def scores(self, cube):
+        """
+        Sinn: Scores als Tabelle mit den Proben des Würfels
+
+        Parameter:
+        ---------------------------------------
+
+        cube: EEM.EEMCube
+            Würfel, auf den das Modell gefittet wurde
+
+        Ergebnis:
+        ---------------------------------------
+        pd.DataFrame mit Probe, Datum und einer Spalte pro Komponente
+        """
+        df = pd.DataFrame(self.A, columns=[f"C{r + 1}" for r in range(self.rank)])
+        df.insert(0, "Probe", cube.samples["Series"].astype(str).to_numpy())
+        df.insert(1, "Datum", cube.samples["Sample_Date"].to_numpy())
+        return df
+
+
+def _normalize(A, B, C):
+    # B und C auf einheitslänge, größe steckt in A; sortiert nach größe der komponente
+    nb = np.linalg.norm(B, axis=0)
+    nc = np.linalg.norm(C, axis=0)
+    nb[nb == 0] = 1
+    nc[nc == 0] = 1
+    A, B, C = A * (nb * nc), B / nb, C / nc
+    order = np.argsort(-np.linalg.norm(A, axis=0))
+    return A[:, order], B[:, order], C[:, order]
+
+
+def _hals_update(F, M, G):
+    # ein HALS schritt (hierarchical ALS) pro komponente, hält alles >= 0
+    for r in range(F.shape[1]):
+        if G[r, r] <= 0:
+            continue
+        F[:, r] = np.maximum(F[:, r] + (M[:, r] - F @ G[:, r]) / G[r, r], 0.0)
+    return F
+
+
+def _solve(F, M, G, nonneg):
+    # neuer faktor aus MTTKRP M und gram matrix G
+    if nonneg:
+        return _hals_update(F, M, G)
+    return np.linalg.lstsq(G, M.T, rcond=None)[0].T
+
+
+def cp_als(X, rank, init=None, seed=None, max_iter=500, tol=1e-7, nonneg=True):
+    """
+    Sinn: Ein einzelner PARAFAC Fit (CP-ALS), mit Nicht-Negativität über HALS Updates
+
+    Parameter:
+    ---------------------------------------
+
+    X: np.ndarray
+        Würfel (Proben × EX × EM); NaN werden während des Fits mit dem Modell aufgefüllt
+
+    rank: int
+        Anzahl der Komponenten
+
+    init: tuple (A, B, C) oder PARAFACModel, optional
+        Startwerte (Warmstart); sonst zufällig
+
+    seed: int, optional
+        Seed für die zufälligen Startwerte
+
+    max_iter: int, optional
+        maximale Anzahl Iterationen
+
+    tol: float, optional
+        Abbruch wenn sich der relative Fehler weniger ändert
+
+    nonneg: bool, optional
+        Nicht-Negativität für alle drei Modi
+
+    Ergebnis:
+    ---------------------------------------
+    PARAFACModel
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n, n_ex, n_em = X.shape
+    missing = np.isnan(X)
+    has_missing = missing.any()
+    Xf = np.where(missing, 0.0, X)
+
+    if init is None:
+        rng = np.random.default_rng(seed)
+        A = rng.random((n, rank))
+        B = rng.random((n_ex, rank))
+        C = rng.random((n_em, rank))
+        # skalierung an die daten anpassen
+        A *= np.sqrt(np.mean(Xf ** 2)) / max(np.sqrt(np.mean(np.einsum("ir,jr,kr->ijk", A, B, C) ** 2)), 1e-12)
+    else:
+        A, B, C = (init.A, init.B, init.C) if isinstance(init, PARAFACModel) else init
+        A, B, C = A.astype(np.float64).copy(), B.astype(np.float64).copy(), C.astype(np.float64).copy()
+
+    norm_x = np.sum(Xf ** 2)
+    err_old = np.inf
+    for it in range(1, max_iter + 1):
+        if has_missing:
+            # fehlende werte mit dem aktuellen modell auffüllen
+            Xf = np.where(missing, np.einsum("ir,jr,kr->ijk", A, B, C), X)
+
+        # X @ C hängt nur von C ab und wird für die A und B updates geteilt (BLAS statt einsum)
+        XC = Xf @ C
+        M = np.einsum("ijr,jr->ir", XC, B)
+        A = _solve(A, M, (B.T @ B) * (C.T @ C), nonneg)
+        M = np.einsum("ijr,ir->jr", XC, A)
+        B = _solve(B, M, (A.T @ A) * (C.T @ C), nonneg)
+        # khatri-rao produkt von A und B für den EM modus
+        M = Xf.reshape(n * n_ex, n_em).T @ (A[:, None, :] * B[None, :, :]).reshape(n * n_ex, rank)
+        C = _solve(C, M, (A.T @ A) * (B.T @ B), nonneg)
+
+        # fehler über ||X||² - 2<X, M> + ||M||² ohne den modellwürfel zu bauen
+        inner = np.sum(M * C)
+        model_norm = np.sum((A.T @ A) * (B.T @ B) * (C.T @ C))
+        err = max(norm_x - 2 * inner + model_norm, 0.0) / norm_x
+        if abs(err_old - err) < tol * max(err_old, 1e-12):
+            break
+        err_old = err
+
+    A, B, C = _normalize(A, B, C)
+    return PARAFACModel(A, B, C, fit=100 * (1 - err), n_iter=it, seed=seed)
+
+
+def _init_worker(X):
+    global _worker_data
+    _worker_data = X
+
+
+def _fit_start(args):
+    rank, seed, max_iter, tol, nonneg = args
+    return cp_als(_worker_data, rank, seed=seed, max_iter=max_iter, tol=tol, nonneg=nonneg)
+
+
+def fit_parafac(cube, rank, n_starts=10, seed=0, init=None, workers=None, max_iter=500, tol=1e-7,
+                nonneg=True):
+    """
+    Sinn: PARAFAC mit mehreren zufälligen Starts auf einem Prozesspool; bester Fit gewinnt.
+    Mit init (vorheriges Modell) wird stattdessen ein einzelner Warmstart gerechnet
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube oder np.ndarray
+        Würfel (Proben × EX × EM)
+
+    rank: int
+        Anzahl der Komponenten
+
+    n_starts: int, optional
+        Anzahl zufälliger Starts
+
+    seed: int, optional
+        Basis Seed; die Seeds der Starts werden reproduzierbar daraus abgeleitet
+
+    init: PARAFACModel, optional
+        vorheriges Modell; EX/EM Loadings werden übernommen, Scores für alle Proben
+        (auch neue) per Kleinste-Quadrate aus den Loadings geschätzt
+
+    workers: int, optional
+        Anzahl Prozesse; 1 = ohne Pool
+
+    max_iter, tol, nonneg:
+        siehe cp_als
+
+    Ergebnis:
+    ---------------------------------------
+    PARAFACModel mit dem besten Fit
+    """
+    X = np.asarray(getattr(cube, "data", cube), dtype=np.float64)
+
+    if init is not None:
+        # warmstart: scores zu festen loadings, dann weiter iterieren
+        B, C = init.B, init.C
+        Xf = np.where(np.isnan(X), 0.0, X)
+        M = np.einsum("ijr,jr->ir", Xf @ C, B)
+        G = (B.T @ B) * (C.T @ C)
+        A = np.linalg.lstsq(G, M.T, rcond=None)[0].T
+        if nonneg:
+            A = np.maximum(A, 0.0)
+        return cp_als(X, init.rank, init=(A, B, C), max_iter=max_iter, tol=tol, nonneg=nonneg)
+
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n_starts)]
+    tasks = [(rank, s, max_iter, tol, nonneg) for s in seeds]
+    if workers == 1 or n_starts == 1:
+        _init_worker(X)
+        models = [_fit_start(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X,)) as pool:
+            models = list(pool.map(_fit_start, tasks))
+    return max(models, key=lambda m: m.fit)
+
+
+def congruence(F1, F2):
+    """
+    Sinn: Tucker Kongruenzkoeffizienten zwischen den Spalten zweier Loading Matrizen
+
+    Parameter:
+    ---------------------------------------
+
+    F1, F2: np.ndarray
+        Loadings (Wellenlängen × Komponenten)
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Komponenten × Komponenten)
+    """
+    n1 = np.linalg.norm(F1, axis=0)
+    n2 = np.linalg.norm(F2, axis=0)
+    return (F1.T @ F2) / np.outer(n1, n2)
+
+
+def split_half_validation(cube, rank, n_starts=10, seed=0, workers=None, threshold=0.95):
+    """
+    Sinn: Split-Half Validierung nach Stedmon & Bro (2008): Proben in vier Teile, drei
+    Kombinationen von je zwei Hälften (AB-CD, AC-BD, AD-BC) getrennt fitten und die
+    EX/EM Loadings vergleichen
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube
+        Würfel mit allen Proben
+
+    rank: int
+        Anzahl der Komponenten
+
+    n_starts, seed, workers:
+        siehe fit_parafac
+
+    threshold: float, optional
+        Mindest-Kongruenz für EX und EM
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit der Kongruenz pro Split und Komponente und Spalte "Valid"
+    """
+    X = np.asarray(getattr(cube, "data", cube), dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    parts = np.array_split(rng.permutation(X.shape[0]), 4)
+    splits = {"AB-CD": ((0, 1), (2, 3)), "AC-BD": ((0, 2), (1, 3)), "AD-BC": ((0, 3), (1, 2))}
+
+    rows = []
+    for name, (h1, h2) in splits.items():
+        m1 = fit_parafac(X[np.concatenate([parts[i] for i in h1])], rank, n_starts, seed, workers=workers)
+        m2 = fit_parafac(X[np.concatenate([parts[i] for i in h2])], rank, n_starts, seed, workers=workers)
+        tcc_ex, tcc_em = congruence(m1.B, m2.B), congruence(m1.C, m2.C)
+        # beste zuordnung der komponenten (bei den paar komponenten reicht ausprobieren)
+        best = max(permutations(range(rank)),
+                   key=lambda p: sum(tcc_ex[r, p[r]] * tcc_em[r, p[r]] for r in range(rank)))
+        for r in range(rank):
+            rows.append({"Split": name, "Component": r + 1,
+                         "TCC_EX": tcc_ex[r, best[r]], "TCC_EM": tcc_em[r, best[r]]})
+
+    df = pd.DataFrame(rows)
+    df["Valid"] = (df["TCC_EX"] >= threshold) & (df["TCC_EM"] >= threshold)
+    return df
@@ -0,0 +1,337 @@
+# Skript: Pipeline für alle Auswertungen; Stufen mit festen Ein- und Ausgaben, nur veraltete Stufen laufen neu
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import sys
+import ast
+import json
+import time
+import hashlib
+import argparse
+import fnmatch
+import subprocess
+from glob import glob
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ordner mit den skripten
+src = os.path.dirname(os.path.abspath(__file__))
+
+# stufen: skript (oder python befehl), eingaben und ausgaben relativ zum datenordner (glob muster);
+# die reihenfolge ergibt sich aus den dateien, eine stufe wartet auf alle stufen deren ausgaben sie liest
+stages = {
+    "Stationsdaten": {
+        "command": ["-c", "from Stationsdaten import update_aggregate; "
+                          "update_aggregate(freq='D'); update_aggregate(freq='W')"],
+        "code": ["Stationsdaten.py"],
+        "inputs": ["Hourly_Wiese_Klimastation.csv"],
+        "outputs": ["Hourly_Wiese_Klimastation_sidecar/meta.json",
+                    "Hourly_Wiese_Klimastation_sidecar/aggregate_D.npz",
+                    "Hourly_Wiese_Klimastation_sidecar/aggregate_W.npz"],
+    },
+    "TOC": {
+        "script": "TOC.py",
+        "inputs": ["TOC/*.txt"],
+        "outputs": ["TOC/NPOC.csv", "TOC/NPOC_Laeufe.csv", "TOC/NPOC_Injektionen.csv"],
+    },
+    "UVVIS": {
+        "script": "UVVIS.py",
+        "inputs": ["UVVIS/AP[0-9]*.csv", "UVVIS/SP[0-9]*.csv", "TOC/NPOC.csv",
+                   "Nitrat_Phosphat/Nitrat_Phosphat.csv", "RF/*.txt"],
+        "outputs": ["UVVIS/AP_Messungen.csv", "UVVIS/SP_Messungen.csv", "UVVIS/AP_Metadaten.csv",
+                    "UVVIS/SP_Metadaten.csv", "UVVIS/CDOM_Indizes.csv",
+                    "UVVIS/Durchschnitt_AP_Messungen.csv", "UVVIS/Durchschnitt_SP_Messungen.csv"],
+    },
+    "RF": {
+        "script": "RF.py",
+        "inputs": ["RF/*.txt", "UVVIS/AP_Messungen.csv", "UVVIS/SP_Messungen.csv"],
+        "outputs": ["RF/RF6000_AlleProben.npz", "RF/RF6000_AlleProben.csv", "RF/Fluoreszenzindizes.csv",
+                    "RF/PARAFAC_Scores.csv", "RF/Durchschnitt_RF6000_AlleProben.csv"],
+    },
+    "Station": {
+        "script": "Station.py",
+        "inputs": ["Hourly_Wiese_Klimastation_sidecar/meta.json",
+                   "Hourly_Wiese_Klimastation_sidecar/aggregate_D.npz"],
+        "outputs": [],
+    },
+    "Nitrat_Phosphor": {
+        "script": "Nitrat_Phosphor.py",
+        "inputs": ["Nitrat_Phosphat/Nitrat_Phosphat.csv", "Hourly_Wiese_Klimastation_sidecar/meta.json",
+                   "Hourly_Wiese_Klimastation_sidecar/aggregate_D.npz"],
+        "outputs": ["Daily_Wiese_Klimastation.csv", "Intervall_Wiese_Klimastation.csv",
+                    "Vorwetter_Praediktoren.csv", "Vorregen_Fensterscan.csv"],
+    },
+    "Bufferwirkung": {
+        "script": "Bufferwirkung.py",
+        # RF und UV/Vis nur für die probennamen im probenregister
+        "inputs": ["Nitrat_Phosphat/Nitrat_Phosphat.csv", "TOC/NPOC.csv", "RF/*.txt",
+                   "UVVIS/AP[0-9]*.csv", "UVVIS/SP[0-9]*.csv"],
+        "outputs": ["Bufferwirkung_Unsicherheit.csv"],
+    },
+    "Sensitivitaet": {
+        "script": "Sensitivitaet.py",
+        "inputs": ["Nitrat_Phosphat/Nitrat_Phosphat.csv", "Hourly_Wiese_Klimastation_sidecar/meta.json",
+                   "Hourly_Wiese_Klimastation_sidecar/aggregate_D.npz"],
+        "outputs": ["Szenarien_Vergleich.csv"],
+    },
+}
+
+
+def local_modules(file_name, seen=None):
+    """
+    Sinn: Alle eigenen Module, die ein Skript direkt oder indirekt importiert (über den Syntaxbaum,
+    ohne die Module auszuführen)
+
+    Parameter:
+    ---------------------------------------
+
+    file_name: str
+        Dateiname relativ zum src Ordner (Module in Paketen z.B. "Funktionen/Plots.py")
+
+    seen: set, optional
+        schon besuchte Module (für die Rekursion)
+
+    Ergebnis:
+    ---------------------------------------
+    set mit Dateinamen
+    """
+    seen = set() if seen is None else seen
+    seen.add(file_name)
+    with open(os.path.join(src, file_name), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            top = name.split('.')[0]
+            # pakete (z.B. Funktionen) mit allen untermodulen
+            if os.path.isdir(os.path.join(src, top)):
+                deps = [os.path.join(top, f) for f in sorted(os.listdir(os.path.join(src, top)))
+                        if f.endswith(".py")]
+            else:
+                deps = [f"{top}.py"]
+            for dep in deps:
+                if dep not in seen and os.path.exists(os.path.join(src, dep)):
+                    local_modules(dep, seen)
+    return seen
+
+
+def dependencies(selected=None):
+    """
+    Sinn: Welche Stufe wartet auf welche (eine Ausgabe der einen passt auf ein Eingabemuster der anderen)
+
+    Parameter:
+    ---------------------------------------
+
+    selected: list, optional
+        nur diese Stufen und alles was sie vorher brauchen; None = alle
+
+    Ergebnis:
+    ---------------------------------------
+    dict Stufe -> set der vorherigen Stufen, in topologischer Reihenfolge
+    """
+    deps = {name: {other for other, o in stages.items() if other != name
+                   and any(fnmatch.fnmatch(out, pattern) for out in o["outputs"] for pattern in stage["inputs"])}
+            for name, stage in stages.items()}
+
+    if selected:
+        unknown = set(selected) - set(stages)
+        if unknown:
+            raise ValueError(f"Unbekannte Stufe(n): {sorted(unknown)}")
+        keep, todo = set(), list(selected)
+        while todo:
+            name = todo.pop()
+            if name not in keep:
+                keep.add(name)
+                todo.extend(deps[name])
+        deps = {name: deps[name] for name in deps if name in keep}
+
+    # topologisch sortieren (kahn), zyklen sind ein fehler in der stufenliste
+    order, done = [], set()
+    while len(order) < len(deps):
+        ready = [name for name in deps if name not in done and deps[name] <= done]
+        if not ready:
+            raise ValueError(f"Zyklus in den Stufen: {sorted(set(deps) - done)}")
+        order.extend(ready)
+        done.update(ready)
+    return {name: deps[name] for name in order}
+
+
+def fingerprint(name, data_path):
+    """
+    Sinn: Fingerabdruck einer Stufe aus Größe und Änderungszeit aller Eingabedateien und dem Inhalt
+    des Skripts samt eigener Module; nur stat() für die (großen) Daten, der Code ist klein
+
+    Parameter:
+    ---------------------------------------
+
+    name: str
+        Stufe
+
+    data_path: str
+        Datenordner
+
+    Ergebnis:
+    ---------------------------------------
+    str (sha1)
+    """
+    stage = stages[name]
+    h = hashlib.sha1()
+    h.update(json.dumps(stage.get("command", [])).encode())
+    code = set(stage.get("code", []))
+    if "script" in stage:
+        code |= local_modules(stage["script"])
+    for file_name in sorted(code):
+        h.update(file_name.encode())
+        with open(os.path.join(src, file_name), "rb") as f:
+            h.update(f.read())
+    for pattern in stage["inputs"]:
+        for file_path in sorted(glob(os.path.join(data_path, pattern))):
+            st = os.stat(file_path)
+            h.update(f"{os.path.relpath(file_path, data_path)}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def is_stale(name, data_path, state, current=None):
+    # veraltet wenn sich eingaben oder code geändert haben oder eine ausgabe fehlt
+    current = fingerprint(name, data_path) if current is None else current
+    if state.get(name, {}).get("fingerprint") != current:
+        return True
+    return not all(os.path.exists(os.path.join(data_path, out)) for out in stages[name]["outputs"])
+
+
+def run_stage(name, data_path, plots_path, log_dir):
+    """
+    Sinn: Eine Stufe als eigener Python Prozess ohne Fenster (matplotlib Backend Agg, plt.show()
+    macht dann nichts); Ausgabe landet in einer Logdatei
+
+    Parameter:
+    ---------------------------------------
+
+    name: str
+        Stufe
+
+    data_path, plots_path: str
+        Daten- und Plotordner (DATA_PATH / PLOTS_PATH für die Skripte)
+
+    log_dir: str
+        Ordner für die Logdateien
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (returncode, Sekunden)
+    """
+    stage = stages[name]
+    args = [sys.executable, stage["script"]] if "script" in stage else [sys.executable, *stage["command"]]
+    env = {**os.environ, "DATA_PATH": data_path, "PLOTS_PATH": plots_path, "MPLBACKEND": "Agg",
+           "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")]).rstrip(os.pathsep)}
+    t0 = time.perf_counter()
+    with open(os.path.join(log_dir, f"{name}.log"), "w", encoding="utf-8") as log:
+        result = subprocess.run(args, cwd=src, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - t0
+
+
+def run_pipeline(data_path, plots_path, selected=None, workers=None, force=False, dry_run=False):
+    """
+    Sinn: Führt alle veralteten Stufen aus; unabhängige Zweige (z.B. Station und TOC -> UV/Vis -> RF)
+    laufen gleichzeitig, eine Stufe startet sobald alle vorherigen fertig sind
+
+    Parameter:
+    ---------------------------------------
+
+    data_path, plots_path: str
+        Daten- und Plotordner
+
+    selected: list, optional
+        nur diese Stufen (plus was sie vorher brauchen)
+
+    workers: int, optional
+        maximale Anzahl gleichzeitiger Stufen
+
+    force: bool, optional
+        alle ausgewählten Stufen neu rechnen
+
+    dry_run: bool, optional
+        nur anzeigen was laufen würde
+
+    Ergebnis:
+    ---------------------------------------
+    dict Stufe -> Status ("aktuell", "neu", "fehler", "übersprungen", "veraltet")
+    """
+    data_path = os.path.abspath(data_path)
+    plots_path = os.path.abspath(plots_path)
+    state_dir = os.path.join(data_path, ".pipeline")
+    state_file = os.path.join(state_dir, "state.json")
+    os.makedirs(state_dir, exist_ok=True)
+    os.makedirs(plots_path, exist_ok=True)
+    state = {}
+    if os.path.exists(state_file):
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+
+    deps = dependencies(selected)
+    status = {}
+
+    if dry_run:
+        # eine stufe ist auch veraltet, wenn eine vorherige neu laufen muss
+        for name, before in deps.items():
+            stale = force or any(status[b] == "veraltet" for b in before) or is_stale(name, data_path, state)
+            status[name] = "veraltet" if stale else "aktuell"
+        return status
+
+    pending = dict(deps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name in [n for n, before in pending.items() if all(b in status for b in before)]:
+                del pending[name]
+                if any(status[b] in ("fehler", "übersprungen") for b in deps[name]):
+                    status[name] = "übersprungen"
+                    continue
+                # fingerabdruck erst jetzt, nachdem die vorherigen stufen ihre ausgaben geschrieben haben
+                current = fingerprint(name, data_path)
+                if not force and not is_stale(name, data_path, state, current):
+                    status[name] = "aktuell"
+                    continue
+                print(f"[start] {name}")
+                running[pool.submit(run_stage, name, data_path, plots_path, state_dir)] = (name, current)
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, current = running.pop(future)
+                code, seconds = future.result()
+                if code == 0:
+                    status[name] = "neu"
+                    state[name] = {"fingerprint": current, "seconds": round(seconds, 2)}
+                    # nach jeder stufe speichern, damit ein abbruch fertige stufen nicht verliert
+                    with open(state_file, "w", encoding="utf-8") as f:
+                        json.dump(state, f, indent=1)
+                else:
+                    status[name] = "fehler"
+                    state.pop(name, None)
+                print(f"[{status[name]}] {name} ({seconds:.1f} s, log: {os.path.join(state_dir, name + '.log')})")
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Führt die Auswertungen als Pipeline aus (nur veraltete Stufen).")
+    parser.add_argument("stages", nargs="*", help=f"Stufen (Standard: alle): {', '.join(stages)}")
+    parser.add_argument("--data", default=os.environ.get("DATA_PATH", "/data/"), help="Datenordner")
+    parser.add_argument("--plots", default=os.environ.get("PLOTS_PATH", "/plots/"), help="Plotordner")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="gleichzeitige Stufen")
+    parser.add_argument("--force", action="store_true", help="alle ausgewählten Stufen neu rechnen")
+    parser.add_argument("--dry-run", action="store_true", help="nur anzeigen, was laufen würde")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    result = run_pipeline(args.data, args.plots, args.stages or None, args.workers, args.force, args.dry_run)
+    for name, s in result.items():
+        print(f"{name:<16} {s}")
+    print(f"Pipeline: {time.perf_counter() - t0:.2f} s")
+    sys.exit(1 if "fehler" in result.values() else 0)
@@ -0,0 +1,178 @@
+# Skript: Inhaltsadressierter Cache für die Plots, damit unveränderte Abbildungen nicht neu gerendert werden
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+class PlotCache:
+    """
+    Sinn: Merkt sich pro .png Datei einen Hash aus den Eingangsdaten, Plotparametern und dem
+    Quelltext des aufrufenden Skripts (jede Änderung am Zeichencode rendert die Plots neu).
+    Stimmt der Hash und die Datei existiert noch, muss der Plot nicht neu gerendert werden.
+    Jedes Skript hat seinen eigenen Namensraum (eigene Indexdatei), damit das Aufräumen
+    nur die Plots des eigenen Skripts betrifft.
+
+    Parameter:
+    ---------------------------------------
+
+    plot_dir: str
+        Ordner der Plots
+
+    name: str
+        Namensraum, z.B. der Skriptname ("RF", "UVVIS")
+
+    source: str oder list, optional
+        Pfad(e) zum zeichnenden Code (meist __file__, dazu genutzte Plotmodule); der Quelltext
+        geht in jeden Schlüssel ein
+    """
+
+    def __init__(self, plot_dir, name, source=None):
+        self.plot_dir = plot_dir
+        self.name = name
+        h = hashlib.sha256()
+        for file_path in [source] if isinstance(source, str) else (source or []):
+            with open(file_path, "rb") as f:
+                h.update(f.read())
+        self.source = h.hexdigest() if source else ""
+        self.index_path = os.path.join(plot_dir, f".plotcache_{name}.json")
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                self.index = json.load(f)
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def key(self, *data, **params):
+        """
+        Sinn: Hash aus Daten (DataFrames, Arrays, sonstiges), Plotparametern und dem Quelltext
+        des Skripts
+
+        Parameter:
+        ---------------------------------------
+
+        *data:
+            Datenausschnitte, die im Plot landen
+
+        **params:
+            Plotparameter (vmin, vmax, Titel, ...)
+
+        Ergebnis:
+        ---------------------------------------
+        SHA-256 als hex string
+        """
+        h = hashlib.sha256(self.source.encode())
+        for d in data:
+            if isinstance(d, (pd.DataFrame, pd.Series)):
+                h.update(repr(list(d.columns) if isinstance(d, pd.DataFrame) else [d.name]).encode())
+                h.update(pd.util.hash_pandas_object(d, index=True).to_numpy().tobytes())
+            elif isinstance(d, np.ndarray):
+                h.update(f"{d.shape}{d.dtype}".encode())
+                h.update(np.ascontiguousarray(d).tobytes())
+            else:
+                h.update(repr(d).encode())
+        h.update(repr(sorted(params.items())).encode())
+        return h.hexdigest()
+
+    def hit(self, file_path, key):
+        """
+        Sinn: Prüft ob der Plot schon mit genau diesen Daten existiert
+
+        Parameter:
+        ---------------------------------------
+
+        file_path: str
+            Pfad zur .png Datei
+
+        key: str
+            Ergebnis von PlotCache.key
+
+        Ergebnis:
+        ---------------------------------------
+        True wenn nicht neu gerendert werden muss
+        """
+        name = os.path.basename(file_path)
+        self.seen.add(name)
+        if self.index.get(name) == key and os.path.exists(file_path):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def store(self, file_path, key):
+        """
+        Sinn: Trägt einen frisch gespeicherten Plot in den Index ein
+
+        Parameter:
+        ---------------------------------------
+
+        file_path: str
+            Pfad zur .png Datei
+
+        key: str
+            Ergebnis von PlotCache.key
+        """
+        name = os.path.basename(file_path)
+        self.seen.add(name)
+        self.index[name] = key
+
+    def savefig(self, file_path, key, fig=None, **kwargs):
+        """
+        Sinn: Wie plt.savefig, trägt den Plot danach in den Index ein
+
+        Parameter:
+        ---------------------------------------
+
+        file_path: str
+            Pfad zur .png Datei
+
+        key: str
+            Ergebnis von PlotCache.key
+
+        fig: matplotlib.figure.Figure, optional
+            sonst die aktuelle pyplot Figure
+
+        **kwargs:
+            an savefig (z.B. dpi=300)
+        """
+        if fig is None:
+            import matplotlib.pyplot as plt
+            fig = plt.gcf()
+        fig.savefig(file_path, **kwargs)
+        self.store(file_path, key)
+
+    def evict(self):
+        """
+        Sinn: Entfernt Einträge (und deren .png), die in diesem Lauf nicht mehr erzeugt wurden
+        oder deren Datei fehlt, z.B. nach umbenannten Proben; schreibt danach den Index.
+        Am Ende jedes Skripts aufrufen.
+        """
+        for name in list(self.index):
+            file_path = os.path.join(self.plot_dir, name)
+            if name not in self.seen or not os.path.exists(file_path):
+                if name not in self.seen and os.path.exists(file_path):
+                    os.remove(file_path)
+                del self.index[name]
+                self.evicted += 1
+        self.save()
+
+    def save(self):
+        """
+        Sinn: Schreibt den Index
+        """
+        os.makedirs(self.plot_dir, exist_ok=True)
+        with open(self.index_path, "w") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+
+    def log(self):
+        """
+        Sinn: Treffer/Fehlschläge für das Log des Laufs
+        """
+        print(f"Plot-Cache {self.name}: {self.hits} Treffer, {self.misses} neu gerendert, "
+              f"{self.evicted} entfernt")
@@ -0,0 +1,309 @@
+# Skript: Vorregen- und Zeitfenster-Prädiktoren aus den stündlichen Stationsdaten über Präfixsummen
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from Lagkorrelation import correlation_tensor
+
+# länge einer stunde in ns
+hour_ns = 3_600 * 10**9
+
+
+def sample_timestamps(datum, uhrzeit, default_time="12:00"):
+    """
+    Sinn: Genauer Zeitpunkt jeder Probe aus den Spalten Datum und Uhrzeit (wie in Nitrat_Phosphat.csv)
+
+    Parameter:
+    ---------------------------------------
+
+    datum: pd.Series
+        Datum (datetime oder "dd.mm.yyyy")
+
+    uhrzeit: pd.Series
+        Uhrzeit als "HH:MM", fehlend = NaN
+
+    default_time: str, optional
+        Uhrzeit für Proben ohne Eintrag
+
+    Ergebnis:
+    ---------------------------------------
+    pd.Series mit pd.Timestamp
+    """
+    datum = pd.to_datetime(datum, format="%d.%m.%Y") if datum.dtype == object or datum.dtype == "str" \
+        else pd.to_datetime(datum)
+    uhrzeit = uhrzeit.astype("string").fillna(default_time)
+    return datum.dt.normalize() + pd.to_timedelta(uhrzeit + ":00")
+
+
+class TrailingWindows:
+    """
+    Sinn: Stündliche Stationsdaten auf einem lückenlosen Stundenraster mit kumulativen Summen;
+    jedes zurückliegende Zeitfenster (Summe, Mittel, Gradstunden, API) ist dann eine Differenz
+    zweier Einträge, unabhängig von der Fensterlänge
+
+    Parameter:
+    ---------------------------------------
+
+    station: pd.DataFrame
+        stündliche Daten mit datetime (z.B. Stationsdaten.read_station)
+
+    columns: list, optional
+        Spalten für die Präfixsummen
+    """
+
+    def __init__(self, station, columns=("PCP", "Ta_2m")):
+        times = pd.to_datetime(station["datetime"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        self.start = int(times.min()) // hour_ns * hour_ns
+        slot = (times - self.start) // hour_ns
+        self.n_hours = int(slot.max()) + 1
+        self.columns = list(columns)
+
+        # werte auf dem stundenraster, fehlende stunden NaN
+        self.values = {}
+        self.cum = {}
+        self.cum_valid = {}
+        for col in self.columns:
+            v = np.full(self.n_hours, np.nan)
+            v[slot] = station[col].to_numpy(dtype=np.float64)
+            self.values[col] = v
+            self.cum[col] = np.r_[0.0, np.cumsum(np.nan_to_num(v))]
+            self.cum_valid[col] = np.r_[0, np.cumsum(~np.isnan(v))]
+        self._cum_degree = {}
+
+    def positions(self, times):
+        """
+        Sinn: As-of Zuordnung: Index der letzten Stunde am oder vor jedem Zeitpunkt
+
+        Parameter:
+        ---------------------------------------
+
+        times: pd.Series oder np.ndarray
+            Zeitpunkte der Proben
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray mit den Stundenindizes, -1 wenn vor bzw. nach den Stationsdaten
+        """
+        t = pd.to_datetime(pd.Series(times)).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        pos = (t - self.start) // hour_ns
+        pos[(pos < 0) | (pos >= self.n_hours)] = -1
+        return pos
+
+    def _window(self, cum, cum_valid, times, hours, min_coverage):
+        # (proben × fenster) für (t - h, t], jeweils nur eine differenz
+        pos = self.positions(times)[:, None]
+        hours = np.atleast_1d(np.asarray(hours, dtype=np.int64))[None, :]
+        hi = pos + 1
+        lo = hi - hours
+        ok = (pos >= 0) & (lo >= 0)
+        hi_c, lo_c = np.where(ok, hi, 0), np.where(ok, lo, 0)
+        total = cum[hi_c] - cum[lo_c]
+        coverage = (cum_valid[hi_c] - cum_valid[lo_c]) / hours
+        return np.where(ok & (coverage >= min_coverage), total, np.nan), coverage
+
+    def window_sum(self, column, times, hours, min_coverage=0.9):
+        """
+        Sinn: Summe über die letzten hours Stunden vor jeder Probe (z.B. Niederschlag 72 h)
+
+        Parameter:
+        ---------------------------------------
+
+        column: str
+            Spalte
+
+        times: pd.Series oder np.ndarray
+            Zeitpunkte der Proben
+
+        hours: int oder list
+            eine oder viele Fensterlängen in Stunden
+
+        min_coverage: float, optional
+            Mindestanteil gemessener Stunden im Fenster, sonst NaN
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray (Proben × Fenster)
+        """
+        return self._window(self.cum[column], self.cum_valid[column], times, hours, min_coverage)[0]
+
+    def window_mean(self, column, times, hours, min_coverage=0.9):
+        """
+        Sinn: Mittelwert über die letzten hours Stunden vor jeder Probe (nur gemessene Stunden)
+
+        Parameter:
+        ---------------------------------------
+
+        column, times, hours, min_coverage:
+            siehe window_sum
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray (Proben × Fenster)
+        """
+        total, coverage = self._window(self.cum[column], self.cum_valid[column], times, hours, min_coverage)
+        hours = np.atleast_1d(np.asarray(hours, dtype=np.float64))[None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / (coverage * hours)
+
+    def degree_hours(self, times, hours, base=5.0, column="Ta_2m", min_coverage=0.9):
+        """
+        Sinn: Gradstunden über base (Summe von max(T - base, 0)) über die letzten hours Stunden
+
+        Parameter:
+        ---------------------------------------
+
+        times, hours, min_coverage:
+            siehe window_sum
+
+        base: float, optional
+            Basistemperatur in °C
+
+        column: str, optional
+            Temperaturspalte
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray (Proben × Fenster)
+        """
+        key = (column, float(base))
+        if key not in self._cum_degree:
+            # präfixsumme pro basistemperatur nur einmal
+            excess = np.maximum(np.nan_to_num(self.values[column] - base), 0.0)
+            self._cum_degree[key] = np.r_[0.0, np.cumsum(excess)]
+        return self._window(self._cum_degree[key], self.cum_valid[column], times, hours, min_coverage)[0]
+
+    def api(self, times, hours, k=0.9, column="PCP", min_coverage=0.9):
+        """
+        Sinn: Vorregenindex API = Summe P_i * k^(Alter in Tagen) über die letzten hours Stunden;
+        das exponentiell gedämpfte Gesamt-API wird einmal als rekursiver Filter gerechnet,
+        ein Fenster ist dann API(t) - k^(h/24) * API(t - h)
+
+        Parameter:
+        ---------------------------------------
+
+        times, hours, min_coverage:
+            siehe window_sum
+
+        k: float, optional
+            Abklingfaktor pro Tag
+
+        column: str, optional
+            Niederschlagsspalte
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray (Proben × Fenster) in mm
+        """
+        key = (column, "api", float(k))
+        if key not in self._cum_degree:
+            decay = k ** (1 / 24)
+            self._cum_degree[key] = np.r_[0.0, lfilter([1.0], [1.0, -decay], np.nan_to_num(self.values[column]))]
+        a = self._cum_degree[key]
+
+        pos = self.positions(times)[:, None]
+        hours = np.atleast_1d(np.asarray(hours, dtype=np.int64))[None, :]
+        hi = pos + 1
+        lo = hi - hours
+        ok = (pos >= 0) & (lo >= 0)
+        hi_c, lo_c = np.where(ok, hi, 0), np.where(ok, lo, 0)
+        value = a[hi_c] - (k ** (hours / 24)) * a[lo_c]
+        coverage = (self.cum_valid[column][hi_c] - self.cum_valid[column][lo_c]) / hours
+        return np.where(ok & (coverage >= min_coverage), value, np.nan)
+
+
+def trailing_predictors(station, times, windows=(24, 72, 168), api_k=0.9, base=5.0, min_coverage=0.9):
+    """
+    Sinn: Standard Prädiktoren pro Probe: Niederschlagssumme, API, Gradstunden und mittlere
+    Lufttemperatur über die letzten 24/72/168 Stunden
+
+    Parameter:
+    ---------------------------------------
+
+    station: pd.DataFrame oder TrailingWindows
+        stündliche Stationsdaten (datetime, PCP, Ta_2m)
+
+    times: pd.Series
+        Zeitpunkte der Proben (siehe sample_timestamps)
+
+    windows: tuple, optional
+        Fensterlängen in Stunden
+
+    api_k: float, optional
+        Abklingfaktor des API pro Tag
+
+    base: float, optional
+        Basistemperatur der Gradstunden in °C
+
+    min_coverage: float, optional
+        Mindestanteil gemessener Stunden im Fenster
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit einer Zeile pro Probe
+    """
+    tw = station if isinstance(station, TrailingWindows) else TrailingWindows(station)
+    blocks = {
+        "PCP": tw.window_sum("PCP", times, windows, min_coverage),
+        "API": tw.api(times, windows, k=api_k, min_coverage=min_coverage),
+        "DH": tw.degree_hours(times, windows, base=base, min_coverage=min_coverage),
+        "Ta_mean": tw.window_mean("Ta_2m", times, windows, min_coverage),
+    }
+    return pd.DataFrame({f"{name}_{h}h": values[:, j] for name, values in blocks.items()
+                         for j, h in enumerate(windows)})
+
+
+def window_scan(tw, times, values, hours, column="PCP", kind="sum", min_coverage=0.9):
+    """
+    Sinn: Spearman rho der Probenwerte gegen sehr viele Fensterlängen auf einmal (z.B. 1 bis 720 h
+    Vorregen); die Fenster kosten je nur eine Differenz der Präfixsummen, die Korrelation läuft
+    als ein Tensor über alle Fenster und Variablen
+
+    Parameter:
+    ---------------------------------------
+
+    tw: TrailingWindows
+        Präfixsummen der Stationsdaten
+
+    times: pd.Series
+        Zeitpunkte der Proben
+
+    values: pd.DataFrame
+        Probenwerte (Proben × Variablen)
+
+    hours: list
+        Fensterlängen in Stunden
+
+    column: str, optional
+        Stationsspalte
+
+    kind: str, optional
+        "sum", "mean" oder "api"
+
+    min_coverage: float, optional
+        Mindestanteil gemessener Stunden im Fenster
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame im long format mit Variable, Stunden, rho, pval, n
+    """
+    if kind == "sum":
+        w = tw.window_sum(column, times, hours, min_coverage)
+    elif kind == "mean":
+        w = tw.window_mean(column, times, hours, min_coverage)
+    elif kind == "api":
+        w = tw.api(times, hours, column=column, min_coverage=min_coverage)
+    else:
+        raise ValueError(f"Unbekannter kind: {kind}")
+
+    # tensoren mit form (variablen, fenster, proben)
+    x = values.to_numpy(dtype=np.float64).T[:, None, :]
+    rho, pval, n = correlation_tensor(x, w.T[None, :, :])
+    return pd.DataFrame({
+        "Variable": np.repeat(values.columns.to_numpy(), len(hours)),
+        "Stunden": np.tile(np.asarray(hours), values.shape[1]),
+        "rho": rho.ravel(),
+        "pval": pval.ravel(),
+        "n": n.ravel(),
+    })
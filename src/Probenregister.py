@@ -0,0 +1,214 @@
+# Skript: Zentrales Probenregister (Ort, Replikat, Datum) mit Zeilenindizes in die Daten jedes Messgeräts
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+from glob import glob
+import numpy as np
+import pandas as pd
+
+# probennamen wie AP01 oder AP01_270525 (ort, replikat, optional _ddmmyy)
+name_pattern = r"^(?P<Site>[A-Z]+)(?P<Replicate>\d+)(?:_(?P<Date>\d{6}))?$"
+
+
+def parse_names(names, dates=None):
+    """
+    Sinn: Ort, Replikat und Datum aus Probennamen oder Dateinamen für alle Zeilen auf einmal
+
+    Parameter:
+    ---------------------------------------
+
+    names: list oder pd.Series
+        z.B. "AP01_270525", "C:/.../SP02_010725.txt" oder "AP01" (dann dates angeben)
+
+    dates: pd.Series, optional
+        Datum pro Zeile, wenn es nicht im Namen steht
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Probe (z.B. "AP01"), Site, Replicate und Date
+    """
+    names = pd.Series(list(names), dtype="string").str.replace("\\", "/", regex=False)
+    stem = names.str.rsplit("/", n=1).str[-1].str.replace(r"\.[^.]*$", "", regex=True)
+    parts = stem.str.extract(name_pattern)
+    if parts["Site"].isna().any():
+        raise ValueError(f"Unbekannte Probennamen: {list(names[parts['Site'].isna()])[:5]}")
+    date = pd.to_datetime(parts["Date"], format="%d%m%y") if dates is None \
+        else pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+    return pd.DataFrame({
+        "Probe": (parts["Site"] + parts["Replicate"]).astype(str),
+        "Site": parts["Site"].astype(str),
+        "Replicate": parts["Replicate"].astype(int),
+        "Date": date.dt.normalize().to_numpy(),
+    })
+
+
+class SampleRegistry:
+    """
+    Sinn: Jede physische Probe bekommt einen ganzzahligen Schlüssel; pro Messgerät (Datenspeicher)
+    wird der Zeilenindex jeder Probe gespeichert, sodass Verknüpfungen nur noch Indexzugriffe sind.
+    Datumsangaben, die für denselben Ort und dasselbe Replikat höchstens tolerance_days auseinander
+    liegen, gelten als dieselbe Probe (z.B. Probenahme 03.06. und Dateiname 020625)
+
+    Parameter:
+    ---------------------------------------
+
+    tolerance_days: int, optional
+        maximale Abweichung der Daten einer Probe zwischen den Messgeräten
+    """
+
+    def __init__(self, tolerance_days=1):
+        self.tolerance = pd.Timedelta(days=tolerance_days)
+        self.samples = pd.DataFrame({"Site": pd.Series(dtype=str), "Replicate": pd.Series(dtype=int),
+                                     "Date": pd.Series(dtype="datetime64[ns]")})
+        self.offsets = {}
+        self.row_keys = {}
+
+    def __len__(self):
+        return len(self.samples)
+
+    def _match(self, parsed):
+        # nächste schon bekannte probe gleichen orts und replikats innerhalb der toleranz
+        known = self.samples.reset_index(names="Key")[["Key", "Site", "Replicate", "Date"]].sort_values("Date")
+        query = parsed.reset_index(names="Row")[["Row", "Site", "Replicate", "Date"]].sort_values("Date")
+        if not len(known):
+            return np.full(len(parsed), -1, dtype=np.int64)
+        matched = pd.merge_asof(query, known, on="Date", by=["Site", "Replicate"],
+                                direction="nearest", tolerance=self.tolerance)
+        keys = np.full(len(parsed), -1, dtype=np.int64)
+        keys[matched["Row"].to_numpy()] = matched["Key"].fillna(-1).to_numpy(dtype=np.int64)
+        return keys
+
+    def register(self, instrument, names, dates=None):
+        """
+        Sinn: Die Zeilen eines Datenspeichers (in seiner Reihenfolge) registrieren; unbekannte Proben
+        bekommen neue Schlüssel
+
+        Parameter:
+        ---------------------------------------
+
+        instrument: str
+            Name des Datenspeichers (z.B. "RF", "TOC", "Naehrstoffe")
+
+        names: list oder pd.Series
+            Proben- oder Dateiname pro Zeile, siehe parse_names
+
+        dates: pd.Series, optional
+            Datum pro Zeile, wenn es nicht im Namen steht
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray mit dem Schlüssel jeder Zeile
+        """
+        parsed = parse_names(names, dates).drop(columns="Probe")
+        parsed["Date"] = parsed["Date"].astype("datetime64[ns]")
+        keys = self._match(parsed)
+
+        # neue proben (innerhalb des aufrufs gleiche ort/replikat/datum nur einmal)
+        new = keys < 0
+        if new.any():
+            fresh = parsed[new].drop_duplicates()
+            fresh.index = np.arange(len(self.samples), len(self.samples) + len(fresh))
+            self.samples = pd.concat([self.samples, fresh])
+            keys[new] = self._match(parsed[new].reset_index(drop=True))
+
+        # zeilenindex pro schlüssel; -1 = probe nicht in diesem speicher
+        offsets = np.full(len(self.samples), -1, dtype=np.int64)
+        offsets[keys] = np.arange(len(keys))
+        for name in self.offsets:
+            self.offsets[name] = np.r_[self.offsets[name], np.full(len(offsets) - len(self.offsets[name]), -1)]
+        self.offsets[instrument] = offsets
+        self.row_keys[instrument] = keys
+        return keys
+
+    def align(self, values, source, target):
+        """
+        Sinn: Werte eines Datenspeichers auf die Zeilen eines anderen übertragen (reiner Indexzugriff
+        statt pd.merge auf Probe und Datum)
+
+        Parameter:
+        ---------------------------------------
+
+        values: np.ndarray
+            Werte in der Zeilenreihenfolge von source (erste Achse)
+
+        source: str
+            Datenspeicher der Werte
+
+        target: str
+            Datenspeicher, auf dessen Zeilen übertragen wird
+
+        Ergebnis:
+        ---------------------------------------
+        np.ndarray mit einer Zeile pro Zeile von target, NaN wo die Probe in source fehlt
+        """
+        values = np.asarray(values, dtype=np.float64)
+        rows = self.offsets[source][self.row_keys[target]]
+        out = values[np.maximum(rows, 0)]
+        out[rows < 0] = np.nan
+        return out
+
+    def table(self, *instruments):
+        """
+        Sinn: Probentabelle mit den Zeilenindizes der gewünschten Datenspeicher
+
+        Parameter:
+        ---------------------------------------
+
+        *instruments: str
+            Datenspeicher; ohne Angabe alle
+
+        Ergebnis:
+        ---------------------------------------
+        pd.DataFrame mit Key, Site, Replicate, Date und einer Spalte pro Datenspeicher (-1 = fehlt)
+        """
+        instruments = instruments or tuple(self.offsets)
+        out = self.samples.reset_index(names="Key")
+        for name in instruments:
+            out[name] = self.offsets[name]
+        return out
+
+
+def build_registry(path, tolerance_days=1):
+    """
+    Sinn: Registriert alle Proben der Messgeräte im Datenordner einmal über die Dateinamen bzw.
+    Probentabellen; die Zeilenreihenfolge entspricht jeweils dem Loader des Messgeräts
+
+    Parameter:
+    ---------------------------------------
+
+    path: str
+        Datenordner (mit Nitrat_Phosphat, TOC, RF und UVVIS)
+
+    tolerance_days: int, optional
+        siehe SampleRegistry
+
+    Ergebnis:
+    ---------------------------------------
+    SampleRegistry mit den Datenspeichern Naehrstoffe, TOC, RF, UVVIS_AP und UVVIS_SP
+    """
+    registry = SampleRegistry(tolerance_days)
+
+    # probenahmen zuerst, deren datum gilt dann für alle geräte
+    nutrients = pd.read_csv(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv", usecols=["Datum", "Probe"])
+    registry.register("Naehrstoffe", nutrients["Probe"], pd.to_datetime(nutrients["Datum"], format="%d.%m.%Y"))
+
+    # TOC in der reihenfolge von NPOC.csv (TOC.py)
+    if os.path.exists(f"{path}/TOC/NPOC.csv"):
+        registry.register("TOC", pd.read_csv(f"{path}/TOC/NPOC.csv", usecols=["Probenname"])["Probenname"])
+
+    # RF wie EEMCube.from_files (sortiert nach serie und datum)
+    rf = glob(f"{path}/RF/*.txt")
+    if rf:
+        parsed = parse_names(rf)
+        order = np.lexsort((parsed["Date"].to_numpy(), parsed["Probe"].to_numpy()))
+        registry.register("RF", [rf[i] for i in order])
+
+    # UV/Vis wie UVVIS_Einlesen.load_uvvis_files (nach datum, dann probe)
+    for site in ("AP", "SP"):
+        files = glob(f"{path}/UVVIS/{site}[0-9]*.csv")
+        if files:
+            parsed = parse_names(files)
+            order = np.lexsort((parsed["Probe"].to_numpy(), parsed["Date"].to_numpy()))
+            registry.register(f"UVVIS_{site}", [files[i] for i in order])
+    return registry
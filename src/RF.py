@@ -2,108 +2,93 @@
 # Autor: Marc Kevin Schneider
 # Datum: September 2025
 
+import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from glob import glob
-from Funktionen import read_shimadzu_file, plot_fluorescence_heatmap, plot_location_over_time
+from EEM import EEMCube, average_replicates
+from Fluoreszenzindizes import fluorescence_indices
+from Streulicht import remove_scatter
+from PARAFAC import fit_parafac, split_half_validation
+from Innenfilter import correct_inner_filter, absorbance_matrix
+import Heatmaps
+from Heatmaps import render_fluorescence_heatmaps
+from Plotcache import PlotCache
+from RF_Konvertierung import convert_rf_files, print_report
 
-path = "/data/"
-path_plots = "/plots/"
+# pfade lassen sich über DATA_PATH / PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
 
-ap = glob(f"{path}/RF/AP*.txt")
+# main guard, da die konvertierung einen prozesspool startet (unter windows werden
+# die worker sonst das ganze skript nochmal ausführen)
+if __name__ == "__main__":
 
-sp = glob(f"{path}/RF/SP*.txt")
+    # plotfunktionen (matplotlib/seaborn) erst hier, die worker der prozesspools brauchen sie nicht
+    import Funktionen.Plots
+    from Funktionen import plot_location_over_time
 
-for f in ap:
-    # ID und datum aus dem Dateinamen
-    fname = f.split("\\")[-1].replace(".txt", "")
-    
-    df = read_shimadzu_file(f)
-    df.to_csv(f"{path}/RF/{fname}.csv", index=False)
+    # plots nur neu rendern wenn sich daten oder der zeichencode (skript, Heatmaps, Plots) geändert haben
+    plot_cache = PlotCache(path_plots, "RF", [__file__, Heatmaps.__file__, Funktionen.Plots.__file__])
 
-for f in sp:
-    # ID und datum aus dem Dateinamen
-    fname = f.split("\\")[-1].replace(".txt", "")
-    
-    df = read_shimadzu_file(f)
-    df.to_csv(f"{path}/RF/{fname}.csv", index=False)
+    # .txt zu .csv für AP und SP, parallel und nur für neue oder geänderte dateien
+    report = convert_rf_files(glob(f"{path}/RF/AP*.txt") + glob(f"{path}/RF/SP*.txt"))
+    print_report(report)
 
-###############################################################################
+    ###############################################################################
 
-# alle zusammen
+    # alle zusammen
 
-# pfade für alle .csv dateien
-all_files = glob(f"{path}/RF/*.csv")
+    # alle proben in einen EEM würfel (probe × EX × EM), achsen werden gegen die metadaten geprüft
+    cube = EEMCube.from_files(glob(f"{path}/RF/*.txt"))
 
-# leere liste für alle daten
-combined_data = []
+    # speichern (binär für die weiteren schritte, .csv im alten breiten format)
+    cube.save(f"{path}/RF/RF6000_AlleProben.npz")
+    cube.to_frame().to_csv(f"{path}/RF/RF6000_AlleProben.csv", index=False)
 
-for f in all_files:
-    # probennamen und datum extrahieren
-    fname = f.split("\\")[-1].replace(".csv", "")
-    series, date_str = fname.split("_")
-    # datum wieder zu datetime
-    sample_date = pd.to_datetime(date_str, format="%d%m%y")
-    
-    # lese .csv
-    df = pd.read_csv(f)
-    # packe probennamen und datum dazu
-    df["Series"] = series
-    df["Sample_Date"] = sample_date
-    
-    combined_data.append(df)
 
-# aneinanderpacken fürs dataframe
-all_df = pd.concat(combined_data, ignore_index=True)
+    ###########################################################################
 
-# überflüssige spalte löschen
-all_df = all_df.drop("Unnamed: 177", axis=1)
+    # visualisierung
 
-# speichern
-all_df.to_csv(f"{path}/RF/RF6000_AlleProben.csv", index=False)
+    # daten lesen
+    cube = EEMCube.load(f"{path}/RF/RF6000_AlleProben.npz")
 
+    # innerer filtereffekt mit den UV/Vis daten der gleichen proben korrigieren (aus UVVIS.py)
+    uvvis = pd.concat([pd.read_csv(f"{path}/UVVIS/AP_Messungen.csv"),
+                       pd.read_csv(f"{path}/UVVIS/SP_Messungen.csv")])
+    cube = correct_inner_filter(cube, *absorbance_matrix(uvvis))
 
-###########################################################################
+    # rayleigh und raman streuung raus (sonst dominieren die streubanden die farbskala)
+    cube = remove_scatter(cube)
 
-# visualisierung
+    # heatmaps aller proben (headless auf mehreren prozessen, jede probe genau einmal)
+    files = render_fluorescence_heatmaps(cube, out_dir=path_plots, vmin=0, cache=plot_cache)
+    print(f"{len(files)} Heatmaps neu gespeichert")
 
-# daten lesen
-all_df = pd.read_csv(f"{path}/RF/RF6000_AlleProben.csv")
-all_df["Sample_Date"] = pd.to_datetime(all_df["Sample_Date"])
 
-# heatmap plotten
-plot_fluorescence_heatmap(all_df, series="AP01", sample_date="2025-07-01", vmax=200, vmin=0)
+    # fluoreszenzindizes (FI, HIX, BIX, Coble Peaks) für alle proben, gleiche schlüssel wie Nitrat_Phosphat.csv
+    indices = fluorescence_indices(cube)
+    indices.to_csv(f"{path}/RF/Fluoreszenzindizes.csv", index=False)
+    print(indices)
 
-# alle Proben und Beprobungspunkte plotten
-for series in all_df["Series"].unique():
-    for date in all_df["Sample_Date"].unique():
-        try:
-            plot_fluorescence_heatmap(all_df, series=series, sample_date=date, vmax=200, vmin=0)
-            print(f"Completed {series} on {date}...")
-        except ValueError:
-            continue
 
+    # PARAFAC zerlegung in fluorophor komponenten (zufällige starts laufen parallel)
+    model = fit_parafac(cube, rank=3, n_starts=10)
+    print(model)
+    print(split_half_validation(cube, rank=3))
+    model.scores(cube).to_csv(f"{path}/RF/PARAFAC_Scores.csv", index=False)
 
-# nur location als spalte, damit wir die Proben zusammenrechnen können
-all_df["Location"] = all_df["Series"].str[:2]
 
-# numerische Spalten
-em_cols = [c for c in all_df.columns if c not in ["EX Wavelength/EM Wavelength", "Series", "Sample_Date", "Location"]]
+    # replikate mitteln (z.B. AP01 und AP02 am 15.06. durchschnitt), inkl. streuung und anzahl
+    mean_cube, std_cube, count = average_replicates(cube)
 
-# gruppieren für location + datum + wellenlänge und dann average (z.B. AP01 und AP02 am 15.06. durchschnitt)
-mean_df = (
-    all_df.groupby(["Location", "Sample_Date", "EX Wavelength/EM Wavelength"], as_index=False)[em_cols]
-          .mean()
-)
+    # nochmal speichern
+    mean_cube.to_frame(key="Location").to_csv(f"{path}/RF/Durchschnitt_RF6000_AlleProben.csv", index=False)
 
-# nochmal speichern
-mean_df.to_csv(f"{path}/RF/Durchschnitt_RF6000_AlleProben.csv", index=False)
+    # zeitserie für die heatmaps (direkt aus dem würfel, kein neues einlesen)
+    plot_location_over_time(mean_cube, location="AP", vmin=0, cache=plot_cache)
 
-
-mean_df = pd.read_csv(f"{path}/RF/Durchschnitt_RF6000_AlleProben.csv")
-mean_df["Sample_Date"] = pd.to_datetime(mean_df["Sample_Date"])
-
-# zeitserie für die heatmaps
-plot_location_over_time(mean_df, location="AP", vmax=200, vmin=0)
\ No newline at end of file
+    # veraltete plots aufräumen und treffer ins log
+    plot_cache.evict()
+    plot_cache.log()
@@ -0,0 +1,166 @@
+# Skript: Parallele und inkrementelle Konvertierung der Shimadzu RF-6000 .txt Dateien zu .csv
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import sys
+import json
+import time
+import hashlib
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from Funktionen import read_shimadzu_file
+
+path = "/data/"
+
+# name der manifest datei im ausgabeordner
+manifest_name = ".rf_konvertierung.json"
+
+
+def file_hash(file_path):
+    """
+    Sinn: SHA-256 Prüfsumme einer Datei
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur Datei
+
+    Ergebnis:
+    ---------------------------------------
+    Prüfsumme als hex string
+    """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def convert_file(file_path, out_dir):
+    """
+    Sinn: Konvertiert eine .txt Datei zu .csv (läuft in den Worker Prozessen)
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur .txt Datei
+
+    out_dir: str
+        Ordner für die .csv Datei
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit Datei, Prüfsumme und Laufzeit
+    """
+    t0 = time.perf_counter()
+    fname = os.path.splitext(os.path.basename(file_path.replace("\\", "/")))[0]
+    df = read_shimadzu_file(file_path)
+    df.to_csv(os.path.join(out_dir, f"{fname}.csv"), index=False)
+    return {"file": file_path, "sha256": file_hash(file_path),
+            "seconds": time.perf_counter() - t0}
+
+
+def convert_rf_files(files, out_dir=None, manifest_path=None, workers=None, force=False):
+    """
+    Sinn: Konvertiert viele .txt Dateien parallel; Dateien, die sich laut Manifest
+    (mtime/Größe oder Prüfsumme) nicht geändert haben, werden übersprungen
+
+    Parameter:
+    ---------------------------------------
+
+    files: list
+        Pfade zu den .txt Dateien
+
+    out_dir: str, optional
+        Ordner für die .csv Dateien; standardmäßig der Ordner der ersten Datei
+
+    manifest_path: str, optional
+        Pfad zum Manifest; standardmäßig out_dir/.rf_konvertierung.json
+
+    workers: int, optional
+        Anzahl der Prozesse; standardmäßig alle Kerne, 1 = ohne Prozesspool
+
+    force: bool, optional
+        alle Dateien neu konvertieren
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Status ("konvertiert"/"übersprungen") und Laufzeit pro Datei
+    """
+    files = sorted(files)
+    if not files:
+        return pd.DataFrame(columns=["file", "status", "seconds"])
+    if out_dir is None:
+        out_dir = os.path.dirname(files[0])
+    if manifest_path is None:
+        manifest_path = os.path.join(out_dir, manifest_name)
+
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+    # welche dateien haben sich geändert?
+    todo, rows = [], []
+    for f in files:
+        stat = os.stat(f)
+        entry = manifest.get(os.path.basename(f))
+        csv_exists = os.path.exists(os.path.join(out_dir, os.path.splitext(os.path.basename(f))[0] + ".csv"))
+        if entry is None or not csv_exists:
+            todo.append(f)
+        elif entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            rows.append({"file": f, "status": "übersprungen", "seconds": 0.0})
+        elif entry["sha256"] == file_hash(f):
+            # nur angefasst (z.B. kopiert), inhalt gleich
+            entry["mtime"], entry["size"] = stat.st_mtime, stat.st_size
+            rows.append({"file": f, "status": "übersprungen", "seconds": 0.0})
+        else:
+            todo.append(f)
+
+    # konvertieren (bei nur einer datei lohnt sich kein pool)
+    if workers == 1 or len(todo) <= 1:
+        results = [convert_file(f, out_dir) for f in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(convert_file, todo, [out_dir] * len(todo),
+                                    chunksize=max(len(todo) // (4 * (workers or os.cpu_count() or 1)), 1)))
+
+    for r in results:
+        stat = os.stat(r["file"])
+        manifest[os.path.basename(r["file"])] = {"mtime": stat.st_mtime, "size": stat.st_size,
+                                                 "sha256": r["sha256"]}
+        rows.append({"file": r["file"], "status": "konvertiert", "seconds": r["seconds"]})
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    return pd.DataFrame(rows).sort_values("file").reset_index(drop=True)
+
+
+def print_report(report):
+    """
+    Sinn: Gibt die Laufzeiten pro Datei und eine Zusammenfassung aus
+
+    Parameter:
+    ---------------------------------------
+
+    report: pd.DataFrame
+        Ergebnis von convert_rf_files
+    """
+    for _, row in report.iterrows():
+        print(f"{os.path.basename(row['file']):<24} {row['status']:<13} {row['seconds'] * 1000:8.1f} ms")
+    n_conv = (report["status"] == "konvertiert").sum()
+    print(f"{n_conv} konvertiert, {len(report) - n_conv} übersprungen, "
+          f"{report['seconds'].sum():.2f} s Rechenzeit")
+
+
+if __name__ == "__main__":
+    # aufruf: python RF_Konvertierung.py [ordner] [--force]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    folder = args[0] if args else f"{path}/RF"
+    report = convert_rf_files(glob(f"{folder}/*.txt"), force="--force" in sys.argv)
+    print_report(report)
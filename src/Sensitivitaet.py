@@ -0,0 +1,30 @@
+# Skript: Sensitivitätsanalyse für die Ersetzung der Werte unter/über der Nachweisgrenze
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import pandas as pd
+from Zensierung import read_measurements, rules
+from Stationsdaten import station_aggregate
+from Szenarien import run_scenarios
+
+# datenordner, lässt sich über DATA_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+
+# main guard, da die szenarien einen prozesspool starten (unter windows werden
+# die worker sonst das ganze skript nochmal ausführen)
+if __name__ == "__main__":
+
+    # messwerte mit flag statt "<0.5" -> 0.5
+    messungen = read_measurements(f"{path}/Nitrat_Phosphat/Nitrat_Phosphat.csv")
+    print(messungen[["Nitrat_flag", "Phosphor_flag"]].apply(pd.Series.value_counts))
+
+    # tägliche stationsdaten für die lag analyse
+    station_daily = station_aggregate(f"{path}/Hourly_Wiese_Klimastation.csv", freq="D")
+
+    # korrelation, lags und bufferwirkung für DL, DL/2, 0 und ROS in einem durchgang
+    vergleich = run_scenarios(messungen, station_daily, rules, lags=range(-60, 61))
+    vergleich.to_csv(f"{path}/Szenarien_Vergleich.csv")
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(vergleich)
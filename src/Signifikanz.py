@@ -0,0 +1,376 @@
+# Skript: Block-Permutationstests (erhalten die Autokorrelation) und Benjamini-Hochberg Korrektur
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from math import factorial
+import numpy as np
+from Lagkorrelation import correlation_tensor
+
+# daten für die worker prozesse (wird einmal pro prozess gesetzt, nicht pro start)
+_worker_data = None
+
+
+def block_permutations(n, block, n_perm, rng):
+    """
+    Sinn: Zufällige Permutationen, die nur ganze Blöcke aufeinanderfolgender Einheiten (Proben oder
+    Probentage) vertauschen; innerhalb eines Blocks bleibt die zeitliche Struktur (Autokorrelation) erhalten
+
+    Parameter:
+    ---------------------------------------
+
+    n: int
+        Anzahl Einheiten (in zeitlicher Reihenfolge)
+
+    block: int
+        Blocklänge in Einheiten
+
+    n_perm: int
+        Anzahl Permutationen
+
+    rng: np.random.Generator
+        Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (n_perm, n) mit den Indizes
+    """
+    n_blocks = -(-n // block)
+    order = rng.permuted(np.tile(np.arange(n_blocks), (n_perm, 1)), axis=1)
+    return _block_indices(order, n, block)
+
+
+def exact_block_permutations(n, block):
+    """
+    Sinn: Alle Reihenfolgen der Blöcke (inklusive der beobachteten); bei wenigen Blöcken statt
+    zufälliger Permutationen, die sich sonst nur wiederholen würden
+
+    Parameter:
+    ---------------------------------------
+
+    n: int
+        Anzahl Einheiten (in zeitlicher Reihenfolge)
+
+    block: int
+        Blocklänge in Einheiten
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray ((Anzahl Blöcke)!, n) mit den Indizes, die erste Zeile ist die Identität
+    """
+    n_blocks = -(-n // block)
+    order = np.array(list(permutations(range(n_blocks))), dtype=np.int64)
+    return _block_indices(order, n, block)
+
+
+def _block_indices(order, n, block):
+    idx = (order[:, :, None] * block + np.arange(block)).reshape(len(order), -1)
+    # der letzte block ist kürzer; indizes >= n fallen raus, jede zeile behält genau n
+    return idx[idx < n].reshape(len(order), n)
+
+
+def default_block(n):
+    """
+    Sinn: Standard Blocklänge (Anzahl Zeitpunkte)^(1/3), mindestens 1
+
+    Parameter:
+    ---------------------------------------
+
+    n: int
+        Anzahl Zeitpunkte
+
+    Ergebnis:
+    ---------------------------------------
+    int Blocklänge
+    """
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def is_exact(n, block, n_perm):
+    """
+    Sinn: Prüft ob alle Blockreihenfolgen aufgezählt werden (höchstens n_perm verschiedene)
+
+    Parameter:
+    ---------------------------------------
+
+    n: int
+        Anzahl Zeitpunkte
+
+    block: int
+        Blocklänge in Zeitpunkten
+
+    n_perm: int
+        Anzahl Permutationen
+
+    Ergebnis:
+    ---------------------------------------
+    bool
+    """
+    return factorial(-(-n // block)) <= n_perm
+
+
+def min_p_value(n, n_perm=999, block=None):
+    """
+    Sinn: Kleinster p-Wert, den permutation_test bei n Zeitpunkten überhaupt liefern kann; liegt er
+    nahe an alpha, kann auch nach FDR Korrektur kaum eine Zelle signifikant werden
+
+    Parameter:
+    ---------------------------------------
+
+    n: int
+        Anzahl Zeitpunkte
+
+    n_perm: int, optional
+        Anzahl Permutationen
+
+    block: int, optional
+        Blocklänge in Zeitpunkten; standardmäßig default_block(n)
+
+    Ergebnis:
+    ---------------------------------------
+    float
+    """
+    block = default_block(n) if block is None else block
+    if is_exact(n, block, n_perm):
+        return 1.0 / factorial(-(-n // block))
+    return 1.0 / (1.0 + n_perm)
+
+
+def group_layout(groups=None, members=None, n=None):
+    """
+    Sinn: Zeilen den Zeitpunkten (z.B. Probentag) und innerhalb eines Zeitpunkts den Mitgliedern
+    (z.B. Ort AP/SP) zuordnen, damit immer ganze Zeitpunkte permutiert werden
+
+    Parameter:
+    ---------------------------------------
+
+    groups: np.ndarray, optional
+        Zeitpunkt pro Zeile (sortierbar); None = jede Zeile ist ein eigener Zeitpunkt
+
+    members: np.ndarray, optional
+        Mitglied pro Zeile; None = Reihenfolge innerhalb des Zeitpunkts
+
+    n: int, optional
+        Anzahl Zeilen (nur ohne groups nötig)
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (grid, group, member): grid (Zeitpunkte, Mitglieder) mit dem Zeilenindex (-1 = fehlt),
+    group und member als Index pro Zeile
+    """
+    if groups is None:
+        return np.arange(n)[:, None], np.arange(n), np.zeros(n, dtype=np.int64)
+    _, group = np.unique(np.asarray(groups), return_inverse=True)
+    if members is None:
+        # position innerhalb des zeitpunkts
+        order = np.argsort(group, kind="stable")
+        starts = np.searchsorted(group[order], group[order])
+        member = np.empty(len(group), dtype=np.int64)
+        member[order] = np.arange(len(group)) - starts
+    else:
+        _, member = np.unique(np.asarray(members), return_inverse=True)
+    grid = np.full((group.max() + 1, member.max() + 1), -1, dtype=np.int64)
+    grid[group, member] = np.arange(len(group))
+    return grid, group, member
+
+
+def lag_statistic(x, y):
+    """
+    Sinn: Spearman rho aller Lags für permutierte Teichdaten (für permutation_test)
+
+    Parameter:
+    ---------------------------------------
+
+    x: np.ndarray
+        permutierte Teichdaten (Permutationen, Proben, Teichvariablen)
+
+    y: np.ndarray
+        Wetterwerte (Lags, Proben, Wettervariablen), siehe Lagkorrelation.lagged_weather
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Permutationen, Lags, Teichvariablen, Wettervariablen)
+    """
+    x = x.transpose(0, 2, 1)[:, None, :, None, :]
+    y = y.transpose(0, 2, 1)[None, :, None, :, :]
+    return correlation_tensor(x, y)[0]
+
+
+def matrix_statistic(x, y, method="spearman"):
+    """
+    Sinn: Korrelationsmatrix zwischen permutierten und festen Daten (für permutation_test)
+
+    Parameter:
+    ---------------------------------------
+
+    x: np.ndarray
+        permutierte Daten (Permutationen, Proben, Variablen)
+
+    y: np.ndarray
+        feste Daten (Proben, Variablen)
+
+    method: str, optional
+        "pearson" oder "spearman"
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Permutationen, Variablen, Variablen)
+    """
+    x = x.transpose(0, 2, 1)[:, :, None, :]
+    y = y.T[None, None, :, :]
+    if method == "spearman":
+        return correlation_tensor(x, y)[0]
+    if method != "pearson":
+        raise ValueError(f"Unbekannte method: {method}")
+    # pearson mit paarweise gültigen proben
+    valid = np.isfinite(x) & np.isfinite(y)
+    n = valid.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.where(valid, x - np.where(valid, x, 0.0).sum(axis=-1, keepdims=True) / n[..., None], 0.0)
+        dy = np.where(valid, y - np.where(valid, y, 0.0).sum(axis=-1, keepdims=True) / n[..., None], 0.0)
+        r = (dx * dy).sum(axis=-1) / np.sqrt((dx ** 2).sum(axis=-1) * (dy ** 2).sum(axis=-1))
+    r[n < 2] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _init_worker(statistic, x, y, observed, block, layout):
+    global _worker_data
+    _worker_data = (statistic, x, y, observed, block, layout)
+
+
+def _count_chunk(args):
+    n_perm, seed, start = args
+    statistic, x, y, observed, block, (grid, group, member) = _worker_data
+    if seed is None:
+        # exakt: ausschnitt aus allen blockreihenfolgen
+        perm = exact_block_permutations(len(grid), block)[start:start + n_perm]
+    else:
+        perm = block_permutations(len(grid), block, n_perm, np.random.default_rng(seed))
+    # jede zeile bekommt die zeile desselben mitglieds am vertauschten zeitpunkt;
+    # fehlt die (-1), zeigt der index auf die angehängte NaN zeile
+    idx = grid[perm[:, group], member]
+    x = np.concatenate([x, np.full((1,) + x.shape[1:], np.nan)])
+    null = statistic(x[idx], y)
+    # zweiseitig: wie oft ist |r| unter H0 mindestens so groß wie beobachtet
+    with np.errstate(invalid="ignore"):
+        exceed = np.abs(null) >= np.abs(observed) - 1e-12
+    return exceed.sum(axis=0), np.isfinite(null).sum(axis=0)
+
+
+def permutation_test(statistic, x, y, observed, n_perm=999, block=None, seed=0, workers=None, chunk=50,
+                     groups=None, members=None):
+    """
+    Sinn: Block-Permutationstest für alle Zellen auf einmal; die Permutationen laufen in Blöcken
+    auf einem Prozesspool, die Seeds werden reproduzierbar aus seed abgeleitet
+    (gleiches Ergebnis unabhängig von der Anzahl Prozesse). Gibt es höchstens n_perm verschiedene
+    Blockreihenfolgen, werden alle genau einmal ausgewertet (exakter Test, siehe min_p_value).
+    Mit groups werden ganze Zeitpunkte (z.B. AP und SP eines Probentags) zusammen vertauscht und
+    die Blöcke in Zeitpunkten gemessen
+
+    Parameter:
+    ---------------------------------------
+
+    statistic: function
+        lag_statistic oder matrix_statistic (mit functools.partial für method)
+
+    x: np.ndarray
+        Daten die permutiert werden (Proben in zeitlicher Reihenfolge, Variablen)
+
+    y: np.ndarray
+        feste Daten für statistic
+
+    observed: np.ndarray
+        beobachtete Statistik (gleiche Form wie statistic ohne die Permutationsachse)
+
+    n_perm: int, optional
+        Anzahl Permutationen (obergrenze für den exakten Test)
+
+    block: int, optional
+        Blocklänge in Zeitpunkten; standardmäßig default_block
+
+    seed: int, optional
+        Basis Seed
+
+    workers: int, optional
+        Anzahl Prozesse; 1 = ohne Pool
+
+    chunk: int, optional
+        Permutationen pro Aufgabe (begrenzt den Speicher pro Prozess)
+
+    groups: np.ndarray, optional
+        Zeitpunkt pro Zeile von x (z.B. Datum); None = jede Zeile ist ein Zeitpunkt
+
+    members: np.ndarray, optional
+        Mitglied pro Zeile (z.B. Ort); an einem vertauschten Zeitpunkt bekommt jede Zeile die
+        Zeile desselben Mitglieds, fehlt sie, wird NaN eingesetzt
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit den p-Werten (1 + Treffer) / (1 + gültige Permutationen), beim exakten Test
+    Treffer / gültige Permutationen (die Identität ist schon dabei)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    observed = np.asarray(observed, dtype=np.float64)
+    layout = group_layout(groups, members, len(x))
+    n_times = len(layout[0])
+    if block is None:
+        block = default_block(n_times)
+
+    exact = is_exact(n_times, block, n_perm)
+    if exact:
+        count = factorial(-(-n_times // block))
+        tasks = [(min(chunk, count - i), None, i) for i in range(0, count, chunk)]
+    else:
+        sizes = [min(chunk, n_perm - i) for i in range(0, n_perm, chunk)]
+        seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(sizes))]
+        tasks = [(size, s, 0) for size, s in zip(sizes, seeds)]
+    if workers == 1 or len(tasks) == 1:
+        _init_worker(statistic, x, y, observed, block, layout)
+        results = [_count_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(statistic, x, y, observed, block, layout)) as pool:
+            results = list(pool.map(_count_chunk, tasks))
+
+    exceed = sum(r[0] for r in results)
+    total = sum(r[1] for r in results)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = exceed / total if exact else (1.0 + exceed) / (1.0 + total)
+    p[~np.isfinite(observed)] = np.nan
+    return p
+
+
+def benjamini_hochberg(p, mask=None):
+    """
+    Sinn: Benjamini-Hochberg (FDR) adjustierte p-Werte über alle gültigen Zellen
+
+    Parameter:
+    ---------------------------------------
+
+    p: np.ndarray
+        p-Werte beliebiger Form, NaN werden ignoriert
+
+    mask: np.ndarray, optional
+        bool Maske welche Zellen zur Testfamilie gehören (z.B. nur das untere Dreieck)
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray gleicher Form, NaN außerhalb der Familie
+    """
+    p = np.asarray(p, dtype=np.float64)
+    family = np.isfinite(p) if mask is None else np.isfinite(p) & mask
+    values = p[family]
+    m = len(values)
+    adjusted = np.full(p.shape, np.nan)
+    if m == 0:
+        return adjusted
+
+    order = np.argsort(values)
+    ranked = values[order] * m / np.arange(1, m + 1)
+    # monotonie von hinten erzwingen
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty(m)
+    out[order] = np.minimum(ranked, 1.0)
+    adjusted[family] = out
+    return adjusted
@@ -0,0 +1,435 @@
+# Skript: Einlesen der stündlichen Klimastationsdaten (Uniwald Caldern) in Blöcken mit binärem Sidecar
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# datenordner, lässt sich über DATA_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+
+# spalten die die skripte brauchen
+station_columns = ["Ta_2m", "Huma_2m", "rad_net", "PCP"]
+
+# spalten die beim aggregieren summiert werden (alles andere wird gemittelt)
+sum_columns = ["PCP"]
+
+# länge eines tages in ns (zeitindex im sidecar)
+day_ns = 86_400 * 10**9
+
+# bytes vor dem gelesenen ende, mit denen geprüft wird ob die datei nur angehängt wurde
+check_bytes = 1 << 16
+
+
+def sidecar_dir(csv_path):
+    """
+    Sinn: Ordner des binären Sidecars neben der .csv Datei
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str
+        Pfad zur .csv Datei
+
+    Ergebnis:
+    ---------------------------------------
+    Pfad zum Ordner
+    """
+    return os.path.splitext(csv_path)[0] + "_sidecar"
+
+
+def _tail_hash(csv_path, offset):
+    with open(csv_path, "rb") as f:
+        f.seek(max(offset - check_bytes, 0))
+        return hashlib.sha256(f.read(min(offset, check_bytes))).hexdigest()
+
+
+def _parse_chunks(reader, columns):
+    # datetime als int64 (ns), werte als float64; jeder block wird sofort klein gemacht
+    for chunk in reader:
+        times = pd.to_datetime(chunk["datetime"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        yield times, chunk[columns].to_numpy(dtype=np.float64)
+
+
+def _append(folder, columns, times, values):
+    with open(os.path.join(folder, "datetime.i8"), "ab") as f:
+        f.write(np.ascontiguousarray(times).tobytes())
+    for k, col in enumerate(columns):
+        with open(os.path.join(folder, f"{col}.f8"), "ab") as f:
+            f.write(np.ascontiguousarray(values[:, k]).tobytes())
+
+
+def _sort_sidecar(folder, columns):
+    # nur nötig wenn die .csv nicht zeitlich sortiert ist
+    times = np.fromfile(os.path.join(folder, "datetime.i8"), dtype=np.int64)
+    if np.all(times[1:] >= times[:-1]):
+        return
+    order = np.argsort(times, kind="stable")
+    times[order].tofile(os.path.join(folder, "datetime.i8"))
+    for col in columns:
+        file = os.path.join(folder, f"{col}.f8")
+        np.fromfile(file, dtype=np.float64)[order].tofile(file)
+
+
+def build_sidecar(csv_path, columns=station_columns, chunksize=100_000):
+    """
+    Sinn: Liest die .csv in Blöcken (nur datetime und columns) und schreibt ein binäres Sidecar
+    mit sortiertem Zeitindex; wurde die .csv seit dem letzten Mal nur verlängert, werden nur
+    die neuen Zeilen gelesen und angehängt
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str
+        Pfad zur .csv Datei
+
+    columns: list, optional
+        Spalten die ins Sidecar kommen
+
+    chunksize: int, optional
+        Zeilen pro Block
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit den Metadaten des Sidecars
+    """
+    folder = sidecar_dir(csv_path)
+    meta_path = os.path.join(folder, "meta.json")
+    stat = os.stat(csv_path)
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+
+    # aktuell, nichts zu tun
+    if (meta is not None and meta["size"] == stat.st_size and meta["mtime"] == stat.st_mtime
+            and set(columns) <= set(meta["columns"])):
+        return meta
+
+    # nur angehängt? dann ab dem alten ende weiterlesen
+    appended = (meta is not None and set(columns) <= set(meta["columns"])
+                and meta["offset"] is not None and stat.st_size > meta["offset"]
+                and _tail_hash(csv_path, meta["offset"]) == meta["tail_hash"])
+    if appended:
+        columns = meta["columns"]
+        with open(csv_path, "rb") as f:
+            f.seek(meta["offset"])
+            reader = pd.read_csv(f, header=None, names=meta["header"], usecols=["datetime"] + columns,
+                                 chunksize=chunksize)
+            last = meta["last_time"]
+            for times, values in _parse_chunks(reader, columns):
+                _append(folder, columns, times, values)
+                if len(times):
+                    # ältere zeilen mitten drin -> am ende neu sortieren
+                    meta["sorted"] = bool(meta["sorted"] and times[0] >= last and np.all(np.diff(times) >= 0))
+                    last = int(times[-1])
+                meta["rows"] += len(times)
+        meta["last_time"] = last
+    else:
+        # komplett neu (auch wenn neue spalten dazukommen)
+        if meta is not None:
+            columns = list(dict.fromkeys(meta["columns"] + list(columns)))
+        os.makedirs(folder, exist_ok=True)
+        for file in os.listdir(folder):
+            os.remove(os.path.join(folder, file))
+        header = list(pd.read_csv(csv_path, nrows=0).columns)
+        # generation zählt hoch wenn sich schon gelesene zeilen ändern können (für die aggregate)
+        generation = meta.get("generation", 0) + 1 if meta is not None else 0
+        meta = {"header": header, "columns": list(columns), "rows": 0, "sorted": True,
+                "last_time": np.iinfo(np.int64).min, "generation": generation}
+        reader = pd.read_csv(csv_path, usecols=["datetime"] + list(columns), chunksize=chunksize)
+        for times, values in _parse_chunks(reader, columns):
+            _append(folder, columns, times, values)
+            if len(times):
+                meta["sorted"] = bool(meta["sorted"] and times[0] >= meta["last_time"]
+                                      and np.all(np.diff(times) >= 0))
+                meta["last_time"] = int(times[-1])
+            meta["rows"] += len(times)
+
+    if not meta["sorted"]:
+        _sort_sidecar(folder, meta["columns"])
+        meta["sorted"] = True
+        meta["generation"] = meta.get("generation", 0) + 1
+        meta["last_time"] = int(np.fromfile(os.path.join(folder, "datetime.i8"), dtype=np.int64).max())
+
+    # weiterlesen ist nur sicher wenn die datei mit einem zeilenende aufhört
+    with open(csv_path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        complete = f.read(1) == b"\n"
+    meta.update({"size": stat.st_size, "mtime": stat.st_mtime,
+                 "offset": stat.st_size if complete else None,
+                 "tail_hash": _tail_hash(csv_path, stat.st_size) if complete else None})
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+def read_station(csv_path=None, columns=station_columns, start=None, end=None, sidecar=True, chunksize=100_000):
+    """
+    Sinn: Stationsdaten für ein Zeitfenster; mit Sidecar wird nur der angefragte Bereich
+    aus den memory-mapped Binärdateien gelesen, ohne Sidecar wird die .csv in Blöcken
+    gestreamt und jeder Block sofort auf Spalten und Zeitfenster reduziert
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str, optional
+        Pfad zur .csv Datei; standardmäßig Hourly_Wiese_Klimastation.csv im Datenordner
+
+    columns: list, optional
+        Spalten (ohne datetime)
+
+    start, end: str oder pd.Timestamp, optional
+        Zeitfenster (beide Grenzen inklusive)
+
+    sidecar: bool, optional
+        Sidecar benutzen (und bei Bedarf bauen/aktualisieren)
+
+    chunksize: int, optional
+        Zeilen pro Block beim Lesen der .csv
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit datetime und columns, zeitlich sortiert
+    """
+    if csv_path is None:
+        csv_path = f"{path}/Hourly_Wiese_Klimastation.csv"
+    columns = list(columns)
+    lo = np.iinfo(np.int64).min if start is None else pd.Timestamp(start).value
+    hi = np.iinfo(np.int64).max if end is None else pd.Timestamp(end).value
+
+    if not sidecar:
+        parts = []
+        for chunk in pd.read_csv(csv_path, usecols=["datetime"] + columns, chunksize=chunksize):
+            chunk["datetime"] = pd.to_datetime(chunk["datetime"])
+            times = chunk["datetime"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            parts.append(chunk.loc[(times >= lo) & (times <= hi), ["datetime"] + columns])
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["datetime"] + columns)
+        return df.sort_values("datetime", kind="stable").reset_index(drop=True)
+
+    meta = build_sidecar(csv_path, columns, chunksize)
+    folder = sidecar_dir(csv_path)
+    n = meta["rows"]
+    if n == 0:
+        return pd.DataFrame({"datetime": pd.Series(dtype="datetime64[ns]"),
+                             **{col: pd.Series(dtype=np.float64) for col in columns}})
+
+    # binäre suche im sortierten zeitindex, dann nur diesen bereich kopieren
+    times = np.memmap(os.path.join(folder, "datetime.i8"), dtype=np.int64, mode="r", shape=(n,))
+    i0 = int(np.searchsorted(times, lo, side="left"))
+    i1 = int(np.searchsorted(times, hi, side="right"))
+    df = pd.DataFrame({"datetime": np.array(times[i0:i1]).view("datetime64[ns]")})
+    for col in columns:
+        values = np.memmap(os.path.join(folder, f"{col}.f8"), dtype=np.float64, mode="r", shape=(n,))
+        df[col] = np.array(values[i0:i1])
+    return df
+
+
+def _bins(times, freq):
+    # tage seit 1970-01-01; wochen beginnen montags (1970-01-01 war ein donnerstag)
+    days = times // day_ns
+    if freq == "D":
+        return days
+    if freq == "W":
+        return (days + 3) // 7
+    raise ValueError(f"Unbekannte freq: {freq} (nur 'D' oder 'W')")
+
+
+def _bin_start(bins, freq):
+    return (bins if freq == "D" else bins * 7 - 3) * day_ns
+
+
+def _aggregate_rows(folder, n, columns, start_row, freq):
+    # summe und anzahl gültiger stunden pro periode, für alle spalten mit bincount
+    times = np.memmap(os.path.join(folder, "datetime.i8"), dtype=np.int64, mode="r", shape=(n,))[start_row:]
+    bins = _bins(np.asarray(times), freq)
+    first = int(bins[0])
+    code = bins - first
+    n_bins = int(code[-1]) + 1
+    sums = np.zeros((n_bins, len(columns)))
+    counts = np.zeros((n_bins, len(columns)), dtype=np.int64)
+    for k, col in enumerate(columns):
+        values = np.asarray(np.memmap(os.path.join(folder, f"{col}.f8"), dtype=np.float64,
+                                      mode="r", shape=(n,))[start_row:])
+        valid = ~np.isnan(values)
+        sums[:, k] = np.bincount(code[valid], weights=values[valid], minlength=n_bins)
+        counts[:, k] = np.bincount(code[valid], minlength=n_bins)
+    return np.arange(first, first + n_bins), sums, counts
+
+
+def update_aggregate(csv_path=None, freq="D", columns=station_columns):
+    """
+    Sinn: Hält Summen und Stundenanzahl pro Tag oder Woche als binären Speicher neben dem Sidecar;
+    über einen Wasserstand (gelesene Zeilen des Sidecars) werden nach dem Anhängen neuer
+    Stunden nur die betroffenen Perioden neu berechnet
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str, optional
+        Pfad zur stündlichen .csv Datei; standardmäßig Hourly_Wiese_Klimastation.csv
+
+    freq: str, optional
+        "D" (Tage) oder "W" (Wochen ab Montag)
+
+    columns: list, optional
+        Spalten
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (bins, sums, counts) mit den Periodennummern und den Summen/Anzahlen (Perioden × Spalten)
+    """
+    if csv_path is None:
+        csv_path = f"{path}/Hourly_Wiese_Klimastation.csv"
+    requested = list(columns)
+    store = os.path.join(sidecar_dir(csv_path), f"aggregate_{freq}.npz")
+
+    old = None
+    columns = requested
+    if os.path.exists(store):
+        with np.load(store) as f:
+            old = {key: f[key] for key in f.files}
+        # der speicher hält alle bisher angefragten spalten, eine kleinere auswahl ist nur ein
+        # ausschnitt (sonst rechnen abwechselnde aufrufe mit verschiedenen spalten alles neu)
+        columns = list(dict.fromkeys([str(c) for c in old["columns"]] + requested))
+    meta = build_sidecar(csv_path, columns)
+    folder = sidecar_dir(csv_path)
+    n = meta["rows"]
+    generation = meta.get("generation", 0)
+    pick = [columns.index(c) for c in requested]
+
+    if old is not None:
+        # nur weiterverwenden wenn das sidecar seitdem nur verlängert wurde
+        if (int(old["generation"]) != generation or list(old["columns"]) != columns
+                or int(old["watermark"]) > n):
+            old = None
+    if old is not None and int(old["watermark"]) == n:
+        return old["bins"], old["sums"][:, pick], old["counts"][:, pick]
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(pick))), np.zeros((0, len(pick)), dtype=np.int64)
+
+    if old is None or len(old["bins"]) == 0:
+        start_row, keep = 0, 0
+    else:
+        # erste neue stunde -> ab dem beginn ihrer periode neu rechnen
+        times = np.memmap(os.path.join(folder, "datetime.i8"), dtype=np.int64, mode="r", shape=(n,))
+        first_bin = int(_bins(np.asarray(times[int(old["watermark"]):int(old["watermark"]) + 1]), freq)[0])
+        start_row = int(np.searchsorted(times, _bin_start(first_bin, freq), side="left"))
+        keep = int(np.searchsorted(old["bins"], first_bin, side="left"))
+
+    bins, sums, counts = _aggregate_rows(folder, n, columns, start_row, freq)
+    if keep:
+        # lücke zwischen alten und neuen perioden (tage ohne messungen) mit leeren perioden füllen
+        gap = np.arange(old["bins"][keep - 1] + 1, bins[0])
+        bins = np.concatenate([old["bins"][:keep], gap, bins])
+        sums = np.concatenate([old["sums"][:keep], np.zeros((len(gap), len(columns))), sums])
+        counts = np.concatenate([old["counts"][:keep], np.zeros((len(gap), len(columns)), dtype=np.int64), counts])
+
+    np.savez(store, bins=bins, sums=sums, counts=counts, columns=np.asarray(columns, dtype=str),
+             watermark=n, generation=generation)
+    return bins, sums[:, pick], counts[:, pick]
+
+
+def numeric_columns(csv_path=None, nrows=1000):
+    """
+    Sinn: Alle numerischen Spalten der stündlichen .csv (ohne datetime), z.B. für den Tagesexport
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str, optional
+        Pfad zur stündlichen .csv Datei; standardmäßig Hourly_Wiese_Klimastation.csv
+
+    nrows: int, optional
+        Anzahl Zeilen, aus denen die Datentypen bestimmt werden
+
+    Ergebnis:
+    ---------------------------------------
+    list mit Spaltennamen
+    """
+    if csv_path is None:
+        csv_path = f"{path}/Hourly_Wiese_Klimastation.csv"
+    head = pd.read_csv(csv_path, nrows=nrows)
+    return [col for col in head.select_dtypes("number").columns if col != "datetime"]
+
+
+def station_aggregate(csv_path=None, freq="D", columns=station_columns, start=None, end=None):
+    """
+    Sinn: Tages- oder Wochenwerte der Station (Niederschlag als Summe, alles andere als Mittelwert)
+    aus dem inkrementell aktualisierten Speicher statt resample über alle Stunden
+
+    Parameter:
+    ---------------------------------------
+
+    csv_path: str, optional
+        Pfad zur stündlichen .csv Datei; standardmäßig Hourly_Wiese_Klimastation.csv
+
+    freq: str, optional
+        "D" (Tage) oder "W" (Wochen ab Montag, datetime = Montag)
+
+    columns: list, optional
+        Spalten
+
+    start, end: str oder pd.Timestamp, optional
+        Zeitfenster für den Periodenbeginn (beide Grenzen inklusive)
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit datetime (Beginn der Periode) und columns, wie resample(...).agg(...)
+    """
+    columns = list(columns)
+    bins, sums, counts = update_aggregate(csv_path, freq, columns)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = np.where(np.isin(columns, sum_columns), sums, sums / counts)
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(0, "datetime", _bin_start(bins, freq).astype("datetime64[ns]"))
+    if start is not None:
+        df = df.loc[df["datetime"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df.loc[df["datetime"] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def interval_aggregate(dates, csv_path=None, columns=station_columns):
+    """
+    Sinn: Stationswerte zwischen zwei Probenahmen (Tage nach der letzten bis einschließlich
+    der aktuellen Probenahme) aus den Tageswerten über kumulative Summen
+
+    Parameter:
+    ---------------------------------------
+
+    dates: list oder pd.Series
+        Probenahmetermine
+
+    csv_path: str, optional
+        Pfad zur stündlichen .csv Datei; standardmäßig Hourly_Wiese_Klimastation.csv
+
+    columns: list, optional
+        Spalten
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Datum, Beginn des Intervalls und columns (erstes Intervall: nur der Probentag)
+    """
+    columns = list(columns)
+    bins, sums, counts = update_aggregate(csv_path, "D", columns)
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize().drop_duplicates().sort_values()
+    days = dates.to_numpy(dtype="datetime64[ns]").view(np.int64) // day_ns
+    start_days = np.r_[days[0], days[:-1] + 1]
+
+    # kumulative summen über die tage -> jedes intervall ist eine differenz
+    cum_sums = np.vstack([np.zeros(len(columns)), np.cumsum(sums, axis=0)])
+    cum_counts = np.vstack([np.zeros(len(columns)), np.cumsum(counts, axis=0)])
+    lo = np.clip(start_days - bins[0], 0, len(bins)) if len(bins) else np.zeros(len(days), dtype=np.int64)
+    hi = np.clip(days - bins[0] + 1, 0, len(bins)) if len(bins) else np.zeros(len(days), dtype=np.int64)
+    s = cum_sums[hi] - cum_sums[lo]
+    c = cum_counts[hi] - cum_counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = np.where(np.isin(columns, sum_columns), s, s / c)
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(0, "Beginn", (start_days * day_ns).astype("datetime64[ns]"))
+    df.insert(0, "Datum", dates.to_numpy())
+    return df
@@ -0,0 +1,139 @@
+# Skript: Maskierung und Interpolation der Rayleigh- und Raman-Streuung in den RF-6000 EEMs
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from functools import lru_cache
+import numpy as np
+from EEM import EEMCube
+
+# raman verschiebung von wasser (O-H Streckschwingung) in 1/cm
+raman_shift = 3400.0
+
+# halbe breite der masken in nm (1. und 2. ordnung)
+rayleigh_width = (12.0, 20.0)
+raman_width = (10.0, 15.0)
+
+
+def raman_wavelength(ex):
+    """
+    Sinn: EM Wellenlänge der Raman Streuung von Wasser erster Ordnung
+
+    Parameter:
+    ---------------------------------------
+
+    ex: np.ndarray
+        EX Wellenlängen in nm
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit den Raman Wellenlängen in nm
+    """
+    return 1e7 / (1e7 / np.asarray(ex, dtype=np.float64) - raman_shift)
+
+
+@lru_cache(maxsize=16)
+def _scatter_plan(ex_key, em_key, rayleigh, raman, zero_below):
+    ex = np.frombuffer(ex_key, dtype=np.float64)[:, None]
+    em = np.frombuffer(em_key, dtype=np.float64)[None, :]
+    raman_em = raman_wavelength(ex)
+
+    # streubanden 1. und 2. ordnung
+    mask = ((np.abs(em - ex) <= rayleigh[0]) | (np.abs(em - 2 * ex) <= rayleigh[1])
+            | (np.abs(em - raman_em) <= raman[0]) | (np.abs(em - 2 * raman_em) <= raman[1]))
+    # unterhalb der anregung gibt es keine fluoreszenz
+    below = (em < ex - rayleigh[0]) if zero_below else np.zeros(mask.shape, dtype=bool)
+    mask &= ~below
+
+    # für jede maskierte zelle die nächste gültige zelle links und rechts (gleiche EX zeile)
+    n_em = mask.shape[1]
+    cols = np.arange(n_em)
+    known = ~mask
+    left = np.where(known, cols, -1)
+    left = np.maximum.accumulate(left, axis=1)
+    right = np.where(known, cols, n_em)
+    right = np.minimum.accumulate(right[:, ::-1], axis=1)[:, ::-1]
+
+    rows, cells = np.nonzero(mask)
+    l, r = left[rows, cells], right[rows, cells]
+    has_l, has_r = l >= 0, r < n_em
+    # gewichte der linearen interpolation; am rand wird der nächste wert übernommen
+    span = np.where(has_l & has_r, r - l, 1)
+    w_r = np.where(has_l & has_r, (cells - l) / span, np.where(has_r, 1.0, 0.0))
+    w_l = np.where(has_l & has_r, 1.0 - w_r, np.where(has_l, 1.0, 0.0))
+    # zellen ohne gültige nachbarn bleiben NaN
+    w_l[~has_l & ~has_r] = np.nan
+    l, r = np.clip(l, 0, n_em - 1), np.clip(r, 0, n_em - 1)
+
+    plan = {"mask": mask, "below": below, "rows": rows, "cols": cells,
+            "left": l, "right": r, "w_left": w_l.astype(np.float32), "w_right": w_r.astype(np.float32)}
+    for value in plan.values():
+        value.setflags(write=False)
+    return plan
+
+
+def scatter_plan(ex, em, rayleigh=rayleigh_width, raman=raman_width, zero_below=True):
+    """
+    Sinn: Streumasken und Interpolationsgewichte für ein EX/EM Raster; wird pro Raster und
+    Maskenbreite nur einmal berechnet und danach aus dem Cache genommen
+
+    Parameter:
+    ---------------------------------------
+
+    ex, em: np.ndarray
+        EX und EM Achsen
+
+    rayleigh: tuple, optional
+        halbe Breite der Rayleigh Maske (1. Ordnung, 2. Ordnung) in nm
+
+    raman: tuple, optional
+        halbe Breite der Raman Maske (1. Ordnung, 2. Ordnung) in nm
+
+    zero_below: bool, optional
+        Bereich EM < EX auf 0 setzen
+
+    Ergebnis:
+    ---------------------------------------
+    dict mit Maske ("mask", "below") und den Indizes/Gewichten für die Interpolation
+    """
+    return _scatter_plan(np.asarray(ex, dtype=np.float64).tobytes(),
+                         np.asarray(em, dtype=np.float64).tobytes(),
+                         tuple(rayleigh), tuple(raman), zero_below)
+
+
+def remove_scatter(cube, rayleigh=rayleigh_width, raman=raman_width, zero_below=True, mode="interpolate"):
+    """
+    Sinn: Entfernt die Rayleigh- und Raman-Streuung aus allen Proben auf einmal
+
+    Parameter:
+    ---------------------------------------
+
+    cube: EEM.EEMCube
+        Würfel mit allen Proben
+
+    rayleigh, raman: tuple, optional
+        halbe Breiten der Masken (1. Ordnung, 2. Ordnung) in nm
+
+    zero_below: bool, optional
+        Bereich EM < EX auf 0 setzen
+
+    mode: str, optional
+        "interpolate" (linear entlang EM) oder "nan" (nur maskieren)
+
+    Ergebnis:
+    ---------------------------------------
+    neuer EEMCube ohne Streubanden
+    """
+    if mode not in ("interpolate", "nan"):
+        raise ValueError(f"Unbekannter mode: {mode}")
+    plan = scatter_plan(cube.ex, cube.em, rayleigh, raman, zero_below)
+    rows, cols = plan["rows"], plan["cols"]
+
+    data = cube.data.copy()
+    if mode == "nan":
+        data[:, rows, cols] = np.nan
+    else:
+        # eine broadcast operation für alle proben und alle maskierten zellen
+        data[:, rows, cols] = (plan["w_left"] * cube.data[:, rows, plan["left"]]
+                               + plan["w_right"] * cube.data[:, rows, plan["right"]])
+    data[:, plan["below"]] = 0.0
+    return EEMCube(data, cube.ex, cube.em, cube.samples)
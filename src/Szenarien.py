@@ -0,0 +1,180 @@
+# Skript: Sensitivität der Korrelations-, Lag- und Bufferauswertung gegenüber der Ersetzung zensierter Werte
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from Zensierung import substitute, rules, censored_columns
+from Korrelation import correlation_matrix, choose_method
+from Lagkorrelation import lag_correlation
+
+# daten für die worker prozesse (wird einmal pro prozess gesetzt, nicht pro start)
+_worker_data = None
+
+# variablen wie in Nitrat_Phosphor.py
+pond_vars = ["Nitrat", "Phosphor", "NPOC", "Temp", "LF", "PPM", "pH"]
+weather_vars = ["Ta_2m", "PCP"]
+
+
+def pond_averages(df):
+    """
+    Sinn: Mittelwert der Replikate pro Datum und Ort (AP, SP) wie df_avg_full in Nitrat_Phosphor.py
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen mit ersetzten Werten (Zensierung.substitute)
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Datum, Ort und pond_vars
+    """
+    return (df.groupby(["Datum", df["Probe"].str[:2]])[pond_vars]
+            .mean()
+            .reset_index()
+            .rename(columns={"Probe": "Ort"}))
+
+
+def buffer_effect(df, columns=censored_columns):
+    """
+    Sinn: Rückhaltewirkung (AP - SP) / AP * 100 pro Datum wie in Bufferwirkung.py
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen mit ersetzten Werten
+
+    columns: list, optional
+        Variablen
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Datum als Index und einer Spalte pro Variable
+    """
+    means = df.groupby(["Datum", df["Probe"].str[:2]])[list(columns)].mean().unstack("Probe")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({col: (means[(col, "AP")] - means[(col, "SP")]) / means[(col, "AP")] * 100
+                             for col in columns})
+
+
+def scenario_table(df, weather, lags, columns=censored_columns, min_n=5):
+    """
+    Sinn: Alle Kennzahlen einer Ersetzungsregel in einer langen Tabelle (nur Kennzahlen, die eine
+    zensierte Variable enthalten; alles andere ändert sich zwischen den Regeln nicht)
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen mit ersetzten Werten
+
+    weather: pd.DataFrame
+        tägliche Wetterdaten (datetime, weather_vars)
+
+    lags: list
+        Lags in Tagen
+
+    columns: list, optional
+        zensierte Variablen
+
+    min_n: int, optional
+        Mindestanzahl Probentage für den besten Lag (am Rand der Lags bleiben sonst nur 2-3 Paare
+        mit |rho| = 1 übrig)
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Analyse, Kennzahl und Wert
+    """
+    rows = []
+    avg = pond_averages(df)
+
+    # korrelationsmatrix mit der methode die der shapiro-wilk test für diese regel auswählt
+    method, _ = choose_method(avg[pond_vars])
+    corr, pval, _ = correlation_matrix(avg[pond_vars], method=method)
+    rows.append(("Korrelation", "Methode", method))
+    for i, a in enumerate(pond_vars):
+        for b in pond_vars[:i]:
+            if a in columns or b in columns:
+                rows.append(("Korrelation", f"rho {b} ~ {a}", corr.loc[a, b]))
+                rows.append(("Korrelation", f"p {b} ~ {a}", pval.loc[a, b]))
+
+    # lag mit dem größten |rho| pro zensierter variable und wettervariable
+    rho, _, n_lag = lag_correlation(avg, weather, pond_vars, weather_vars, lags)
+    rho = np.where(n_lag >= min_n, rho, np.nan)
+    for p, pvar in enumerate(pond_vars):
+        if pvar not in columns:
+            continue
+        for w, wvar in enumerate(weather_vars):
+            r = rho[:, p, w]
+            if np.isfinite(r).any():
+                best = np.nanargmax(np.abs(r))
+                rows.append(("Lag", f"bester Lag {pvar} ~ {wvar}", lags[best]))
+                rows.append(("Lag", f"rho {pvar} ~ {wvar}", r[best]))
+
+    # bufferwirkung pro datum und im median
+    effect = buffer_effect(df, [c for c in columns if c in df])
+    for col in effect:
+        for datum, value in effect[col].dropna().items():
+            rows.append(("Bufferwirkung", f"{col} {datum:%d.%m.%Y} [%]", value))
+        rows.append(("Bufferwirkung", f"{col} Median [%]", effect[col].median()))
+    return pd.DataFrame(rows, columns=["Analyse", "Kennzahl", "Wert"])
+
+
+def _init_worker(df, weather, lags):
+    global _worker_data
+    _worker_data = (df, weather, lags)
+
+
+def _run_rule(rule):
+    df, weather, lags = _worker_data
+    return scenario_table(substitute(df, rule), weather, lags).assign(Regel=rule)
+
+
+def run_scenarios(df, weather, scenario_rules=rules, lags=range(-60, 61), workers=None):
+    """
+    Sinn: Die Auswertungen für mehrere Ersetzungsregeln (DL, DL/2, 0, ROS) parallel auf einem
+    Prozesspool rechnen und als Vergleichstabelle zurückgeben
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen mit Flags (Zensierung.read_measurements)
+
+    weather: pd.DataFrame
+        tägliche Wetterdaten (z.B. Stationsdaten.station_aggregate)
+
+    scenario_rules: list, optional
+        Ersetzungsregeln
+
+    lags: range oder list, optional
+        Lags in Tagen
+
+    workers: int, optional
+        Anzahl Prozesse; 1 = ohne Pool
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Analyse und Kennzahl als Index, einer Spalte pro Regel und der Spannweite
+    über die Regeln (nur für Zahlen)
+    """
+    lags = list(lags)
+    scenario_rules = list(scenario_rules)
+    if workers == 1 or len(scenario_rules) == 1:
+        _init_worker(df, weather, lags)
+        results = [_run_rule(rule) for rule in scenario_rules]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(df, weather, lags)) as pool:
+            results = list(pool.map(_run_rule, scenario_rules))
+
+    long = pd.concat(results, ignore_index=True)
+    table = long.pivot(index=["Analyse", "Kennzahl"], columns="Regel", values="Wert")
+    order = long[["Analyse", "Kennzahl"]].drop_duplicates()
+    table = table.reindex(index=pd.MultiIndex.from_frame(order), columns=scenario_rules)
+    numbers = table.apply(pd.to_numeric, errors="coerce")
+    table["Spannweite"] = numbers.max(axis=1) - numbers.min(axis=1)
+    return table
@@ -2,59 +2,43 @@
 # Autor: Marc Kevin Schneider
 # Datum: September 2025
 
+import os
+from glob import glob
 import pandas as pd
 import matplotlib.pyplot as plt
+from TOC_Einlesen import load_toc_files
 
-path = "/data/"
-path_plots = "/plots/"
+# pfade lassen sich über DATA_PATH / PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
 
 
-# .txt datei lesen (hab davor alle Werte, die nicht zu uns gehören einfach rausgelöscht)
-toc = pd.read_csv(f"{path}/TOC/2025_09_23.txt", sep=",")
+# alle unbearbeiteten TOC-L exporte (fremde proben, standards und fehlgeschlagene läufe fliegen
+# über das namensmuster und die QC regeln raus, nichts mehr von hand löschen)
+files = glob(f"{path}/TOC/*.txt")
 
-# alle unnötigen Spalten löschen
-toc = toc.drop(["Typ", "Unnamed: 19", "ProbenID", "Original", 
-                "Kal.Kurve", "Anmerk.", "Analyse(Inj.)"], axis=1)
+# QC: SD <= 0.1 mg/L oder CV <= 2 %, mind. 2 injektionen, max. 5 (sonst hat das gerät keine
+# stabile messung bekommen), höchstens ein eigener ausreißer pro lauf
+npoc, runs, injections = load_toc_files(files, max_cv=0.02, max_sd=0.1, min_injections=2,
+                                        max_injections=5, max_rejected=1)
 
-# sortieren
-toc = toc.sort_values(by=["Probenname"],ascending=True).reset_index(drop=True)
+# verworfene läufe anzeigen, damit man sieht was rausgeflogen ist
+print(runs.loc[runs["QC"] != "ok", ["Datei", "Probenname", "Messzeit", "Injektionen", "QC"]])
 
-# alle mit 0 in der Spalte Standardabweichung löschen (sind eh fehlerhaft)
-toc_filter = toc[toc["Std. Abw. Konz"] != 0]
-
-# alle doppelten Werte auch rauslöschen (behalte aber den ersten Wert aller Dopplungen, sonst löscht man alles lol)
-toc_filter = toc_filter.drop_duplicates(subset=["Std. Abw. Konz"], keep="first").reset_index(drop=True)
-
-# nerviges "NPOC:" vor dem eigentlichen Ergebnis entfernen
-toc_filter["Ergebnis"] = toc_filter["Ergebnis"].str.replace("NPOC:", "", regex=False)
-
-# lösche noch Zeile 17 da die Daten nicht in Ordnung aussehen
-toc_filter = toc_filter.drop(17, axis=0)
-
-# speichern
-toc_filter.to_csv(f"{path}/TOC/TOC_250923.csv", index=False)
+# speichern (eine zeile pro probe, plus alle läufe und injektionen zum nachvollziehen)
+npoc.to_csv(f"{path}/TOC/NPOC.csv", index=False)
+runs.to_csv(f"{path}/TOC/NPOC_Laeufe.csv", index=False)
+injections.to_csv(f"{path}/TOC/NPOC_Injektionen.csv", index=False)
 
 
 #########################################################
 
 # visualisierung
 
-toc_filter = pd.read_csv(f"{path}/TOC/TOC_250923.csv")
-
-# lösche fürs plotting die einheit raus
-toc_filter["Ergebnis_Wert"] = (
-    toc_filter["Ergebnis"]
-    .str.replace("mg/L", "", regex=False)
-    .astype(float)
-)
-
-# extrahiere den probennamen
-toc_filter["Datum"] = toc_filter["Probenname"].str.extract(r"_(\d{6})")[0]
-# zu datetime (dann kann man das als x-achse benutzen)
-toc_filter["Datum"] = pd.to_datetime(toc_filter["Datum"], format="%d%m%y")
+toc_filter = pd.read_csv(f"{path}/TOC/NPOC.csv", parse_dates=["Datum"])
 
-# extrahiere den gruppennamen der proben (also z.B. ap01, ap02, usw.)
-toc_filter["Gruppe"] = toc_filter["Probenname"].str.extract(r"(^[A-Z]+\d+)")[0]
+# gruppenname der proben (also z.B. ap01, ap02, usw.) kommt schon aus dem parser
+toc_filter["Gruppe"] = toc_filter["Probe"]
 
 # initialisiere plot
 plt.figure(figsize=(12, 6))
@@ -62,7 +46,7 @@ plt.figure(figsize=(12, 6))
 # plotte jeden wert in jeder gruppe und verbinde als liniengraphen
 for series, group in toc_filter.groupby("Gruppe"):
     group_sorted = group.sort_values("Datum")
-    plt.plot(group_sorted["Datum"], group_sorted["Ergebnis_Wert"], marker="o", label=series)
+    plt.plot(group_sorted["Datum"], group_sorted["NPOC"], marker="o", label=series)
 
 # für die achsenbeschriftungen usw. 
 plt.xlabel("Sample Date")
@@ -0,0 +1,184 @@
+# Skript: Einlesen kompletter TOC-L (LabSolutions) Exporte mit QC auf Injektionsebene
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+import numpy as np
+import pandas as pd
+from Probenregister import parse_names
+
+# unsere proben heißen z.B. AP01_270525 (ort + nummer _ ddmmyy), alles andere gehört nicht zu uns
+sample_pattern = r"^[A-Z]+\d+_\d{6}$"
+
+
+def read_toc_export(file_path, analysis="NPOC", sample_types=("Unbekannt",), name_pattern=sample_pattern):
+    """
+    Sinn: Liest einen unbearbeiteten TOC-L Export (eine Zeile pro Injektion) und nummeriert die Läufe;
+    ein neuer Lauf beginnt wenn Probenname oder Prb. Nr. wechselt oder Inj. Nr. wieder bei 1 anfängt
+    (Wiederholungsmessungen derselben Probe werden so nicht vermischt)
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur .txt Datei
+
+    analysis: str, optional
+        Analyse in der Spalte Anal.
+
+    sample_types: tuple, optional
+        Werte der Spalte Typ die behalten werden (Standards und Blanks raus)
+
+    name_pattern: str, optional
+        Regex für die eigenen Probennamen, None = alle
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Datei, Lauf, Probenname, Prb. Nr., Inj. Nr., Messzeit, Flaeche, Konz. und Ausgeschl.
+    """
+    raw = pd.read_csv(file_path, sep=",", dtype={"Probenname": str})
+    raw = raw.loc[:, ~raw.columns.str.startswith("Unnamed")]
+
+    # läufe auf der ganzen datei nummerieren (vor dem filtern, sonst verschmelzen getrennte läufe)
+    name = raw["Probenname"].fillna("")
+    new_run = (name != name.shift()) | (raw["Prb. Nr."] != raw["Prb. Nr."].shift()) | (raw["Inj. Nr."] == 1)
+
+    keep = (raw["Anal."] == analysis) & raw["Typ"].isin(sample_types)
+    if name_pattern is not None:
+        keep &= name.str.match(name_pattern)
+
+    return pd.DataFrame({
+        "Datei": os.path.basename(file_path.replace("\\", "/")),
+        "Lauf": new_run.cumsum().to_numpy(),
+        "Probenname": name,
+        "Prb. Nr.": raw["Prb. Nr."],
+        "Inj. Nr.": raw["Inj. Nr."],
+        "Messzeit": pd.to_datetime(raw["Datum / Uhrzeit"], format="%d/%m/%Y %H:%M:%S"),
+        "Flaeche": pd.to_numeric(raw["Flaeche"], errors="coerce"),
+        "Konz.": pd.to_numeric(raw["Konz."], errors="coerce"),
+        "Ausgeschl.": pd.to_numeric(raw["Ausgeschl."], errors="coerce").fillna(0).astype(int),
+    })[keep.to_numpy()].reset_index(drop=True)
+
+
+def toc_qc(injections, max_cv=0.02, max_sd=0.1, min_injections=2, max_injections=5, max_rejected=1,
+           instrument_exclusion=True):
+    """
+    Sinn: QC Regeln für alle Läufe auf einmal (bincount statt groupby().apply): Ausreißer werden
+    so lange verworfen (die Injektion mit der größten Abweichung vom Mittelwert) bis SD oder CV
+    passen; ein Lauf gilt wenn genug Injektionen übrig sind und das Gerät nicht zu oft nachmessen musste
+
+    Parameter:
+    ---------------------------------------
+
+    injections: pd.DataFrame
+        Injektionen aus read_toc_export
+
+    max_cv: float, optional
+        maximaler Variationskoeffizient (0.02 = 2 %)
+
+    max_sd: float, optional
+        maximale Standardabweichung in mg/L; ein Lauf passt wenn SD oder CV eingehalten wird
+
+    min_injections: int, optional
+        Mindestanzahl verwendeter Injektionen
+
+    max_injections: int, optional
+        maximale Anzahl Injektionen im Lauf (mehr = das Gerät hat keine stabile Messung bekommen)
+
+    max_rejected: int, optional
+        maximale Anzahl eigener Ausreißer pro Lauf
+
+    instrument_exclusion: bool, optional
+        vom Gerät ausgeschlossene Injektionen (Ausgeschl. != 0) nicht verwenden
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (injections mit Spalte Verwendet, pd.DataFrame mit einer Zeile pro Lauf)
+    """
+    runs = injections.groupby(["Datei", "Lauf"], sort=False)
+    codes = runs.ngroup().to_numpy()
+    n_runs = codes.max() + 1 if len(codes) else 0
+    x = injections["Konz."].to_numpy(dtype=np.float64)
+
+    used = np.isfinite(x)
+    if instrument_exclusion:
+        used &= injections["Ausgeschl."].to_numpy() == 0
+    n_total = np.bincount(codes, minlength=n_runs)
+
+    def run_stats(used):
+        n = np.bincount(codes, weights=used, minlength=n_runs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(codes, weights=np.where(used, x, 0.0), minlength=n_runs) / n
+            ss = np.bincount(codes, weights=np.where(used, (x - mean[codes]) ** 2, 0.0), minlength=n_runs)
+            sd = np.sqrt(ss / (n - 1))
+            cv = sd / mean
+        return n, mean, sd, cv
+
+    for _ in range(max_rejected):
+        n, mean, sd, cv = run_stats(used)
+        reject = ~((sd <= max_sd) | (cv <= max_cv)) & (n > min_injections)
+        if not reject.any():
+            break
+        # pro betroffenem lauf die injektion mit der größten abweichung (letzte nach lexsort)
+        dev = np.where(used & reject[codes], np.abs(x - mean[codes]), -1.0)
+        order = np.lexsort((dev, codes))
+        last = order[np.r_[codes[order][1:] != codes[order][:-1], True]]
+        used[last[dev[last] >= 0]] = False
+    n, mean, sd, cv = run_stats(used)
+
+    status = np.select(
+        [n_total > max_injections, n < min_injections, ~((sd <= max_sd) | (cv <= max_cv)), ~(mean > 0)],
+        ["zu viele Injektionen", "zu wenige Injektionen", "SD/CV zu hoch", "keine Konzentration"],
+        default="ok")
+
+    first = runs.head(1).set_index(codes[runs.head(1).index])
+    summary = pd.DataFrame({
+        "Datei": first["Datei"].to_numpy(),
+        "Lauf": first["Lauf"].to_numpy(),
+        "Probenname": first["Probenname"].to_numpy(),
+        "Prb. Nr.": first["Prb. Nr."].to_numpy(),
+        "Messzeit": runs["Messzeit"].min().to_numpy(),
+        "Injektionen": n_total,
+        "Verwendet": n.astype(int),
+        "NPOC": mean,
+        "SD": sd,
+        "CV": cv,
+        "QC": status,
+    })
+    return injections.assign(Verwendet=used), summary
+
+
+def load_toc_files(files, **qc):
+    """
+    Sinn: Beliebig viele TOC-L Exporte einlesen, QC anwenden und eine saubere NPOC Tabelle bauen;
+    wurde eine Probe mehrmals erfolgreich gemessen, gilt der letzte Lauf (Wiederholungsmessung)
+
+    Parameter:
+    ---------------------------------------
+
+    files: list
+        Pfade zu den .txt Exporten
+
+    **qc:
+        Parameter für toc_qc (max_cv, max_sd, min_injections, ...)
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (npoc, runs, injections): eine Zeile pro Probe mit Probe, Datum und NPOC in mg/L,
+    alle Läufe mit QC Status und alle Injektionen mit Spalte Verwendet
+    """
+    files = sorted(files)
+    if not files:
+        raise ValueError("Keine TOC Dateien übergeben")
+    injections = pd.concat([read_toc_export(f) for f in files], ignore_index=True)
+    injections, runs = toc_qc(injections, **qc)
+
+    npoc = (runs[runs["QC"] == "ok"]
+            .sort_values("Messzeit")
+            .drop_duplicates(subset=["Probenname"], keep="last")
+            .sort_values("Probenname")
+            .reset_index(drop=True))
+    name = parse_names(npoc["Probenname"])
+    npoc.insert(1, "Probe", name["Probe"].to_numpy())
+    npoc.insert(2, "Datum", name["Date"].to_numpy())
+    return npoc, runs, injections
@@ -2,89 +2,58 @@
 # Autor: Marc Kevin Schneider
 # Datum: September 2025
 
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 from glob import glob
+import Funktionen.Plots
 from Funktionen import plot_absorbed_radiation, plot_absorbed_radiation_ax
 import seaborn as sns
+from Plotcache import PlotCache
+from UVVIS_Einlesen import load_uvvis_files, uvvis_long_table
+from Absorptionsindizes import cdom_indices
+from Probenregister import build_registry
+from Korrelation import grouped_correlation
 
-path = "/data/"
-path_plots = "/plots/"
+# pfade lassen sich über DATA_PATH / PLOTS_PATH überschreiben (z.B. von Pipeline.py)
+path = os.environ.get("DATA_PATH", "/data/")
+path_plots = os.environ.get("PLOTS_PATH", "/plots/")
 
-ap = glob(f"{path}/UVVIS/AP*.csv")
+# plots nur neu rendern wenn sich daten oder der zeichencode (skript und plotfunktionen) geändert haben
+plot_cache = PlotCache(path_plots, "UVVIS", [__file__, Funktionen.Plots.__file__])
 
-sp = glob(f"{path}/UVVIS/SP*.csv")
+# nur die rohspektren (AP01_..., SP02_...), nicht die _Messungen/_Metadaten tabellen
+ap = glob(f"{path}/UVVIS/AP[0-9]*.csv")
+
+sp = glob(f"{path}/UVVIS/SP[0-9]*.csv")
 
 ###########################################################################################
 
-# für alle AP messungen 
-all_data = []
-
-for f in ap:
-    # ID und datum aus dem Dateinamen
-    fname = f.split("\\")[-1].replace(".csv", "")
-    sample_id, date_str = fname.split("_")
-    
-    # zu datetime
-    date_formatted = pd.to_datetime(date_str, format="%d%m%y").date()
-    
-    # absorptionsdaten lesen + header skippen (info brauchen wir nicht)
-    df = pd.read_csv(f, sep=";", skiprows=2, names=["Wavelength_nm", "Absorbance"], decimal=",")
-    
-    # infos zur messung dazu
-    df["Date"] = date_formatted
-    df["Sample"] = sample_id
-    
-    all_data.append(df)
-
-# zu einem df
-combined = pd.concat(all_data, ignore_index=True)
-
-# hier sortieren wir noch nach dem Datum damit die ältesten Proben ganz oben sind
-# + wir sortieren auch nach der Wellenlänge
-combined = combined.sort_values(
-    by=["Date", "Wavelength_nm"],
-    ascending=[True, True]
-).reset_index(drop=True)
-
-# speichern
-combined.to_csv(f"{path}/UVVIS/AP_Messungen.csv", index=False)
-
-
-####################################################################################################
-
-# für alle SP messungen 
-all_data = []
-
-for f in sp: #dateinamen nur von AP zu SP geändert, code klappt dann so trotzdem
-    # ID und datum aus dem Dateinamen
-    fname = f.split("\\")[-1].replace(".csv", "")
-    sample_id, date_str = fname.split("_")
-    
-    # zu datetime
-    date_formatted = pd.to_datetime(date_str, format="%d%m%y").date()
-    
-    # absorptionsdaten lesen + header skippen (info brauchen wir nicht)
-    df = pd.read_csv(f, sep=";", skiprows=2, names=["Wavelength_nm", "Absorbance"], decimal=",")
-    
-    # infos zur messung dazu
-    df["Date"] = date_formatted
-    df["Sample"] = sample_id
-    
-    all_data.append(df)
-
-# zu einem df
-combined = pd.concat(all_data, ignore_index=True)
-
-# hier sortieren wir noch nach dem Datum damit die ältesten Proben ganz oben sind
-# + wir sortieren auch nach der Wellenlänge
-combined = combined.sort_values(
-    by=["Date", "Wavelength_nm"],
-    ascending=[True, True]
-).reset_index(drop=True)
-
-# speichern (namen natürlich auch hier ändern)
-combined.to_csv(f"{path}/UVVIS/SP_Messungen.csv", index=False)
+# NPOC werte aus TOC.py für SUVA254, über das probenregister auf die spektren übertragen
+registry = build_registry(path)
+npoc = pd.read_csv(f"{path}/TOC/NPOC.csv", usecols=["NPOC"])["NPOC"]
+cdom = []
+
+# AP und SP messungen mit einem loader (parallel, ohne concat/sort pro datei)
+for name, files in (("AP", ap), ("SP", sp)):
+    absorbance, wavelengths, samples = load_uvvis_files(files)
+
+    # CDOM indizes (SUVA254, E2/E3, spektrale steigungen, SR) für alle proben auf einmal
+    # zeilen in der reihenfolge des loaders registrieren
+    registry.register(f"UVVIS_{name}", samples["File"])
+    cdom.append(cdom_indices(absorbance, wavelengths, samples, registry.align(npoc, "TOC", f"UVVIS_{name}")))
+
+    # lange tabelle: älteste proben oben, dann nach wellenlänge sortiert
+    combined = uvvis_long_table(absorbance, wavelengths, samples)
+    combined.to_csv(f"{path}/UVVIS/{name}_Messungen.csv", index=False)
+
+    # messinfos aus der kopfzeile (gerät, seriennummer, bediener, messzeit) pro probe
+    samples.to_csv(f"{path}/UVVIS/{name}_Metadaten.csv", index=False)
+
+# eine tabelle pro (probe, datum), gleiche schlüssel wie Nitrat_Phosphat.csv
+cdom = pd.concat(cdom, ignore_index=True).sort_values(["Datum", "Probe"]).reset_index(drop=True)
+cdom.to_csv(f"{path}/UVVIS/CDOM_Indizes.csv", index=False)
+print(cdom)
 
 
 ####################################################################################################################
@@ -126,13 +95,15 @@ sp_mean.to_csv(f"{path}/UVVIS/Durchschnitt_SP_Messungen.csv", index=False)
 ap_mean = pd.read_csv(f"{path}/UVVIS/Durchschnitt_AP_Messungen.csv")
 sp_mean = pd.read_csv(f"{path}/UVVIS/Durchschnitt_SP_Messungen.csv")
 
-fig, axes = plt.subplots(1, 2, figsize=(16,8))
-plot_absorbed_radiation_ax(ap_mean, axes[0], "A) AP Samples")
-plot_absorbed_radiation_ax(sp_mean, axes[1], "B) SP Samples")
-plt.tight_layout()
-plt.savefig(f"{path_plots}/UVVIS_AP_SP_Durchschnitt.png", 
-            dpi=300)
-plt.show()
+key = plot_cache.key(ap_mean, sp_mean)
+if not plot_cache.hit(f"{path_plots}/UVVIS_AP_SP_Durchschnitt.png", key):
+    fig, axes = plt.subplots(1, 2, figsize=(16,8))
+    plot_absorbed_radiation_ax(ap_mean, axes[0], "A) AP Samples")
+    plot_absorbed_radiation_ax(sp_mean, axes[1], "B) SP Samples")
+    plt.tight_layout()
+    plot_cache.savefig(f"{path_plots}/UVVIS_AP_SP_Durchschnitt.png", key,
+                       dpi=300)
+    plt.show()
 
 
 ##############################################
@@ -158,17 +129,22 @@ print("Korrelation Absorption:", corr_abs)
 print("Korrelation Prozent absorbiert:", corr_pct)
 
 
-# korrelation für jedes Datum
-date_corrs = (
-    merged.groupby("Date")
-          .apply(lambda g: pd.Series({
-              "Absorbance_corr": g["Absorbance_AP"].corr(g["Absorbance_SP"]),
-              "PercentAbsorbed_corr": g["PercentAbsorbed_AP"].corr(g["PercentAbsorbed_SP"])
-          }))
-)
+# korrelation für jedes Datum (alle daten und beide variablen auf einmal, mit bootstrap 95% KI)
+pairs = {
+    "Absorbance_corr": ("Absorbance_AP", "Absorbance_SP"),
+    "PercentAbsorbed_corr": ("PercentAbsorbed_AP", "PercentAbsorbed_SP"),
+}
+date_corrs = grouped_correlation(merged, "Date", pairs, n_boot=1000)
 
 print(date_corrs)
 
+# und nochmal getrennt nach wellenlängenbereichen
+merged["Band"] = pd.cut(merged["Wavelength_nm"], bins=[189, 280, 315, 400, 700, 1100],
+                        labels=["UV-C", "UV-B", "UV-A", "VIS", "NIR"])
+band_corrs = grouped_correlation(merged, ["Date", "Band"], pairs, n_boot=1000)
+
+print(band_corrs)
+
 
 # beziehung AP und SP Werte
 
@@ -180,28 +156,35 @@ r = merged_valid["Absorbance_AP"].corr(merged_valid["Absorbance_SP"])
 r2 = r**2
 
 # scatterplot mit regressionslinie
-plt.figure(figsize=(8,6))
-sns.regplot(
-    data=merged_valid,
-    x="Absorbance_AP", 
-    y="Absorbance_SP",
-    scatter_kws={"s": 10, "alpha": 0.5},
-    line_kws={"color": "red"}
-)
-
-plt.xlabel("AP Absorbance [a.u.]")
-plt.ylabel("SP Absorbance [a.u.]")
-plt.title("Relationship AP and SP absorbance")
-
-# r2 im plot anmerken
-plt.text(
-    0.05, 0.95, 
-    f"$R^2$ = {r2:.3f}", 
-    ha="left", va="top", transform=plt.gca().transAxes,
-    fontsize=12, bbox=dict(facecolor="white", alpha=0.7, edgecolor="none")
-)
-
-plt.tight_layout()
-plt.savefig(f"{path_plots}/UVVIS_AP_SP_Beziehung.png", 
-            dpi=300)
-plt.show()
+key = plot_cache.key(merged_valid[["Absorbance_AP", "Absorbance_SP"]])
+if not plot_cache.hit(f"{path_plots}/UVVIS_AP_SP_Beziehung.png", key):
+    plt.figure(figsize=(8,6))
+    sns.regplot(
+        data=merged_valid,
+        x="Absorbance_AP", 
+        y="Absorbance_SP",
+        scatter_kws={"s": 10, "alpha": 0.5},
+        line_kws={"color": "red"}
+    )
+
+    plt.xlabel("AP Absorbance [a.u.]")
+    plt.ylabel("SP Absorbance [a.u.]")
+    plt.title("Relationship AP and SP absorbance")
+
+    # r2 im plot anmerken
+    plt.text(
+        0.05, 0.95, 
+        f"$R^2$ = {r2:.3f}", 
+        ha="left", va="top", transform=plt.gca().transAxes,
+        fontsize=12, bbox=dict(facecolor="white", alpha=0.7, edgecolor="none")
+    )
+
+    plt.tight_layout()
+    plot_cache.savefig(f"{path_plots}/UVVIS_AP_SP_Beziehung.png", key,
+                       dpi=300)
+    plt.show()
+
+
+# veraltete plots aufräumen und treffer ins log
+plot_cache.evict()
+plot_cache.log()
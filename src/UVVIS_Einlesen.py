@@ -0,0 +1,112 @@
+# Skript: Paralleles Einlesen der GENESYS 10S UV/Vis Spektren mit den Messinfos aus dem Dateikopf
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from Funktionen import read_genesys_file
+from EEM import parse_sample_name
+
+
+def read_spectrum(file_path):
+    """
+    Sinn: Liest ein Spektrum und hängt Probenname und Datum aus dem Dateinamen an
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur .csv Datei
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (wavelengths, absorbance, meta) mit Sample, Date und File in meta
+    """
+    wavelengths, absorbance, meta = read_genesys_file(file_path)
+    sample, date = parse_sample_name(file_path)
+    meta = {"Sample": sample, "Date": date,
+            "File": os.path.basename(file_path.replace("\\", "/")), **meta}
+    return wavelengths, absorbance, meta
+
+
+def load_uvvis_files(files, workers=None):
+    """
+    Sinn: Liest viele UV/Vis Spektren parallel in eine Proben × Wellenlängen Matrix
+
+    Parameter:
+    ---------------------------------------
+
+    files: list
+        Pfade zu den .csv Dateien
+
+    workers: int, optional
+        Anzahl der Threads; standardmäßig wie ThreadPoolExecutor, 1 = ohne Pool
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (absorbance, wavelengths, samples); Zeilen nach Date und Sample sortiert,
+    samples enthält die Kopfzeile jeder Datei (Operator, Measured, Instrument, ...)
+    """
+    files = list(files)
+    if not files:
+        raise ValueError("Keine UV/Vis Dateien übergeben")
+
+    # threads statt prozesse: die skripte laufen ohne __main__ guard und die arbeit ist
+    # vor allem lesen und der C-Parser von numpy
+    if workers == 1 or len(files) == 1:
+        spectra = [read_spectrum(f) for f in files]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            spectra = list(pool.map(read_spectrum, files))
+
+    # gemeinsames raster; wenn alle gleich sind einfach stapeln, sonst mit NaN auffüllen
+    first = spectra[0][0]
+    if all(len(s[0]) == len(first) and np.array_equal(s[0], first) for s in spectra):
+        wavelengths = first
+        absorbance = np.vstack([s[1] for s in spectra])
+    else:
+        wavelengths = np.unique(np.concatenate([s[0] for s in spectra]))
+        absorbance = np.full((len(spectra), len(wavelengths)), np.nan)
+        for row, (wl, a, _) in zip(absorbance, spectra):
+            row[np.searchsorted(wavelengths, wl)] = a
+    # ganze nm bleiben ganze zahlen (wie bisher in den _Messungen.csv)
+    if np.all(wavelengths == np.round(wavelengths)):
+        wavelengths = wavelengths.astype(np.int64)
+
+    samples = pd.DataFrame([s[2] for s in spectra])
+    samples["Measured"] = pd.to_datetime(samples["Measured"], format="%d.%m.%Y %H:%M:%S", errors="coerce")
+    order = np.lexsort((samples["Sample"].to_numpy(), samples["Date"].to_numpy()))
+    return absorbance[order], wavelengths, samples.iloc[order].reset_index(drop=True)
+
+
+def uvvis_long_table(absorbance, wavelengths, samples):
+    """
+    Sinn: Lange Tabelle wie AP_Messungen.csv (älteste Proben oben, dann nach Wellenlänge),
+    in einem Schritt aus der Matrix statt concat + sort pro Datei
+
+    Parameter:
+    ---------------------------------------
+
+    absorbance, wavelengths, samples:
+        Ergebnis von load_uvvis_files
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit den Spalten Wavelength_nm, Absorbance, Date, Sample
+    """
+    n, w = absorbance.shape
+    # die zeilen sind schon nach datum sortiert, es reicht also innerhalb eines datums
+    # nach wellenlänge und dann nach probe zu ordnen
+    date_code = pd.factorize(samples["Date"], sort=True)[0]
+    rows = np.repeat(np.arange(n), w)
+    cols = np.tile(np.arange(w), n)
+    order = np.lexsort((rows, cols, date_code[rows]))
+    rows, cols = rows[order], cols[order]
+    return pd.DataFrame({
+        "Wavelength_nm": wavelengths[cols],
+        "Absorbance": absorbance[rows, cols],
+        "Date": samples["Date"].to_numpy()[rows],
+        "Sample": samples["Sample"].to_numpy()[rows],
+    })
@@ -0,0 +1,190 @@
+# Skript: Monte Carlo Unsicherheit der Rückhaltewirkung (Replikate, Nachweisgrenzen, Messpräzision)
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import numpy as np
+import pandas as pd
+from Zensierung import left, right
+
+# relative präzision des photometers (anteil vom messwert, 1 sigma)
+photometer_precision = {"Nitrat": 0.05, "Phosphor": 0.05}
+
+# standardabweichung NPOC in mg/L wenn keine injektions-SD vorliegt (QC grenze aus TOC.py)
+npoc_default_sd = 0.1
+
+
+def censored_bounds(value, flag, upper_factor=1.5):
+    """
+    Sinn: Untere und obere Grenze für jeden Messwert; "<0.5" liegt zwischen 0 und 0.5,
+    ">5.0" zwischen 5.0 und upper_factor * 5.0, normale Werte haben untere = obere Grenze
+
+    Parameter:
+    ---------------------------------------
+
+    value: np.ndarray
+        Werte bzw. Grenzen (siehe Zensierung.read_measurements)
+
+    flag: np.ndarray
+        Flags aus Zensierung.parse_censored; None = alles gemessen
+
+    upper_factor: float, optional
+        obere Grenze für rechtszensierte Werte als Vielfaches der Messgrenze
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (lower, upper) als np.ndarray, NaN für fehlende Werte
+    """
+    value = np.asarray(value, dtype=np.float64)
+    if flag is None:
+        return value, value
+    lower = np.where(flag == left, 0.0, value)
+    upper = np.where(flag == right, value * upper_factor, value)
+    return lower, upper
+
+
+def site_arrays(df, column, site, sd, dates):
+    """
+    Sinn: Replikate eines Orts (z.B. AP01, AP02) als Matrix Datum × Replikat
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen mit Datum, Probe, lower_{column}, upper_{column}
+
+    column: str
+        Variable
+
+    site: str
+        Ort (erste zwei Zeichen der Probe)
+
+    sd: np.ndarray
+        Messpräzision (1 sigma) für jede Zeile von df
+
+    dates: pd.Index
+        Probendaten (Zeilen der Matrix)
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (lower, upper, sd) mit Form (Daten, Replikate); gültige Replikate stehen vorne, Rest NaN
+    """
+    rows = df["Probe"].str[:2].eq(site).to_numpy() & np.isfinite(df[f"lower_{column}"].to_numpy())
+    sub = df.loc[rows, ["Datum"]].assign(lower=df.loc[rows, f"lower_{column}"],
+                                         upper=df.loc[rows, f"upper_{column}"], sd=sd[rows])
+    sub["rep"] = sub.groupby("Datum").cumcount()
+    wide = sub.pivot(index="Datum", columns="rep").reindex(dates)
+    return wide["lower"].to_numpy(), wide["upper"].to_numpy(), wide["sd"].to_numpy()
+
+
+def draw_site_mean(lower, upper, sd, n_draws, rng):
+    """
+    Sinn: Realisierungen des Ortsmittels für alle Daten auf einmal: Replikate werden mit Zurücklegen
+    gezogen (Streuung der Replikate), zensierte Werte gleichverteilt zwischen ihren Grenzen und
+    jeder Wert bekommt normalverteiltes Messrauschen
+
+    Parameter:
+    ---------------------------------------
+
+    lower, upper, sd: np.ndarray
+        aus site_arrays (Daten × Replikate)
+
+    n_draws: int
+        Anzahl Realisierungen
+
+    rng: np.random.Generator
+        Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray (Realisierungen, Daten), NaN wenn an einem Datum kein Replikat da ist
+    """
+    n_dates, n_reps = lower.shape
+    n_valid = np.isfinite(lower).sum(axis=1)
+
+    # bootstrap der replikate: index in die vorne liegenden gültigen replikate
+    pick = np.floor(rng.random((n_draws, n_dates, n_reps)) * np.maximum(n_valid, 1)[:, None]).astype(np.int64)
+    lo = np.take_along_axis(np.broadcast_to(lower, pick.shape), pick, axis=2)
+    hi = np.take_along_axis(np.broadcast_to(upper, pick.shape), pick, axis=2)
+    s = np.take_along_axis(np.broadcast_to(sd, pick.shape), pick, axis=2)
+
+    value = lo + rng.random(pick.shape) * (hi - lo)
+    value = np.maximum(value + rng.standard_normal(pick.shape) * s, 0.0)
+    mean = value.mean(axis=2)
+    mean[:, n_valid == 0] = np.nan
+    return mean
+
+
+def retention_uncertainty(df, columns=("Nitrat", "Phosphor", "NPOC"), npoc_sd=None, n_draws=20_000,
+                          percentiles=(2.5, 50, 97.5), upper_factor=1.5, seed=0):
+    """
+    Sinn: Rückhaltewirkung (AP - SP) / AP * 100 mit Perzentilbändern für jede Variable und jedes Datum;
+    alle Realisierungen werden als ein NumPy Array gezogen, keine Schleife über die Ziehungen
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        Messungen aus Zensierung.read_measurements (Grenzen + {name}_flag Spalten)
+
+    columns: tuple, optional
+        Variablen
+
+    npoc_sd: np.ndarray, optional
+        SD der TOC Injektionen für jede Zeile von df (z.B. Probenregister.align); NaN bzw. ohne
+        Angabe gilt npoc_default_sd
+
+    n_draws: int, optional
+        Anzahl Realisierungen
+
+    percentiles: tuple, optional
+        Perzentile der Bänder
+
+    upper_factor: float, optional
+        obere Grenze für ">" Werte, siehe censored_bounds
+
+    seed: int, optional
+        Seed für den Zufallsgenerator
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame im long format mit Datum, Nutrient, Percent_Reduction (Punktschätzer aus den
+    Mittelwerten), P{perzentil} und P_positiv (Anteil der Realisierungen mit Rückhalt > 0)
+    """
+    rng = np.random.default_rng(seed)
+    df = df.reset_index(drop=True).copy()
+    dates = pd.Index(np.sort(df["Datum"].unique()), name="Datum")
+
+    out = []
+    for col in columns:
+        flag = df[f"{col}_flag"].to_numpy() if f"{col}_flag" in df else None
+        lower, upper = censored_bounds(df[col], flag, upper_factor)
+        df[f"lower_{col}"], df[f"upper_{col}"] = lower, upper
+
+        # messpräzision pro zeile
+        if col in photometer_precision:
+            sd = photometer_precision[col] * np.nan_to_num((lower + upper) / 2)
+        else:
+            sd = np.full(len(df), npoc_default_sd)
+            if npoc_sd is not None:
+                sd = np.where(np.isfinite(npoc_sd), npoc_sd, npoc_default_sd)
+
+        ap = draw_site_mean(*site_arrays(df, col, "AP", sd, dates), n_draws, rng)
+        sp = draw_site_mean(*site_arrays(df, col, "SP", sd, dates), n_draws, rng)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = (ap - sp) / ap * 100
+
+        # punktschätzer wie bisher (zensierte werte an der grenze, replikatmittel)
+        point = df.assign(v=df[col].to_numpy(dtype=np.float64))
+        means = point.groupby(["Datum", point["Probe"].str[:2]])["v"].mean().unstack().reindex(dates)
+        est = ((means.get("AP") - means.get("SP")) / means.get("AP") * 100).to_numpy()
+
+        valid = np.isfinite(pct).any(axis=0)
+        bands = np.full((len(percentiles), len(dates)), np.nan)
+        if valid.any():
+            bands[:, valid] = np.nanpercentile(pct[:, valid], percentiles, axis=0)
+        result = pd.DataFrame({"Datum": dates, "Nutrient": col, "Percent_Reduction": est})
+        for q, band in zip(percentiles, bands):
+            result[f"P{q:g}"] = band
+        result["P_positiv"] = np.where(valid, (pct > 0).mean(axis=0), np.nan)
+        out.append(result)
+    return pd.concat(out, ignore_index=True)
@@ -0,0 +1,170 @@
+# Skript: Zensierte Messwerte (<0.5, >5.0) mit Flag und Grenze einlesen und nach verschiedenen Regeln ersetzen
+# Autor: Marc Kevin Schneider
+# Datum: Oktober 2026
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# flags: unter der nachweisgrenze, gemessen, über dem messbereich
+left, exact, right = -1, 0, 1
+
+# spalten mit "<" und ">" werten aus dem photometer
+censored_columns = ["Nitrat", "Phosphor"]
+
+# ersetzungsregeln für die sensitivitätsanalyse
+rules = ["DL", "DL/2", "0", "ROS"]
+
+
+def parse_censored(values):
+    """
+    Sinn: Text wie "<0.5", ">5.0" oder "1.2" in Grenze/Wert (float64) und Flag (int8)
+
+    Parameter:
+    ---------------------------------------
+
+    values: pd.Series
+        Messwerte als Text oder Zahl
+
+    Ergebnis:
+    ---------------------------------------
+    tuple (value, flag) als np.ndarray; bei zensierten Werten ist value die Grenze
+    """
+    text = values.astype("string").str.strip()
+    value = pd.to_numeric(text.str.lstrip("<>"), errors="coerce").to_numpy(dtype=np.float64)
+    flag = np.zeros(len(text), dtype=np.int8)
+    flag[text.str.startswith("<").fillna(False).to_numpy(dtype=bool)] = left
+    flag[text.str.startswith(">").fillna(False).to_numpy(dtype=bool)] = right
+    return value, flag
+
+
+def read_measurements(file_path, columns=censored_columns):
+    """
+    Sinn: Nitrat_Phosphat.csv einlesen; zensierte Spalten bekommen die Grenze als Wert und eine
+    zusätzliche Spalte {name}_flag (left/exact/right) statt stillschweigend ersetzt zu werden
+
+    Parameter:
+    ---------------------------------------
+
+    file_path: str
+        Pfad zur .csv Datei
+
+    columns: list, optional
+        Spalten mit zensierten Werten
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame mit Datum als datetime
+    """
+    df = pd.read_csv(file_path)
+    df["Datum"] = pd.to_datetime(df["Datum"], format="%d.%m.%Y")
+    for col in columns:
+        df[col], df[f"{col}_flag"] = parse_censored(df[col])
+    return df
+
+
+def ros(value, flag):
+    """
+    Sinn: Regression on Order Statistics (Helsel) für linkszensierte Werte mit einer oder mehreren
+    Nachweisgrenzen: Plotting Positions nach Hirsch-Stedinger, lognormale Regression der gemessenen
+    Werte, zensierte Werte kommen von der Regressionsgeraden.
+    Die imputierten Ordnungsstatistiken gehören zu keiner bestimmten Probe; würden sie in
+    Dateireihenfolge (= Datumsreihenfolge) verteilt, bekäme die früheste Probe immer den kleinsten
+    Wert und es entstünde ein künstlicher Zeittrend in Korrelationen und Lags. Deshalb bekommen alle
+    zensierten Zeilen mit derselben Grenze den gleichen Wert, den Mittelwert ihrer imputierten Werte
+
+    Parameter:
+    ---------------------------------------
+
+    value: np.ndarray
+        Werte bzw. Nachweisgrenzen, NaN = fehlt
+
+    flag: np.ndarray
+        Flags aus parse_censored
+
+    Ergebnis:
+    ---------------------------------------
+    np.ndarray mit ersetzten linkszensierten Werten (ein Wert pro Grenze, höchstens die Grenze);
+    mit weniger als 3 gemessenen Werten DL/2
+    """
+    value = np.asarray(value, dtype=np.float64)
+    out = value.copy()
+    valid = np.isfinite(value)
+    cens = valid & (flag == left)
+    det = valid & (flag != left)
+    if not cens.any():
+        return out
+    if det.sum() < 3 or (value[det] <= 0).any():
+        out[cens] = value[cens] / 2
+        return out
+
+    # überschreitungswahrscheinlichkeit pe für jede nachweisgrenze (von oben nach unten)
+    limits = np.unique(value[cens])
+    bounds = np.r_[limits, np.inf]
+    pe = np.ones(len(limits) + 1)
+    pe[-1] = 0.0
+    for j in range(len(limits) - 1, -1, -1):
+        a = (det & (value >= bounds[j]) & (value < bounds[j + 1])).sum()
+        b = (det & (value < bounds[j])).sum() + (cens & (value <= bounds[j])).sum()
+        pe[j] = pe[j + 1] + (a / (a + b) if a + b else 0.0) * (1 - pe[j + 1])
+    # bereich unter der kleinsten grenze hat pe = 1
+    pe = np.r_[1.0, pe]
+    bounds = np.r_[0.0, bounds]
+
+    pp = np.full(len(value), np.nan)
+    for j in range(len(bounds) - 1):
+        # gemessene werte zwischen zwei grenzen
+        idx = np.flatnonzero(det & (value >= bounds[j]) & (value < bounds[j + 1]))
+        idx = idx[np.argsort(value[idx], kind="stable")]
+        pp[idx] = (1 - pe[j]) + (pe[j] - pe[j + 1]) * np.arange(1, len(idx) + 1) / (len(idx) + 1)
+        # zensierte werte mit dieser grenze
+        if j > 0:
+            idx = np.flatnonzero(cens & (value == bounds[j]))
+            pp[idx] = (1 - pe[j]) * np.arange(1, len(idx) + 1) / (len(idx) + 1)
+
+    q = stats.norm.ppf(pp)
+    slope, intercept = np.polyfit(q[det], np.log(value[det]), 1)
+    # bei eng beieinander liegenden messwerten kann die gerade über der grenze landen
+    imputed = np.minimum(np.exp(intercept + slope * q), value)
+    # keine zuordnung der ordnungsstatistiken zu einzelnen zeilen: mittelwert pro grenze
+    for limit in limits:
+        rows = cens & (value == limit)
+        out[rows] = imputed[rows].mean()
+    return out
+
+
+def substitute(df, rule="DL", columns=censored_columns):
+    """
+    Sinn: Zensierte Werte nach einer Regel durch Zahlen ersetzen; rechtszensierte Werte bleiben
+    bei allen Regeln auf der Grenze (ROS ist nur für linkszensierte Daten definiert)
+
+    Parameter:
+    ---------------------------------------
+
+    df: pd.DataFrame
+        aus read_measurements
+
+    rule: str, optional
+        "DL" (Grenze), "DL/2", "0" oder "ROS" (pro Spalte über alle Proben)
+
+    columns: list, optional
+        zensierte Spalten
+
+    Ergebnis:
+    ---------------------------------------
+    pd.DataFrame Kopie mit float Spalten ohne die Flags
+    """
+    if rule not in rules:
+        raise ValueError(f"Unbekannte Regel: {rule}")
+    out = df.drop(columns=[f"{col}_flag" for col in columns])
+    for col in columns:
+        value = df[col].to_numpy(dtype=np.float64)
+        below = df[f"{col}_flag"].to_numpy() == left
+        if rule == "DL/2":
+            value = np.where(below, value / 2, value)
+        elif rule == "0":
+            value = np.where(below, 0.0, value)
+        elif rule == "ROS":
+            value = ros(value, df[f"{col}_flag"].to_numpy())
+        out[col] = value
+    return out